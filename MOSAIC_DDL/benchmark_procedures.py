@@ -0,0 +1,565 @@
+"""
+benchmark_procedures.py
+
+This module contains some benchmarks for measuring the throughput of the individual stages of MOSAIC_DDL.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from helpers_batch_generation import LocalBatchProvider, generate_batched_document_file, write_batch_request_files, save_submitted_batches
+from helpers_backends import OpenRouterBackend, OPEN_ROUTER_API_HEADERS, NO_GENERATION_LIMITS
+from helpers_stage_manifest import compute_file_hash
+from errors import DocumentRequestFailedError, HumanPoolExhaustedError
+from helpers_request_scheduling import AdaptiveConcurrencyLimiter
+from mock_openrouter_server import serve_mock_openrouter_server
+from sample_code.dataset_cache import DatasetCache
+from sample_code.human_pool import get_human_allocator
+from generator import Generator
+from sample_code import config
+import multiprocessing
+import config_framework
+import pandas as pd
+import numpy as np
+import tempfile
+import asyncio
+import socket
+import random
+import httpx
+import math
+import json
+import time
+import os
+
+
+def create_synthetic_configuration(number_of_domains: int, number_of_attributes: int) -> str:
+    """
+    Creates a synthetic xml configuration with the given number of domains, each having the given number of domain attributes and one entity with the given number of entity attributes. Consecutive attributes are linked by co-occurrence relations.
+
+    Parameters:
+        number_of_domains (int): The number of domains of the configuration.
+        number_of_attributes (int): The number of domain attributes and entity attributes per domain.
+
+    Returns:
+        str: The xml configuration.
+    """
+
+    # Storage for the xml lines of all domains
+    domains = []
+
+    for domain_index in range(number_of_domains):
+        domain_id = f"domain{domain_index}"
+
+        # Create domain and entity attributes
+        domain_attributes = [
+            f"<domainAttribute id=\"{domain_id}.attribute{i}\" key=\"{domain_id}_attribute{i}\" value=\"\" frequency=\"1.0\" eii=\"low\"/>" for i in range(number_of_attributes)]
+        entity_attributes = [
+            f"<entityAttribute id=\"{domain_id}.entity.attribute{i}\" key=\"{domain_id}_entity_attribute{i}\" value=\"\" frequency=\"1.0\" eii=\"low\"/>" for i in range(number_of_attributes)]
+
+        # Link consecutive attributes by co-occurrence relations
+        relations = [
+            f"<relation type=\"cooccurrence\" scope=\"attribute\" probability=\"0.9\"><from ref=\"{domain_id}.attribute{i}\"/><to ref=\"{domain_id}.attribute{i + 1}\"/></relation>" for i in range(number_of_attributes - 1)]
+
+        domains.append(f"<domain id=\"{domain_id}\" eii=\"high\">{"".join(domain_attributes)}<entities><entity id=\"{domain_id}.entity\" count=\"2\">{"".join(entity_attributes)}</entity></entities><relations>{"".join(relations)}</relations><texttypes><texttype id=\"{domain_id}.texttype\" number_of_seeds=\"1\" documents_per_seed=\"1\"><texttypePrompt id=\"{domain_id}.texttype.prompt\" key=\"{domain_id}_texttype_prompt\" value=\"\"/><occurringAttributes value=\"all\"/></texttype></texttypes></domain>")
+
+    return f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><config name=\"BenchmarkConfiguration\"><domains>{"".join(domains)}</domains></config>"
+
+
+def register_synthetic_sampling_procedures(framework: Generator, number_of_domains: int, number_of_attributes: int) -> None:
+    """
+    Registers constant sampling procedures for the domains of a synthetic configuration such that the benchmark only measures the framework itself.
+
+    Parameters:
+        framework (Generator): The generator holding the synthetic configuration.
+        number_of_domains (int): The number of domains of the configuration.
+        number_of_attributes (int): The number of domain attributes and entity attributes per domain.
+    """
+
+    for domain_index in range(number_of_domains):
+        domain_id = f"domain{domain_index}"
+
+        def sample(domain_id: str = domain_id) -> dict:
+            sampled = {
+                f"{domain_id}.attribute{i}": i for i in range(number_of_attributes)}
+            sampled[f"{domain_id}.entity"] = [
+                {f"{domain_id}.entity.attribute{i}": i for i in range(number_of_attributes)} for _ in range(framework.entity_to_count[f"{domain_id}.entity"])]
+            return sampled
+
+        framework.register_sampling_procedure(domain_id)(sample)
+
+
+def load_synthetic_generator(temporary_directory: str, number_of_domains: int, number_of_attributes: int) -> Generator:
+    """
+    Writes a synthetic configuration to the temporary directory and returns a generator holding it.
+
+    Parameters:
+        temporary_directory (str): The directory to write the configuration to.
+        number_of_domains (int): The number of domains of the configuration.
+        number_of_attributes (int): The number of domain attributes and entity attributes per domain.
+
+    Returns:
+        Generator: The generator holding the synthetic configuration.
+    """
+
+    configuration_path = os.path.join(temporary_directory, "configuration.xml")
+    with open(configuration_path, "w", encoding='utf-8') as configuration:
+        configuration.write(create_synthetic_configuration(
+            number_of_domains, number_of_attributes))
+
+    return Generator(configuration_path)
+
+
+def benchmark_seed_generation(numbers_of_domains: tuple[int, ...] = (1, 4, 16), numbers_of_attributes: tuple[int, ...] = (8, 32, 128), number_of_seeds: int = 2000) -> None:
+    """
+    Measures how many seeds per second the generator produces depending on the number of domains and attributes of the configuration.
+
+    Parameters:
+        numbers_of_domains (tuple[int, ...]): The numbers of domains to benchmark.
+        numbers_of_attributes (tuple[int, ...]): The numbers of attributes per domain to benchmark.
+        number_of_seeds (int): The number of seeds generated per benchmark run.
+    """
+
+    print(f"{'\033[34m'}Benchmarking seed generation...{'\033[0m'}")
+    print(f"{'domains':>10}{'attributes':>12}{'seeds/sec':>14}")
+
+    for number_of_domains in numbers_of_domains:
+        for number_of_attributes in numbers_of_attributes:
+            with tempfile.TemporaryDirectory() as temporary_directory:
+                # Write synthetic configuration to a temporary file and load it
+                framework = load_synthetic_generator(
+                    temporary_directory, number_of_domains, number_of_attributes)
+                register_synthetic_sampling_procedures(
+                    framework, number_of_domains, number_of_attributes)
+
+                # Generate seeds round robin over all domains
+                start = time.perf_counter()
+                for i in range(number_of_seeds):
+                    framework.generate_seed(f"domain{i % number_of_domains}")
+                elapsed = time.perf_counter() - start
+
+            print(
+                f"{number_of_domains:>10}{number_of_attributes:>12}{number_of_seeds / elapsed:>14.1f}")
+
+
+def compare_occurrence_distributions(framework: Generator, domain_id: str, number_of_seeds: int = 100000, significance_level: float = 0.001) -> bool:
+    """
+    Tests whether the batch sampler (Generator.generate_seed_batch) and the per-seed sampler (Generator.sample_occurrences) produce the same occurrence distribution. For every entity and attribute (marginal) and every co-occurrence edge (joint occurrence of both ends) a two-proportion z-test is run; the significance level is Bonferroni corrected.
+
+    Parameters:
+        framework (Generator): The generator holding the configuration.
+        domain_id (str): The domain to test.
+        number_of_seeds (int): The number of seeds drawn with each sampler.
+        significance_level (float): The family-wise significance level.
+
+    Returns:
+        bool: Whether no significant difference was found.
+    """
+
+    # Draw occurrences with both samplers
+    plan = framework.sampling_plans[domain_id]
+    occurrence_masks = framework.generate_seed_batch(domain_id, number_of_seeds)
+    per_seed_occurrences = [framework.sample_occurrences(
+        plan) for _ in range(number_of_seeds)]
+
+    # Collect the events which are tested: every node occurring and both ends of every edge occurring
+    nodes = list(occurrence_masks.entities) + \
+        list(occurrence_masks.attributes)
+    batch_mask = np.concatenate(
+        [occurrence_masks.entity_mask, occurrence_masks.attribute_mask], axis=1)
+    column = {node: i for i, node in enumerate(nodes)}
+    events = [(node,) for node in nodes]
+    events.extend((predecessor, entity) for entity, predecessors in plan.entity_order for predecessor,
+                  _ in predecessors if predecessor in column)
+    events.extend((predecessor, attribute) for attribute, _, predecessors in plan.attribute_order for predecessor,
+                  _ in predecessors if predecessor in column)
+
+    # Run a two-proportion z-test for every event
+    minimum_p_value = 1.0
+    for event in events:
+        batch_count = int(batch_mask[:, [column[node]
+                          for node in event]].all(axis=1).sum())
+        per_seed_count = sum(1 for occurring_entities, occurring_attributes in per_seed_occurrences if all(
+            node in occurring_entities or node in occurring_attributes for node in event))
+
+        pooled = (batch_count + per_seed_count) / (2 * number_of_seeds)
+        standard_error = math.sqrt(
+            2 * pooled * (1 - pooled) / number_of_seeds)
+        if standard_error == 0:
+            continue
+        z = (batch_count - per_seed_count) / number_of_seeds / standard_error
+        p_value = math.erfc(abs(z) / math.sqrt(2))
+        minimum_p_value = min(minimum_p_value, p_value)
+
+        print(f"{" & ".join(event):<60}{per_seed_count / number_of_seeds:>10.4f}{batch_count / number_of_seeds:>10.4f}{p_value:>10.4f}")
+
+    same_distribution = minimum_p_value >= significance_level / len(events)
+    print(f"{'\033[32m' if same_distribution else '\033[31m'}Minimum p-value {minimum_p_value:.4f} over {len(events)} tests (Bonferroni threshold {significance_level / len(events):.6f}): {'same distribution' if same_distribution else 'distributions differ'}{'\033[0m'}")
+
+    return same_distribution
+
+
+def benchmark_occurrence_sampling(numbers_of_seeds: tuple[int, ...] = (1000, 10000, 100000), number_of_attributes: int = 32) -> None:
+    """
+    Compares the time needed to take the occurrence decisions of many seeds with the per-seed sampler and with the batch sampler.
+
+    Parameters:
+        numbers_of_seeds (tuple[int, ...]): The numbers of seeds to benchmark.
+        number_of_attributes (int): The number of domain attributes and entity attributes of the synthetic domain.
+    """
+
+    print(f"{'\033[34m'}Benchmarking occurrence sampling...{'\033[0m'}")
+    print(f"{'seeds':>10}{'per-seed [s]':>16}{'batch [s]':>14}{'speedup':>10}")
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        framework = load_synthetic_generator(
+            temporary_directory, 1, number_of_attributes)
+        plan = framework.sampling_plans["domain0"]
+
+        for number_of_seeds in numbers_of_seeds:
+            # Time per-seed sampler
+            start = time.perf_counter()
+            for _ in range(number_of_seeds):
+                framework.sample_occurrences(plan)
+            per_seed_elapsed = time.perf_counter() - start
+
+            # Time batch sampler
+            start = time.perf_counter()
+            framework.generate_seed_batch("domain0", number_of_seeds)
+            batch_elapsed = time.perf_counter() - start
+
+            print(f"{number_of_seeds:>10}{per_seed_elapsed:>16.4f}{batch_elapsed:>14.4f}{per_seed_elapsed / batch_elapsed:>10.1f}")
+
+
+def get_random_csv_entry_with_skiprows(file_path: str, file_length: int) -> pd.DataFrame:
+    """
+    Returns a random entry of the specified file the way the generation functions did before the dataset cache (reading the header and then the file up to a random offset).
+
+    Parameters:
+        file_path (str): The path to the .csv file.
+        file_length (int): The number of rows of the .csv file.
+
+    Returns:
+        pd.DataFrame: The random entry of the .csv file (without column names, since single rows with trailing empty fields do not match the header).
+    """
+
+    pd.read_csv(file_path, nrows=0)
+    full_entry = pd.read_csv(file_path, skiprows=random.randint(
+        1, file_length), nrows=1, header=None)
+
+    return full_entry
+
+
+def benchmark_dataset_sampling(number_of_draws_before: int = 200, number_of_draws_after: int = 100000) -> None:
+    """
+    Compares the random draws per second from every .csv dataset listed in the sample code configuration before (skiprows reads) and after (dataset cache). Datasets which are not present are skipped.
+
+    Parameters:
+        number_of_draws_before (int): The number of draws with skiprows reads per dataset.
+        number_of_draws_after (int): The number of draws from the dataset cache per dataset.
+    """
+
+    print(f"{'\033[34m'}Benchmarking dataset sampling...{'\033[0m'}")
+    print(f"{'dataset':<45}{'rows':>10}{'before [draws/sec]':>22}{'after [draws/sec]':>20}")
+
+    for name in dir(config):
+        if not name.endswith("_FILE_PATH") or not hasattr(config, name.replace("_FILE_PATH", "_FILE_LENGTH")):
+            continue
+        file_path = getattr(config, name)
+        file_length = getattr(config, name.replace(
+            "_FILE_PATH", "_FILE_LENGTH"))
+        if not os.path.exists(file_path):
+            print(f"{os.path.basename(file_path):<45}{'missing, skipped':>52}")
+            continue
+
+        # Time skiprows reads
+        start = time.perf_counter()
+        for _ in range(number_of_draws_before):
+            get_random_csv_entry_with_skiprows(file_path, file_length)
+        before = number_of_draws_before / (time.perf_counter() - start)
+
+        # Time dataset cache (including loading the dataset)
+        start = time.perf_counter()
+        dataset = DatasetCache().get(file_path)
+        for _ in range(number_of_draws_after):
+            dataset.sample_row(file_length)
+        after = number_of_draws_after / (time.perf_counter() - start)
+
+        print(f"{os.path.basename(file_path):<45}{file_length:>10}{before:>22.1f}{after:>20.1f}")
+
+
+async def measure_request_throughput(base_url: str, concurrency: int, number_of_requests: int, tuned: bool) -> tuple[float, int]:
+    """
+    Measures how many chat completion requests per second are answered successfully with the given number of requests in flight.
+
+    Parameters:
+        base_url (str): The base url of the (mock) API.
+        concurrency (int): The number of requests in flight.
+        number_of_requests (int): The number of requests sent.
+        tuned (bool): Whether the requests are sent through the OpenRouter backend (clients of create_http_clients, pre-serialized bodies), or the way they were sent before (one default client, headers and body built for every request).
+
+    Returns:
+        tuple[float, int]: The number of successful requests per second and the number of failed requests.
+    """
+
+    if tuned:
+        client = OpenRouterBackend()
+
+        async def send_request(index: int) -> bool:
+            try:
+                await client.complete("Benchmark system prompt", json.dumps({"seed": index}))
+            except DocumentRequestFailedError:
+                return False
+            return True
+    else:
+        client = httpx.AsyncClient()
+        limiter = AdaptiveConcurrencyLimiter(concurrency, concurrency)
+
+        async def send_request(index: int) -> bool:
+            admitted_at = await limiter.acquire()
+            try:
+                full_prompt = {"model": config_framework.MODEL, "messages": [{"role": "system", "content": "Benchmark system prompt"}, {
+                    "role": "user", "content": json.dumps({"seed": index})}], "usage": {"include": True}}
+                response = await client.post(f"{base_url}/chat/completions", headers=dict(OPEN_ROUTER_API_HEADERS), json=full_prompt)
+                response.json()["choices"][0]["message"]["content"]
+            except httpx.HTTPError:
+                # E.g. no connection of the default pool became free in time
+                return False
+            finally:
+                await limiter.release(admitted_at, False)
+            return True
+
+    async with client:
+        start = time.perf_counter()
+        successful = await asyncio.gather(*(send_request(index) for index in range(number_of_requests)))
+        elapsed = time.perf_counter() - start
+
+    return sum(successful) / elapsed, successful.count(False)
+
+
+def benchmark_document_requests(concurrencies: tuple[int, ...] = (10, 100, 500), number_of_requests: int = 2000, latency: float = 0.05) -> None:
+    """
+    Compares the requests per second against a local mock server (without induced errors and with a fixed latency, running in a separate process) before (one default client) and after (OpenRouter backend) depending on the number of requests in flight.
+
+    Parameters:
+        concurrencies (tuple[int, ...]): The numbers of requests in flight to benchmark.
+        number_of_requests (int): The number of requests sent per benchmark run.
+        latency (float): The latency of the mock server (in seconds).
+    """
+
+    print(f"{'\033[34m'}Benchmarking document requests...{'\033[0m'}")
+    print(f"{'concurrency':>12}{'before [requests/sec]':>24}{'failed':>8}{'after [requests/sec]':>23}{'failed':>8}{'ideal [requests/sec]':>23}")
+
+    # Pick a free port and start mock server in a separate process
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    settings = {"minimum_latency": latency, "maximum_latency": latency, "maximum_concurrency": max(concurrencies) + 1, "rate_limit_probability": 0.0,
+                "server_error_probability": 0.0, "overloaded_probability": 0.0, "malformed_probability": 0.0, "credit_limit": float("inf")}
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve_mock_openrouter_server, args=("127.0.0.1", port), kwargs=settings, daemon=True)
+    server.start()
+
+    # Point OpenRouter backend to mock server (restored afterwards)
+    settings_before = (config_framework.OPEN_ROUTER_API_BASE_URL, config_framework.MINIMUM_NUMBER_OF_CONCURRENT_REQUESTS,
+                       config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS, config_framework.RESPONSE_CACHE)
+    config_framework.OPEN_ROUTER_API_BASE_URL = f"http://127.0.0.1:{port}/api/v1"
+    config_framework.RESPONSE_CACHE = None
+
+    try:
+        # Wait for mock server to accept connections
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        base_url = config_framework.OPEN_ROUTER_API_BASE_URL
+
+        for concurrency in concurrencies:
+            config_framework.MINIMUM_NUMBER_OF_CONCURRENT_REQUESTS = concurrency
+            config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS = concurrency
+            before, before_failed = asyncio.run(measure_request_throughput(
+                base_url, concurrency, number_of_requests, False))
+            after, after_failed = asyncio.run(measure_request_throughput(
+                base_url, concurrency, number_of_requests, True))
+
+            print(f"{concurrency:>12}{before:>24.1f}{before_failed:>8}{after:>23.1f}{after_failed:>8}{concurrency / latency:>23.1f}")
+    finally:
+        (config_framework.OPEN_ROUTER_API_BASE_URL, config_framework.MINIMUM_NUMBER_OF_CONCURRENT_REQUESTS,
+         config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS, config_framework.RESPONSE_CACHE) = settings_before
+        server.terminate()
+        server.join()
+
+
+def check_batch_generation_resume(number_of_documents: int = 20) -> bool:
+    """
+    Checks that the batch mode recovers from failed batches when it is resumed (with the local stand-in of a batch API): a run whose requests all fail is resumed after a previous run's batch of the retried requests expired, and the resumed run has to submit the requests again and generate every document.
+
+    Parameters:
+        number_of_documents (int): The number of documents generated.
+
+    Returns:
+        bool: Whether the resumed run generated every document.
+    """
+
+    print(f"{'\033[34m'}Checking resumption of the batch mode...{'\033[0m'}")
+
+    settings_before = (config_framework.BATCH_DIRECTORY, config_framework.DEAD_LETTERS, config_framework.DOCUMENT_GENERATION_COSTS, config_framework.BATCH_LOCAL_LATENCY,
+                       config_framework.BATCH_POLL_INTERVAL, config_framework.BATCH_LOCAL_FAILURE_PROBABILITY, config_framework.MAXIMUM_DOCUMENT_GENERATION_COST, config_framework.RESUME_DOCUMENT_GENERATION)
+
+    try:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            config_framework.BATCH_DIRECTORY = os.path.join(
+                temporary_directory, "batches")
+            config_framework.DEAD_LETTERS = os.path.join(
+                temporary_directory, "dead_letters.jsonl")
+            config_framework.DOCUMENT_GENERATION_COSTS = os.path.join(
+                temporary_directory, "document_generation_costs.json")
+            (config_framework.BATCH_LOCAL_LATENCY, config_framework.BATCH_POLL_INTERVAL, config_framework.MAXIMUM_DOCUMENT_GENERATION_COST,
+             config_framework.RESUME_DOCUMENT_GENERATION) = (0, 0.01, None, True)
+
+            # Blank seeds of one document per seed
+            blank_seeds_file_path = os.path.join(
+                temporary_directory, "blank_seeds.jsonl")
+            documents_file_path = os.path.join(
+                temporary_directory, "documents.jsonl")
+            with open(blank_seeds_file_path, "w", encoding='utf-8') as blank_seeds:
+                for idx in range(number_of_documents):
+                    blank_seeds.write(json.dumps(
+                        {"document_id": f"{idx}-texttype-0-{idx:08x}", "domain": "domain", "text_type": "texttype", "attribute": idx}) + "\n")
+            system = [("Check system prompt", "all", NO_GENERATION_LIMITS)] * \
+                number_of_documents
+            provider = LocalBatchProvider()
+
+            # First run: every request fails
+            config_framework.BATCH_LOCAL_FAILURE_PROBABILITY = 1.0
+            generate_batched_document_file(
+                provider, system, blank_seeds_file_path, documents_file_path)
+
+            # Interrupted run: the batch of the retried requests expired before its results were reassembled
+            requests_file_paths, _ = write_batch_request_files(
+                system, blank_seeds_file_path, {}, {})
+            submitted_batches = {}
+            for requests_file_path in requests_file_paths:
+                batch_id = provider.submit(requests_file_path)
+                with open(provider.get_batch_file_path(batch_id, "status.json"), "w", encoding='utf-8') as status_file:
+                    json.dump({"status": "expired", "submitted_at": time.time()}, status_file)
+                submitted_batches[compute_file_hash(
+                    requests_file_path)] = batch_id
+            save_submitted_batches(submitted_batches)
+
+            # Resumed run: every request succeeds
+            config_framework.BATCH_LOCAL_FAILURE_PROBABILITY = 0.0
+            number_of_missing_documents = generate_batched_document_file(
+                provider, system, blank_seeds_file_path, documents_file_path)
+            with open(documents_file_path, "r", encoding='utf-8') as documents:
+                number_of_generated_documents = sum(1 for _ in documents)
+    finally:
+        (config_framework.BATCH_DIRECTORY, config_framework.DEAD_LETTERS, config_framework.DOCUMENT_GENERATION_COSTS, config_framework.BATCH_LOCAL_LATENCY,
+         config_framework.BATCH_POLL_INTERVAL, config_framework.BATCH_LOCAL_FAILURE_PROBABILITY, config_framework.MAXIMUM_DOCUMENT_GENERATION_COST, config_framework.RESUME_DOCUMENT_GENERATION) = settings_before
+
+    resumed = number_of_missing_documents == 0 and number_of_generated_documents == number_of_documents
+    print(f"{'\033[32m' if resumed else '\033[31m'}Resumed run generated {number_of_generated_documents} of {number_of_documents} document(s): {'resumed' if resumed else 'failed batches were reused'}{'\033[0m'}")
+
+    return resumed
+
+
+
+def register_all_sampling_procedures(framework: Generator) -> None:
+    """
+    Registers the sampling procedure of the synthetic domain of check_parallel_seed_generation, which allocates one to three humans from the humans.jsonl next to the configuration (this module is the SAMPLING_PROCEDURES of the worker processes of the check).
+
+    Parameters:
+        framework (Generator): The generator holding the synthetic configuration.
+    """
+
+    human_instances_path = os.path.join(
+        os.path.dirname(framework.config_file), "humans.jsonl")
+
+    @framework.register_sampling_procedure("domain0")
+    def sample() -> dict:
+        # Allocate humans of age 18 to 60 in a random year
+        human_allocator = get_human_allocator(human_instances_path)
+        year = random.randint(1950, 2000)
+        humans = [human_allocator.human_pool.names[human_allocator.allocate_by_age(
+            year, 18, 60)] for _ in range(random.randint(1, 3))]
+
+        sampled = {"domain0.attribute0": ", ".join(humans), "domain0.attribute1": year}
+        sampled["domain0.entity"] = [{"domain0.entity.attribute0": 0, "domain0.entity.attribute1": 1}
+                                     for _ in range(framework.entity_to_count["domain0.entity"])]
+        return sampled
+
+
+def check_parallel_seed_generation(numbers_of_seeds: tuple[int, ...] = (250, 450), numbers_of_workers: tuple[int, ...] = (1, 4), number_of_humans: int = 1000) -> bool:
+    """
+    Checks that the parallel seed generation succeeds wherever the sequential seed generation does (and fails wherever it fails) and writes the identical seeds, with a synthetic domain which allocates humans from a small human pool until it is (nearly) exhausted.
+
+    Parameters:
+        numbers_of_seeds (tuple[int, ...]): The numbers of seeds to generate.
+        numbers_of_workers (tuple[int, ...]): The numbers of worker processes of the parallel runs.
+        number_of_humans (int): The number of humans in the human pool.
+
+    Returns:
+        bool: Whether every parallel run had the same outcome as the sequential run.
+    """
+
+    print(f"{'\033[34m'}Checking parallel seed generation...{'\033[0m'}")
+
+    settings_before = (config_framework.SEEDS, config_framework.SAMPLING_PROCEDURES,
+                       config_framework.SEED_GENERATION_CHUNK_SIZE)
+
+    # Storage for the outcome of the check
+    identical = True
+
+    try:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            config_framework.SAMPLING_PROCEDURES = os.path.abspath(__file__)
+            config_framework.SEED_GENERATION_CHUNK_SIZE = 16
+
+            # Human pool with birth years from 1890 to 2000
+            with open(os.path.join(temporary_directory, "humans.jsonl"), "w", encoding='utf-8') as humans:
+                for idx in range(number_of_humans):
+                    humans.write(json.dumps({"name": f"Human {idx}", "occupation": "Check",
+                                 "nationality": "Check", "birth_year": 1890 + idx % 111}) + "\n")
+
+            for number_of_seeds in numbers_of_seeds:
+                # Write synthetic configuration with the number of seeds and load it
+                configuration_path = os.path.join(
+                    temporary_directory, "configuration.xml")
+                with open(configuration_path, "w", encoding='utf-8') as configuration:
+                    configuration.write(create_synthetic_configuration(1, 2).replace(
+                        "number_of_seeds=\"1\"", f"number_of_seeds=\"{number_of_seeds}\""))
+                framework = Generator(configuration_path)
+                register_all_sampling_procedures(framework)
+
+                # Generate seeds sequentially and with every number of workers
+                outcomes = {}
+                for number_of_workers in (None,) + numbers_of_workers:
+                    config_framework.SEEDS = os.path.join(
+                        temporary_directory, f"seeds-{number_of_seeds}-{number_of_workers}.jsonl")
+                    try:
+                        framework.generate_seeds(["domain0"], number_of_workers)
+                        with open(config_framework.SEEDS, "r", encoding='utf-8') as seeds:
+                            outcomes[number_of_workers] = seeds.read()
+                    except HumanPoolExhaustedError:
+                        outcomes[number_of_workers] = None
+
+                for number_of_workers in numbers_of_workers:
+                    same_outcome = outcomes[number_of_workers] == outcomes[None]
+                    identical &= same_outcome
+                    print(f"{'\033[32m' if same_outcome else '\033[31m'}{number_of_seeds} seed(s), {number_of_workers} worker(s): sequential run {'failed' if outcomes[None] is None else 'succeeded'}, parallel run {'failed' if outcomes[number_of_workers] is None else 'succeeded'}{' with identical seeds' if same_outcome and outcomes[None] is not None else ''}{'\033[0m'}")
+    finally:
+        (config_framework.SEEDS, config_framework.SAMPLING_PROCEDURES,
+         config_framework.SEED_GENERATION_CHUNK_SIZE) = settings_before
+
+    return identical
+
+
+if __name__ == "__main__":
+    benchmark_seed_generation()
+    benchmark_occurrence_sampling()
+    benchmark_dataset_sampling()
+    benchmark_document_requests()
+    check_batch_generation_resume()
+    check_parallel_seed_generation()
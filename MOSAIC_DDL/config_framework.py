@@ -9,10 +9,58 @@ Date: July 2025
 
 # Seed generation parameters
 EII_LEVEL_MAPPING = {"low": 0, "moderate": 1, "high": 2}
+MASTER_SEED = 42  # Drives every random number stream of the seed generation, the sampling procedures and the blanking of seeds
+SKIP_UNCHANGED_STAGES = True  # Skips stages whose outputs were produced with the same master seed and inputs
+ADDITIONAL_SEED_STAGE_INPUTS = ["MOSAIC_DDL/sample_code/"]  # Further files or directories (hashed recursively) the sampling procedures depend on: their sources, datasets and prepared entity pools
+NUMBER_OF_SEED_GENERATION_WORKERS = None  # None generates the seeds sequentially in the main process
+SEED_GENERATION_CHUNK_SIZE = 256
+NUMBER_OF_BLANKING_WORKERS = None  # None blanks the seeds sequentially in the main process
+BLANKING_CHUNK_SIZE = 1024
 
 # Document generation parameters
+DOCUMENT_GENERATION_BACKEND = "openrouter"  # "openrouter" (OpenRouter API), "offline" (local vLLM engine) or "stub" (deterministic documents for testing)
 MODEL = "openai/gpt-4o-mini"
-MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS = 10
+OPEN_ROUTER_API_BASE_URL = "https://openrouter.ai/api/v1"  # Point to a local mock server (see mock_openrouter_server.py) for testing
+MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS = 10  # Upper bound of the adaptive number of requests in flight
+MINIMUM_NUMBER_OF_CONCURRENT_REQUESTS = 1  # Lower bound of the adaptive number of requests in flight
+DOCUMENT_GENERATION_STREAMING = False  # Streams the responses, such that documents are cut off (and their requests free their slot) as soon as they reach the maximumTokens or a stopSequence of their text type; also records the time to first token
+MAXIMUM_NUMBER_OF_REQUEST_ATTEMPTS = 6  # Requests still failing after this many attempts are written to the dead letters file
+REQUEST_TIMEOUT = 60  # Time to wait for the response of a request (read timeout, in seconds)
+REQUEST_CONNECT_TIMEOUT = 10  # Time to establish a connection (in seconds)
+REQUEST_WRITE_TIMEOUT = 10  # Time to send a request (in seconds)
+REQUEST_POOL_TIMEOUT = 30  # Time to wait for a free connection of the pool (in seconds)
+HTTP2 = True  # Multiplexes the requests over few connections if the h2 package is installed (HTTP/1.1 otherwise)
+HTTP_KEEPALIVE_EXPIRY = 60  # Idle connections are kept open this long for reuse (in seconds)
+HTTP_CONNECTIONS_PER_CLIENT = 8  # The connections are spread over several clients with pools of this size (the connection pool of httpx slows down with many connections)
+REQUEST_BACKOFF_BASE = 1.0  # Backoff after the first failed attempt of a request (in seconds), doubled with every further attempt
+REQUEST_BACKOFF_MAXIMUM = 60.0  # In seconds
+BUDGET_POLL_INTERVAL = 30  # Interval in which the credits of the API key are polled (in seconds)
+MINIMUM_REMAINING_CREDITS = 0.5  # Document generation pauses while fewer credits remain on the API key
+MAXIMUM_TOKENS_PER_MINUTE = None  # Token bucket limit of the prompt and completion tokens sent per minute (None disables the limit)
+MAXIMUM_DOCUMENT_GENERATION_COST = None  # Hard limit of the cost of a document generation run in USD (None disables the limit)
+PROMPT_TOKEN_PRICE = 0.15  # In USD per million tokens, used if the provider does not report the cost and for the estimates
+COMPLETION_TOKEN_PRICE = 0.60  # In USD per million tokens
+ESTIMATED_COMPLETION_TOKENS = 600  # Expected length of a document, used for the estimates and reserved in the token bucket
+ESTIMATED_REQUEST_LATENCY = 10.0  # Expected duration of a request (in seconds), used for the estimates
+RESPONSE_CACHE_MODE = "read_write"  # "read_write", "read" (the cache is not extended) or "write" (every request is sent again and refreshes the cache)
+RESPONSE_CACHE_MAXIMUM_SIZE = 2 * 1024 ** 3  # In bytes, the least recently used responses are evicted beyond it
+RESUME_DOCUMENT_GENERATION = True  # Reuses the documents of an interrupted run (as long as they still belong to the current seeds) instead of starting from scratch
+TELEMETRY_SNAPSHOT_INTERVAL = 10  # Interval in which snapshots of the telemetry (latencies, requests in flight, queue depths, throughput, errors) are written (in seconds)
+TELEMETRY_PROMETHEUS_PORT = None  # Local port serving the telemetry as Prometheus metrics under /metrics (None disables the endpoint; shards use the following ports)
+TELEMETRY_LATENCY_WINDOW = 10000  # Number of most recent latencies the percentiles are computed from
+NUMBER_OF_DOCUMENT_GENERATION_SHARDS = None  # Splits the document generation by seed index into this many processes, each with its own event loop and API key (None generates all documents in this process)
+BATCH_PROVIDER = None  # None sends the requests one by one through DOCUMENT_GENERATION_BACKEND; "openai" (asynchronous batch API at lower cost) or "local" (file-based stand-in for testing) submits them as batches
+BATCH_MODEL = "gpt-4o-mini"  # Model of the batch API
+BATCH_API_BASE_URL = "https://api.openai.com/v1"
+BATCH_MAXIMUM_NUMBER_OF_REQUESTS = 50000  # Requests per batch (the limit of the batch API)
+BATCH_POLL_INTERVAL = 60  # Interval in which the status of the batches is polled (in seconds)
+BATCH_PRICE_FACTOR = 0.5  # Discount of the batch API on the token prices
+BATCH_LOCAL_LATENCY = 5  # Time until the local stand-in completes a batch (in seconds)
+BATCH_LOCAL_FAILURE_PROBABILITY = 0.0  # Probability of the local stand-in failing a request
+OFFLINE_MODEL = "meta-llama/Llama-3.1-8B-Instruct"  # Model of the offline backend
+OFFLINE_BATCH_SIZE = 1024  # Number of documents handed to the offline engine at once (scheduled through continuous batching)
+OFFLINE_MAX_TOKENS = 1024
+OFFLINE_MAX_MODEL_LEN = 4096
 
 # Configuration file path
 CONFIG = "MOSAIC_DDL/configurations/configuration.xml"
@@ -21,6 +69,11 @@ CONFIG = "MOSAIC_DDL/configurations/configuration.xml"
 SEEDS = "MOSAIC_DDL/generations/seeds.jsonl"
 BLANK_SEEDS = "MOSAIC_DDL/generations/blank_seeds.jsonl"
 DOCUMENTS = "MOSAIC_DDL/generations/documents.jsonl"
+DEAD_LETTERS = "MOSAIC_DDL/generations/dead_letters.jsonl"
+DOCUMENT_GENERATION_COSTS = "MOSAIC_DDL/generations/document_generation_costs.json"
+DOCUMENT_GENERATION_TELEMETRY = "MOSAIC_DDL/generations/document_generation_telemetry.jsonl"  # None disables the telemetry snapshots
+BATCH_DIRECTORY = "MOSAIC_DDL/generations/batches/"  # Request and result files of the batches and the ids of the submitted batches
+RESPONSE_CACHE = "MOSAIC_DDL/generations/response_cache.sqlite"  # None disables the response cache
 QUESTIONS = "MOSAIC_DDL/generations/questions.jsonl"
 TOKENIZED_DOCUMENTS = "MOSAIC_DDL/generations/tokenized_documents.jsonl"
 VALIDATION_EVALUATION_FOLDER = "MOSAIC_DDL/results/"
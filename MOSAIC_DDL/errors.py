@@ -46,3 +46,149 @@ class CyclicDependencyBetweenRelationsFound(Exception):
         """
 
         return f"A cyclic dependency between relations has been found (e.g.{self.cycle}). Please resolve this cyclic dependency and restart the framework."
+
+
+class HumanPoolExhaustedError(Exception):
+    """
+    A custom error being rased if no unused human with a suitable birth year is left in the human pool.
+    """
+
+    def __init__(self, minimum_birth_year: int, maximum_birth_year: int):
+        """
+        Initializes the custom error.
+        """
+
+        self.minimum_birth_year = minimum_birth_year
+        self.maximum_birth_year = maximum_birth_year
+
+    def __str__(self):
+        """
+        Provides some custom formatting for the error.
+        """
+
+        return f"All humans born between {self.minimum_birth_year} and {self.maximum_birth_year} have already been used. Please generate more humans (e.g. increase NUMBER_OF_FAMILY_TREES_PER_COUNTRY) or generate fewer seeds and restart the framework."
+
+
+class DocumentsOutOfSyncError(Exception):
+    """
+    A custom error being rased if a document and the blank seed it is paired with do not belong together.
+    """
+
+    def __init__(self, document_id: str, blank_seed_id: str):
+        """
+        Initializes the custom error.
+        """
+
+        self.document_id = document_id
+        self.blank_seed_id = blank_seed_id
+
+    def __str__(self):
+        """
+        Provides some custom formatting for the error.
+        """
+
+        return f"The document \"{self.document_id}\" is paired with the blank seed \"{self.blank_seed_id}\", hence the documents and blank seeds files are out of sync. Please regenerate the documents and restart the framework."
+
+
+class DocumentRequestFailedError(Exception):
+    """
+    A custom error being rased if the request for a document failed permanently (or could not be completed within the maximum number of attempts).
+    """
+
+    def __init__(self, reason: str, attempts: int):
+        """
+        Initializes the custom error.
+        """
+
+        self.reason = reason
+        self.attempts = attempts
+
+    def __str__(self):
+        """
+        Provides some custom formatting for the error.
+        """
+
+        return f"The request for a document failed after {self.attempts} attempt(s): {self.reason}"
+
+
+class BudgetExhaustedError(Exception):
+    """
+    A custom error being rased if a request for a document would exceed the maximum cost of the document generation.
+    """
+
+    def __init__(self, spent_cost: float, maximum_cost: float):
+        """
+        Initializes the custom error.
+        """
+
+        self.spent_cost = spent_cost
+        self.maximum_cost = maximum_cost
+
+    def __str__(self):
+        """
+        Provides some custom formatting for the error.
+        """
+
+        return f"The document generation spent {self.spent_cost:.4f} of its maximum cost of {self.maximum_cost:.4f} USD, hence no further requests are sent. Raise MAXIMUM_DOCUMENT_GENERATION_COST and restart the framework to resume the document generation."
+
+
+class UnknownDocumentGenerationBackendError(Exception):
+    """
+    A custom error being rased if the configured document generation backend does not exist.
+    """
+
+    def __init__(self, backend: str, backends: list[str]):
+        """
+        Initializes the custom error.
+        """
+
+        self.backend = backend
+        self.backends = backends
+
+    def __str__(self):
+        """
+        Provides some custom formatting for the error.
+        """
+
+        return f"The document generation backend \"{self.backend}\" does not exist (available backends: {", ".join(self.backends)}). Please adjust DOCUMENT_GENERATION_BACKEND in config_framework.py and restart the framework."
+
+
+class UnknownBatchProviderError(Exception):
+    """
+    A custom error being rased if the configured batch provider does not exist.
+    """
+
+    def __init__(self, provider: str, providers: list[str]):
+        """
+        Initializes the custom error.
+        """
+
+        self.provider = provider
+        self.providers = providers
+
+    def __str__(self):
+        """
+        Provides some custom formatting for the error.
+        """
+
+        return f"The batch provider \"{self.provider}\" does not exist (available providers: {", ".join(self.providers)}). Please adjust BATCH_PROVIDER in config_framework.py and restart the framework."
+
+
+class InstanceClaimDeferredError(Exception):
+    """
+    A custom error being rased if a work item of the parallel seed generation needs to know all claims of unique instances, such that it has to be generated by the main process.
+    """
+
+    def __init__(self, pool_key: str):
+        """
+        Initializes the custom error.
+        """
+
+        self.pool_key = pool_key
+
+    def __str__(self):
+        """
+        Provides some custom formatting for the error.
+        """
+
+        return f"The unclaimed instances of the pool \"{self.pool_key}\" are only known to the main process. The work item is generated by the main process instead."
@@ -99,7 +99,7 @@ def compute_keys_and_values_of_seed(inputDict: dict) -> set[tuple[str, Union[str
 
     if isinstance(inputDict, dict):
         for key, value in inputDict.items():
-            if key == "domain" or key == "text_type":
+            if key == "domain" or key == "text_type" or key == "document_id":
                 continue
 
             if isinstance(value, list):
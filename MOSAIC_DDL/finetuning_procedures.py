@@ -68,7 +68,7 @@ def finetune_model() -> None:
         return inputs
 
     tokenized_dataset = dataset.map(
-        tokenize, batched=True, remove_columns=["document"])
+        tokenize, batched=True, remove_columns=dataset.column_names)
 
     # Instantiate data collator
     data_collator = DataCollatorForLanguageModeling(
@@ -9,15 +9,30 @@ Date: July 2025
 
 # Imports
 from errors import SamplingProcedureNotFoundError, CyclicDependencyBetweenRelationsFound
-from helpers_document_generation import generate_document_file
+from helpers_document_generation import generate_document_file, generate_sharded_document_file
+from helpers_batch_generation import generate_batched_document_file, create_batch_provider
+from helpers_budget import estimate_document_generation, estimate_number_of_tokens
+from sampling_plan import SamplingPlan, OccurrenceMasks, compile_sampling_plans, sample_occurrence_masks
+from helpers_stage_manifest import compute_stage_fingerprint, stage_is_up_to_date, write_stage_manifest
+from helpers_seed_generation import initialize_seed_worker, generate_seed_chunk, generate_seed_line
+from helpers_blanking import initialize_blanking_worker, blank_seed_chunk
+from helpers_random import InstanceClaims, get_instance_claims, set_instance_claims
+from helpers_telemetry import get_telemetry
+from helpers_backends import GenerationLimits
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import batched
 import xml.etree.ElementTree as ET
 from typing import Union
 import config_framework
 from tqdm import tqdm
 import networkx as nx
+import numpy as np
 import random
+import multiprocessing
 import asyncio
 import json
+import time
 import sys
 
 
@@ -33,17 +48,22 @@ class Generator:
         self.graph = nx.DiGraph()
         self.sampling_procedures = {}
         self.entity_to_count = {}
+        self.sampling_plans = {}
+        self.numpy_random = np.random.default_rng()
         self.load_config()
 
     def load_config(self) -> None:
         """
-        Loads the configuration stored in the xml file and create a graph of its entities/attributes.
+        Loads the configuration stored in the xml file, create a graph of its entities/attributes and compiles it into one sampling plan per domain.
         """
 
         # Load config tree and its root
         config_tree = ET.parse(self.config_file)
         config_root = config_tree.getroot()
 
+        # Storage for the entity counts of each domain
+        domain_to_entity_to_count = {}
+
         # Traverse and collect domains
         for domain in config_root.find("domains").findall("domain"):
             # Fetch domain id (name)
@@ -52,6 +72,7 @@ class Generator:
             # Add node for domain
             self.graph.add_node(domain_id, type="domain",
                                 eii=domain.get("eii"))
+            domain_to_entity_to_count[domain_id] = {}
 
             # Traverse and collect domain attributes
             for domain_attribute in domain.findall("domainAttribute"):
@@ -69,6 +90,8 @@ class Generator:
 
                 # Add node for entity
                 self.graph.add_node(entity_id, type="entity", parent=domain_id)
+                domain_to_entity_to_count[domain_id][entity_id] = int(
+                    entity.get("count"))
 
                 # Traverse and collect entity attributes
                 for entity_attribute in entity.findall("entityAttribute"):
@@ -105,6 +128,10 @@ class Generator:
         except nx.NetworkXNoCycle:
             pass
 
+        # Compile the graph once such that generating a seed only has to run the precompiled plan of its domain
+        self.sampling_plans = compile_sampling_plans(
+            self.graph, domain_to_entity_to_count, self.dictionary_key_structure)
+
     def register_sampling_procedure(self, attribute_id: str) -> None:
         """
         Used for creating the actual sampling procedure function for the individual attributes (domain and entity attributes).
@@ -169,14 +196,9 @@ class Generator:
             dict[str, int]: A dictionary containing the name of the entities and their respective number of occurrences.
         """
 
-        # Load config tree and its root
-        config_tree = ET.parse(self.config_file)
-        config_root = config_tree.getroot()
-
-        # Traverse domains and only check for the domain_id
-        for domain in config_root.find("domains").findall("domain"):
-            if domain.get("id") == domain_id:
-                return {entity.get("id"): int(entity.get("count")) for entity in domain.find("entities").findall("entity")}
+        # Look up the entity counts in the precompiled sampling plan of the domain
+        if domain_id in self.sampling_plans:
+            return dict(self.sampling_plans[domain_id].entity_to_count)
 
         return {}
 
@@ -238,6 +260,9 @@ class Generator:
         # Storage for filtered dictionary
         filtered_dictionary = {}
 
+        # Fetch the attributes permitted by the eii level of the domain
+        eii_permitted_attributes = self.sampling_plans[domain_id].eii_permitted_attributes
+
         for key, value in dictionary.items():
             if isinstance(value, list):
                 # If entity not in occurring entities just skip
@@ -249,7 +274,7 @@ class Generator:
                 for sub_dictionary in value:
                     if isinstance(sub_dictionary, dict):
                         filtered_sub_dictionary = {
-                            key: value for key, value in sub_dictionary.items() if key in allowed_attributes and config_framework.EII_LEVEL_MAPPING[self.graph.nodes[key]["eii"]] <= config_framework.EII_LEVEL_MAPPING[self.graph.nodes[domain_id]["eii"]]}
+                            key: value for key, value in sub_dictionary.items() if key in allowed_attributes and key in eii_permitted_attributes}
 
                         # If this dictionary is not empty, add it to filtered list
                         if filtered_sub_dictionary:
@@ -261,106 +286,98 @@ class Generator:
                     filtered_dictionary[key] = filtered_dictionary_list
             else:
                 # Filter singular key value pair
-                if key in allowed_attributes and config_framework.EII_LEVEL_MAPPING[self.graph.nodes[key]["eii"]] <= config_framework.EII_LEVEL_MAPPING[self.graph.nodes[domain_id]["eii"]]:
+                if key in allowed_attributes and key in eii_permitted_attributes:
                     filtered_dictionary[key] = value
 
         return filtered_dictionary
 
-    def generate_seed(self, domain_id: str) -> dict[str, Union[str, int, list[str], list[int]]]:
+    def sample_occurrences(self, plan: SamplingPlan) -> tuple[set[str], set[str]]:
         """
-        Generates a singular seed by sampling according to the registered sampling procedures and the constraints specified in the configuration file.
+        Samples which entities and attributes occur in a single seed by running the co-occurrence relations of the precompiled sampling plan.
 
         Parameters:
-            domain_id (str): The name (id) of the domain.
+            plan (SamplingPlan): The precompiled sampling plan of the domain.
 
         Returns:
-            dict[str, Union[str, int, list[str], list[int]]]: The sampled seed returned as a dictionary of its attributes and the corresponding values.
+            tuple[set[str], set[str]]: The occurring entities and the occurring attributes.
         """
 
-        # Update entity_to_count dictionary such that its values are accessible in the sampling procedure functions
-        self.entity_to_count = self.get_entities_and_count_of_domain(domain_id)
-
-        # Create a verification seed to later verify that the seed returned by the sampling function contains all fields necessary
-        verification_seed = {entity: [{} for _ in range(
-            self.entity_to_count[entity])] for entity in self.entity_to_count.keys()}
-        verification_seed["domain"] = domain_id
-
-        # Compute subgraph of only entity nodes
-        only_entity_nodes = [node for node, node_attributes in self.graph.nodes(
-            data=True) if node_attributes.get("type") == "entity"]
-        only_entity_graph = self.graph.subgraph(only_entity_nodes)
-
-        # Traverse entity-only subgraph in topological order to compute co-occurrence relations specified
-        only_entity_graph_order = list(nx.topological_sort(only_entity_graph))
+        # Traverse entities in topological order to compute co-occurrence relations specified
         occurring_entities = set()
-        for entity in [entity for entity in only_entity_graph_order if entity.split(".")[0] == domain_id]:
+        for entity, entity_predecessors in plan.entity_order:
             # Check whether all predecessors were sampled
-            entity_predecessors = list(only_entity_graph.predecessors(entity))
-            if any(predecessor not in occurring_entities for predecessor in entity_predecessors):
+            if any(predecessor not in occurring_entities for predecessor, _ in entity_predecessors):
                 continue
 
-            # If no predecessors then sample always
-            if not entity_predecessors:
-                occurring_entities.add(entity)
-                continue
-
-            # If all predecessors were sampled, compute occurrence probabilistically
+            # If all predecessors were sampled (or there are none), compute occurrence probabilistically
             entity_occurrs = True
-            for predecessor in entity_predecessors:
-                # Fetch data for edge connecting entity to predecessor
-                edge_data = only_entity_graph.edges[predecessor, entity]
-
+            for _, probability in entity_predecessors:
                 # Probabilistically keep node or discard it
-                if random.random() > edge_data.get("probability"):
+                if random.random() > probability:
                     entity_occurrs = False
                     break
 
             if entity_occurrs:
                 occurring_entities.add(entity)
 
-        # Compute subgraph of only attribute nodes
-        only_attribute_nodes = [node for node, node_attributes in self.graph.nodes(data=True) if node_attributes.get(
-            "type") == "domain_attribute" or node_attributes.get("type") == "entity_attribute"]
-        only_attribute_graph = self.graph.subgraph(only_attribute_nodes)
-
-        # Traverse attribute-only subgraph in topological order to sample and compute co-occurrence relations specified
-        only_attribute_graph_order = list(
-            nx.topological_sort(only_attribute_graph))
+        # Traverse attributes in topological order to compute co-occurrence relations specified
         occurring_attributes = set()
-        for attribute in [attribute for attribute in only_attribute_graph_order if attribute.split(".")[0] == domain_id]:
-            # Update verification seed
-            if self.graph.nodes[attribute]["type"] == "domain_attribute":
-                verification_seed[attribute] = None
-            elif self.graph.nodes[attribute]["type"] == "entity_attribute":
-                key = ".".join(attribute.split(".")[:2])
-                for d in verification_seed[key]:
-                    d[attribute] = None
-
-            if self.graph.nodes[attribute]["parent"] in occurring_entities or self.graph.nodes[attribute]["type"] == "domain_attribute":
+        for attribute, parent, attribute_predecessors in plan.attribute_order:
+            if parent is None or parent in occurring_entities:
                 # Check whether all predecessors were sampled
-                attribute_predecessors = list(
-                    only_attribute_graph.predecessors(attribute))
-                if any(predecessor not in occurring_attributes for predecessor in attribute_predecessors):
+                if any(predecessor not in occurring_attributes for predecessor, _ in attribute_predecessors):
                     continue
 
-                # If no predecessor then sample always
-                if not attribute_predecessors:
-                    occurring_attributes.add(attribute)
-
-                # If all predecessors were sampled, compute occurrence probabilistically
+                # If all predecessors were sampled (or there are none), compute occurrence probabilistically
                 attribute_occurs = True
-                for predecessor in attribute_predecessors:
-                    # Fetch data for edge connecting attribute to predecessor
-                    edge_data = only_attribute_graph.edges[predecessor, attribute]
-
+                for _, probability in attribute_predecessors:
                     # Probabilistically keep node or discard it
-                    if random.random() > edge_data.get("probability"):
+                    if random.random() > probability:
                         attribute_occurs = False
                         break
 
                 if attribute_occurs:
                     occurring_attributes.add(attribute)
 
+        return occurring_entities, occurring_attributes
+
+    def generate_seed_batch(self, domain_id: str, n: int) -> OccurrenceMasks:
+        """
+        Takes the entity and attribute occurrence decisions of n seeds of a domain at once.
+
+        Parameters:
+            domain_id (str): The name (id) of the domain.
+            n (int): The number of seeds.
+
+        Returns:
+            OccurrenceMasks: The occurrence masks of the n seeds; occurrences(i) can be passed to generate_seed.
+        """
+
+        return sample_occurrence_masks(self.sampling_plans[domain_id], n, self.numpy_random)
+
+    def generate_seed(self, domain_id: str, occurrences: tuple[set[str], set[str]] = None) -> dict[str, Union[str, int, list[str], list[int]]]:
+        """
+        Generates a singular seed by sampling according to the registered sampling procedures and the constraints specified in the configuration file.
+
+        Parameters:
+            domain_id (str): The name (id) of the domain.
+            occurrences (tuple[set[str], set[str]]): The occurring entities and attributes, e.g. taken from generate_seed_batch. If not provided, they are sampled for this seed alone.
+
+        Returns:
+            dict[str, Union[str, int, list[str], list[int]]]: The sampled seed returned as a dictionary of its attributes and the corresponding values.
+        """
+
+        # Fetch precompiled sampling plan of the domain
+        plan = self.sampling_plans[domain_id]
+
+        # Update entity_to_count dictionary such that its values are accessible in the sampling procedure functions
+        self.entity_to_count = plan.entity_to_count
+
+        # Compute co-occurrence relations specified for the entities and attributes
+        if occurrences is None:
+            occurrences = self.sample_occurrences(plan)
+        occurring_entities, occurring_attributes = occurrences
+
         # Fetch sampling procedure
         sampling_procedure = self.sampling_procedures.get(domain_id)
         if not sampling_procedure:
@@ -370,13 +387,13 @@ class Generator:
         sample = sampling_procedure()
         sample["domain"] = domain_id
 
-        # Validate sample
-        same_key_structure = self.compare_dictionary_key_structure(
-            verification_seed, sample)
+        # Validate sample against the key structure of the verification seed
+        same_key_structure = plan.verification_key_structure == self.dictionary_key_structure(
+            sample)
 
         if not same_key_structure:
             print(
-                f"WARNING: The provided sampling procedure for the domain {domain_id} does not output a correct sample.\n\nExpected:\n{verification_seed}\n\nGot:\n{sample}\n\nFix the issue and restart the framework.")
+                f"WARNING: The provided sampling procedure for the domain {domain_id} does not output a correct sample.\n\nExpected:\n{plan.verification_key_structure}\n\nGot:\n{sample}\n\nFix the issue and restart the framework.")
             sys.exit("FRAMEWORK EXECUTION ABORTED")
 
         # Storage for seed
@@ -432,45 +449,205 @@ class Generator:
 
         return domain_to_text_types_to_number_of_seeds_and_documents
 
-    def generate_seeds(self, domain_ids: list[str]) -> None:
+    def generate_seeds(self, domain_ids: list[str], number_of_workers: int = config_framework.NUMBER_OF_SEED_GENERATION_WORKERS) -> None:
         """
         Generates as many seeds for the specified domain as configured in the config file.
 
         Parameters:
             domain_ids (list[str]): The names (ids) of the domains.
+            number_of_workers (int): The number of worker processes. If None, the seeds are generated sequentially in this process; otherwise they are generated in parallel. Every seed gets its own random number stream derived from config_framework.MASTER_SEED and unique instances (e.g. humans) are claimed in the order of the seeds, so the output is identical for every number of workers.
         """
 
+        # Skip stage if the seeds file was already generated from the same inputs
+        fingerprint = compute_stage_fingerprint("seeds", [self.config_file, config_framework.SAMPLING_PROCEDURES] + config_framework.ADDITIONAL_SEED_STAGE_INPUTS, {
+                                                "domain_ids": domain_ids})
+        if stage_is_up_to_date([config_framework.SEEDS], fingerprint):
+            print(
+                f"{'\033[32m'}Seeds are up to date (same master seed and inputs), skipping seed generation{'\033[0m'}")
+            return
+
         domain_to_text_types_to_number_of_seeds_and_documents = self.compute_domain_to_text_types_to_number_of_seeds_and_documents(
             domain_ids)
 
-        # Compute number of seeds to be generated for progress bar
-        number_of_seeds = 0
-        for domain_id in domain_ids:
-            for texttype in domain_to_text_types_to_number_of_seeds_and_documents[domain_id]:
-                for _ in range(domain_to_text_types_to_number_of_seeds_and_documents[domain_id][texttype][0]):
-                    number_of_seeds += 1
+        # Collect (domain, text type, index) work items
+        work_items = [(domain_id, texttype, index) for domain_id in domain_ids for texttype in domain_to_text_types_to_number_of_seeds_and_documents[domain_id]
+                      for index in range(domain_to_text_types_to_number_of_seeds_and_documents[domain_id][texttype][0])]
+
+        # Start without claimed unique instances
+        set_instance_claims(InstanceClaims())
+
+        # Generate seeds in parallel if requested
+        if number_of_workers is not None:
+            self.generate_seeds_in_parallel(work_items, number_of_workers)
+            write_stage_manifest([config_framework.SEEDS], fingerprint)
+            return
 
         # Open seeds file, sample seeds and write them to jsonl file
         with open(config_framework.SEEDS, "w", encoding='utf-8', buffering=1) as seeds:
             progress_bar = tqdm(
-                total=number_of_seeds, desc=f"{'\033[34m'}Generating Seeds...{'\033[0m'}")
+                total=len(work_items), desc=f"{'\033[34m'}Generating Seeds...{'\033[0m'}")
 
-            for domain_id in domain_ids:
-                for texttype in domain_to_text_types_to_number_of_seeds_and_documents[domain_id]:
-                    for _ in range(domain_to_text_types_to_number_of_seeds_and_documents[domain_id][texttype][0]):
-                        seed = self.generate_seed(domain_id)
-                        seed["text_type"] = texttype
-                        seeds.write(json.dumps(seed) + "\n")
-                        progress_bar.update(1)
+            for domain_id, texttype, index in work_items:
+                seeds.write(generate_seed_line(
+                    self, domain_id, texttype, index, config_framework.MASTER_SEED))
+                progress_bar.update(1)
+
+        write_stage_manifest([config_framework.SEEDS], fingerprint)
+
+    def generate_seeds_in_parallel(self, work_items: list[tuple[str, str, int]], number_of_workers: int) -> None:
+        """
+        Generates the seeds by spreading chunks of work items across long-lived worker processes, which claim unique instances (e.g. humans) tentatively. The chunks are verified and written in their original order: a seed is kept if its claims are exactly what this process would have claimed, and generated again in this process otherwise, so the output is identical to the sequential generation.
+
+        Parameters:
+            work_items (list[tuple[str, str, int]]): The (domain, text type, index) work items.
+            number_of_workers (int): The number of worker processes.
+        """
+
+        # Split work items into chunks of fixed size
+        chunks = [work_items[i:i + config_framework.SEED_GENERATION_CHUNK_SIZE]
+                  for i in range(0, len(work_items), config_framework.SEED_GENERATION_CHUNK_SIZE)]
+        instance_claims = get_instance_claims()
+
+        # Generate chunks in worker processes and write them in order
+        with open(config_framework.SEEDS, "w", encoding='utf-8') as seeds, ProcessPoolExecutor(max_workers=number_of_workers, mp_context=multiprocessing.get_context("spawn"), initializer=initialize_seed_worker, initargs=(self.config_file, config_framework.SAMPLING_PROCEDURES)) as executor:
+            progress_bar = tqdm(
+                total=len(work_items), desc=f"{'\033[34m'}Generating Seeds...{'\033[0m'}")
+
+            # Keep a bounded number of chunks in flight, such that every chunk is submitted with recent claims
+            pending_chunks = deque()
+            number_of_submitted_chunks = 0
+            for chunk in chunks:
+                while number_of_submitted_chunks < len(chunks) and len(pending_chunks) < 2 * number_of_workers:
+                    pending_chunks.append(executor.submit(
+                        generate_seed_chunk, chunks[number_of_submitted_chunks], config_framework.MASTER_SEED, instance_claims.snapshot()))
+                    number_of_submitted_chunks += 1
+
+                # Keep seeds whose claims are verified and generate the others again
+                for (domain_id, texttype, index), (seed_line, journal) in zip(chunk, pending_chunks.popleft().result()):
+                    if seed_line is None or not instance_claims.commit(journal):
+                        seed_line = generate_seed_line(
+                            self, domain_id, texttype, index, config_framework.MASTER_SEED)
+                    seeds.write(seed_line)
+
+                seeds.flush()
+                progress_bar.update(len(chunk))
+
+    def compute_attribute_frequencies(self) -> dict[str, float]:
+        """
+        Computes the frequencies (probabilities of being included in a blank seed) of all domain and entity attributes.
+
+        Returns:
+            dict[str, float]: A dictionary mapping the attribute names to their respective probability of being included.
+        """
+
+        # Fetch frequency probabilities for all attributes
+        config_root = ET.parse(self.config_file).getroot()
+        probabilities = {}
+        for domain in config_root.find("domains").findall("domain"):
+            for domain_attribute in domain.findall("domainAttribute"):
+                probabilities[domain_attribute.get(
+                    "id")] = float(domain_attribute.get("frequency"))
+            for entity in domain.find("entities").findall("entity"):
+                for entity_attribute in entity.findall("entityAttribute"):
+                    probabilities[entity_attribute.get(
+                        "id")] = float(entity_attribute.get("frequency"))
+
+        return probabilities
+
+    def generate_blank_seeds(self, domain_ids: list[str], number_of_workers: int = config_framework.NUMBER_OF_BLANKING_WORKERS) -> None:
+        """
+        Generates the blank seeds of all documents (the prompts of the document generation) by streaming the seeds through the blanking. Every seed gets its own random number stream derived from config_framework.MASTER_SEED, so the output is identical for every number of workers.
+
+        Parameters:
+            domain_ids (list[str]): The names (ids) of the domains.
+            number_of_workers (int): The number of worker processes. If None, the seeds are blanked sequentially in this process; otherwise chunks of seeds are blanked in parallel and written in their original order.
+        """
+
+        # Skip stage if the blank seeds were already generated from the same seeds and inputs
+        fingerprint = compute_stage_fingerprint("blank_seeds", [self.config_file, config_framework.SEEDS], {
+                                                "domain_ids": domain_ids})
+        if stage_is_up_to_date([config_framework.BLANK_SEEDS], fingerprint):
+            print(
+                f"{'\033[32m'}Blank seeds are up to date (same master seed and inputs), skipping blank seed generation{'\033[0m'}")
+            return
+
+        domain_to_text_types_to_number_of_seeds_and_documents = self.compute_domain_to_text_types_to_number_of_seeds_and_documents(
+            domain_ids)
+
+        # Fetch occurring attributes of each text type
+        config_root = ET.parse(self.config_file).getroot()
+        domain_to_text_types_to_allowed_attributes = {domain.get("id"): {texttype.get("id"): texttype.find("occurringAttributes").get("value") for texttype in domain.find(
+            "texttypes").findall("texttype")} for domain in config_root.find("domains").findall("domain") if domain.get("id") in domain_ids}
+        initializer_arguments = (domain_to_text_types_to_number_of_seeds_and_documents,
+                                 domain_to_text_types_to_allowed_attributes, self.compute_attribute_frequencies())
+
+        # Compute number of blank seeds to be generated for progress bar
+        number_of_blank_seeds = sum(number_of_seeds * number_of_documents for text_types in domain_to_text_types_to_number_of_seeds_and_documents.values()
+                                    for number_of_seeds, number_of_documents in text_types.values())
+
+        # Time spent blanking is reported next to the time spent waiting for the model (see helpers_telemetry.py)
+        blanking_started_at = time.perf_counter()
+        with open(config_framework.SEEDS, "r", encoding='utf-8') as seeds, open(config_framework.BLANK_SEEDS, "w", encoding='utf-8') as blank_seeds:
+            progress_bar = tqdm(
+                total=number_of_blank_seeds, desc=f"{'\033[34m'}Generating Blank Seeds...{'\033[0m'}")
+
+            # Stream seeds (with their index) in chunks of fixed size (independent of the number of workers)
+            chunks = (list(chunk) for chunk in batched(
+                enumerate(seeds), config_framework.BLANKING_CHUNK_SIZE))
+
+            if number_of_workers is None:
+                initialize_blanking_worker(*initializer_arguments)
+                for chunk in chunks:
+                    chunk_blank_seeds = blank_seed_chunk(
+                        chunk, config_framework.MASTER_SEED)
+                    blank_seeds.writelines(chunk_blank_seeds)
+                    progress_bar.update(len(chunk_blank_seeds))
+            else:
+                with ProcessPoolExecutor(max_workers=number_of_workers, mp_context=multiprocessing.get_context("spawn"), initializer=initialize_blanking_worker, initargs=initializer_arguments) as executor:
+                    # Keep a bounded number of chunks in flight, such that the seeds file is never loaded as a whole
+                    pending_chunks = deque()
+                    for chunk in chunks:
+                        pending_chunks.append(executor.submit(
+                            blank_seed_chunk, chunk, config_framework.MASTER_SEED))
+                        while len(pending_chunks) > 2 * number_of_workers or (pending_chunks and pending_chunks[0].done()):
+                            chunk_blank_seeds = pending_chunks.popleft().result()
+                            blank_seeds.writelines(chunk_blank_seeds)
+                            progress_bar.update(len(chunk_blank_seeds))
+
+                    while pending_chunks:
+                        chunk_blank_seeds = pending_chunks.popleft().result()
+                        blank_seeds.writelines(chunk_blank_seeds)
+                        progress_bar.update(len(chunk_blank_seeds))
+
+        get_telemetry().add_time("blanking", time.perf_counter() - blanking_started_at)
+        write_stage_manifest([config_framework.BLANK_SEEDS], fingerprint)
 
     def generate_documents(self, domain_ids: list[str]) -> None:
         """
-        Generates as many documents per text type per seed as specified in the config file.
+        Generates as many documents per text type per seed as specified in the config file, from the blank seeds (which are generated first if they are not up to date).
 
         Parameters:
             domain_ids (list[str]): The names (ids) of the domains.
         """
 
+        # Make sure the blank seeds belong to the current seeds
+        self.generate_blank_seeds(domain_ids)
+
+        # Skip stage if the documents were already generated from the same blank seeds and inputs
+        if config_framework.BATCH_PROVIDER is not None:
+            backend, model = f"batch:{config_framework.BATCH_PROVIDER}", config_framework.BATCH_MODEL
+        else:
+            backend, model = config_framework.DOCUMENT_GENERATION_BACKEND, config_framework.OFFLINE_MODEL if config_framework.DOCUMENT_GENERATION_BACKEND == "offline" else config_framework.MODEL
+        fingerprint = compute_stage_fingerprint("documents", [self.config_file, config_framework.BLANK_SEEDS], {
+                                                "domain_ids": domain_ids, "backend": backend, "model": model})
+        if stage_is_up_to_date([config_framework.DOCUMENTS], fingerprint):
+            print(
+                f"{'\033[32m'}Documents are up to date (same master seed and inputs), skipping document generation{'\033[0m'}")
+            return
+
+        # Show estimated cost and duration before sending any request
+        self.estimate_document_generation(domain_ids)
+
         # Load configuration file
         config_tree = ET.parse(self.config_file)
         config_root = config_tree.getroot()
@@ -479,13 +656,16 @@ class Generator:
         domain_to_text_types_to_number_of_seeds_and_documents = self.compute_domain_to_text_types_to_number_of_seeds_and_documents(
             domain_ids)
 
-        # Fetch system prompts and occurring attributes for each domain
+        # Fetch system prompts, occurring attributes and (optional) limits of the documents for each domain
         system_prompts = {}
         for domain in config_root.find("domains").findall("domain"):
             prompts_for_domain = {}
             for texttype in domain.find("texttypes").findall("texttype"):
+                maximum_tokens = texttype.find("maximumTokens")
+                limits = GenerationLimits(int(maximum_tokens.get("value")) if maximum_tokens is not None else None, tuple(
+                    stop_sequence.get("value") for stop_sequence in texttype.findall("stopSequence")))
                 prompts_for_domain[texttype.get("id")] = (
-                    texttype.find("texttypePrompt").get("value"), texttype.find("occurringAttributes").get("value"))
+                    texttype.find("texttypePrompt").get("value"), texttype.find("occurringAttributes").get("value"), limits)
             system_prompts[domain.get("id")] = prompts_for_domain
 
         # Assemble system prompts for model inference
@@ -497,21 +677,62 @@ class Generator:
                         system_prompts_for_model_inference.extend(
                             [system_prompts[domain][texttype]])
 
-        # Fetch frequency probabilities for all attributes
-        probabilities = {}
-        for domain in config_root.find("domains").findall("domain"):
-            for domain_attribute in domain.findall("domainAttribute"):
-                probabilities[domain_attribute.get(
-                    "id")] = float(domain_attribute.get("frequency"))
-            for entity in domain.find("entities").findall("entity"):
-                for entity_attribute in entity.findall("entityAttribute"):
-                    probabilities[entity_attribute.get(
-                        "id")] = float(entity_attribute.get("frequency"))
-
         # Compute number of seeds
         number_of_text_types = sum(1 for texttypes in domain_to_text_types_to_number_of_seeds_and_documents.values()
                                    for _, _ in texttypes.values())
 
-        # Execute document generation
-        asyncio.run(generate_document_file(system_prompts_for_model_inference, config_framework.SEEDS, config_framework.DOCUMENTS,
-                                           config_framework.BLANK_SEEDS, number_of_text_types, domain_to_text_types_to_number_of_seeds_and_documents, probabilities))
+        # Execute document generation (the stage is only complete if every document was generated)
+        if config_framework.BATCH_PROVIDER is not None:
+            number_of_missing_documents = generate_batched_document_file(create_batch_provider(
+                config_framework.BATCH_PROVIDER), system_prompts_for_model_inference, config_framework.BLANK_SEEDS, config_framework.DOCUMENTS)
+        elif config_framework.NUMBER_OF_DOCUMENT_GENERATION_SHARDS is None:
+            number_of_missing_documents = asyncio.run(generate_document_file(system_prompts_for_model_inference, config_framework.BLANK_SEEDS,
+                                                                             config_framework.DOCUMENTS, number_of_text_types, domain_to_text_types_to_number_of_seeds_and_documents))
+        else:
+            number_of_missing_documents = generate_sharded_document_file(system_prompts_for_model_inference, config_framework.BLANK_SEEDS, config_framework.DOCUMENTS,
+                                                                         number_of_text_types, domain_to_text_types_to_number_of_seeds_and_documents, config_framework.NUMBER_OF_DOCUMENT_GENERATION_SHARDS)
+        if number_of_missing_documents == 0:
+            write_stage_manifest([config_framework.DOCUMENTS], fingerprint)
+
+    def estimate_document_generation(self, domain_ids: list[str]) -> dict:
+        """
+        Estimates tokens, cost and duration of the document generation from the planned number of requests, the length of the system prompts and the average length of the blank seeds (which have to be generated beforehand).
+
+        Parameters:
+            domain_ids (list[str]): The names (ids) of the domains.
+
+        Returns:
+            dict: The estimate per domain and text type and in total.
+        """
+
+        domain_to_text_types_to_number_of_seeds_and_documents = self.compute_domain_to_text_types_to_number_of_seeds_and_documents(
+            domain_ids)
+
+        # Number of tokens of the system prompt of each text type
+        config_root = ET.parse(self.config_file).getroot()
+        system_prompt_tokens = {}
+        for domain in config_root.find("domains").findall("domain"):
+            for texttype in domain.find("texttypes").findall("texttype"):
+                system_prompt_tokens[(domain.get("id"), texttype.get("id"))] = estimate_number_of_tokens(
+                    texttype.find("texttypePrompt").get("value"))
+
+        # Average number of tokens of the blank seeds of each text type (without the document id, which is not sent)
+        seed_tokens = {}
+        with open(config_framework.BLANK_SEEDS, "r", encoding='utf-8') as blank_seeds:
+            for blank_seed in blank_seeds:
+                blank_seed = json.loads(blank_seed)
+                blank_seed.pop("document_id")
+                key = (blank_seed["domain"], blank_seed["text_type"])
+                total, count = seed_tokens.get(key, (0, 0))
+                seed_tokens[key] = (
+                    total + estimate_number_of_tokens(json.dumps(blank_seed)), count + 1)
+
+        prompt_tokens = {key: system_prompt_tokens[key] + (seed_tokens[key][0] // seed_tokens[key][1] if key in seed_tokens else 0)
+                         for key in system_prompt_tokens}
+        estimate = estimate_document_generation(
+            domain_to_text_types_to_number_of_seeds_and_documents, prompt_tokens)
+
+        total = estimate["total"]
+        print(f"{'\033[34m'}Estimated document generation: {total["requests"]} requests, {total["prompt_tokens"]} prompt and {total["completion_tokens"]} completion tokens, {total["cost"]:.2f} USD, {total["duration"] / 60:.1f} minutes{'\033[0m'}")
+
+        return estimate
@@ -0,0 +1,626 @@
+"""
+helpers_backends.py
+
+This module contains the backends answering the requests of the document generation: the OpenRouter API (optionally streamed, such that documents are cut off as soon as they reach the limits of their text type), an offline engine (vLLM) generating batches of documents on local hardware and a deterministic stub for testing the pipeline without any model.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from helpers_request_scheduling import AdaptiveConcurrencyLimiter, RETRYABLE_STATUS_CODES, THROTTLING_STATUS_CODES, parse_retry_after, compute_backoff
+from helpers_response_cache import ResponseCache, compute_cache_key
+from helpers_budget import estimate_number_of_tokens
+from helpers_telemetry import get_telemetry
+from errors import DocumentRequestFailedError, UnknownDocumentGenerationBackendError
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from dotenv import load_dotenv
+import importlib.util
+import config_framework
+import hashlib
+import asyncio
+import httpx
+import json
+import math
+import time
+import os
+
+# Load environment variables
+load_dotenv()
+
+# Define API parts
+OPEN_ROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+OPEN_ROUTER_API_KEYS = [key.strip() for key in os.getenv(
+    "OPENROUTER_API_KEYS", "").split(",") if key.strip()] or [OPEN_ROUTER_API_KEY]  # Keys spread over the shards of the document generation
+OPEN_ROUTER_API_COMPLETIONS_PATH = "/chat/completions"
+OPEN_ROUTER_API_CREDITS_URL = f"{config_framework.OPEN_ROUTER_API_BASE_URL}/auth/key"
+OPEN_ROUTER_API_HEADERS = {
+    "Authorization": f"Bearer {OPEN_ROUTER_API_KEY}", "Content-Type": "application/json"}
+
+
+@dataclass(frozen=True)
+class GenerationLimits:
+    """
+    The limits of the documents of a text type (configured in the config file).
+
+    Attributes:
+        maximum_tokens (int): The maximum number of completion tokens of a document (None if unlimited).
+        stop_sequences (tuple[str, ...]): The sequences ending a document (not included in the document).
+    """
+
+    maximum_tokens: int = None
+    stop_sequences: tuple[str, ...] = ()
+
+
+# Limits of text types which do not configure any
+NO_GENERATION_LIMITS = GenerationLimits()
+
+
+def apply_stop_sequences(document: str, stop_sequences: tuple[str, ...], start: int = 0) -> tuple[str, bool]:
+    """
+    Cuts a document off before the first stop sequence (providers do not always honor them).
+
+    Parameters:
+        document (str): The document.
+        stop_sequences (tuple[str, ...]): The stop sequences.
+        start (int): The position from which on the document is searched (everything before it was searched already).
+
+    Returns:
+        tuple[str, bool]: The document and whether it was cut off.
+    """
+
+    positions = [position for position in (document.find(
+        stop_sequence, start) for stop_sequence in stop_sequences) if position != -1]
+    if not positions:
+        return document, False
+
+    return document[:min(positions)], True
+
+
+def create_http_client(maximum_connections: int, base_url: str = None, headers: dict[str, str] = None) -> httpx.AsyncClient:
+    """
+    Creates the client of the API requests: the authorization headers are set once, the keep-alive pool holds as many connections as requests may be in flight (such that connections are reused instead of being reopened), HTTP/2 is used if the h2 package is installed and the timeouts of connecting, sending, waiting for the response and waiting for a free connection are set separately.
+
+    Parameters:
+        maximum_connections (int): The maximum number of open connections (the maximum number of requests in flight).
+        base_url (str): The base url of the API (config_framework.OPEN_ROUTER_API_BASE_URL if None).
+        headers (dict[str, str]): The headers (authorization) of the requests (OPEN_ROUTER_API_HEADERS if None).
+
+    Returns:
+        httpx.AsyncClient: The client (to be closed with aclose).
+    """
+
+    limits = httpx.Limits(max_connections=maximum_connections, max_keepalive_connections=maximum_connections,
+                          keepalive_expiry=config_framework.HTTP_KEEPALIVE_EXPIRY)
+    timeout = httpx.Timeout(connect=config_framework.REQUEST_CONNECT_TIMEOUT, read=config_framework.REQUEST_TIMEOUT,
+                            write=config_framework.REQUEST_WRITE_TIMEOUT, pool=config_framework.REQUEST_POOL_TIMEOUT)
+    http2 = config_framework.HTTP2 and importlib.util.find_spec(
+        "h2") is not None
+
+    return httpx.AsyncClient(base_url=base_url or config_framework.OPEN_ROUTER_API_BASE_URL, headers=headers or OPEN_ROUTER_API_HEADERS, limits=limits, timeout=timeout, http2=http2)
+
+
+def create_http_clients(maximum_connections: int, base_url: str = None, headers: dict[str, str] = None) -> list[httpx.AsyncClient]:
+    """
+    Creates enough clients with pools of config_framework.HTTP_CONNECTIONS_PER_CLIENT connections to hold the given number of connections (the connection pool of httpx checks all of its connections whenever a request is assigned, which becomes the bottleneck with hundreds of connections in one pool).
+
+    Parameters:
+        maximum_connections (int): The maximum number of open connections (the maximum number of requests in flight).
+        base_url (str): The base url of the API (config_framework.OPEN_ROUTER_API_BASE_URL if None).
+        headers (dict[str, str]): The headers (authorization) of the requests (OPEN_ROUTER_API_HEADERS if None).
+
+    Returns:
+        list[httpx.AsyncClient]: The clients (to be closed with aclose).
+    """
+
+    number_of_clients = math.ceil(
+        maximum_connections / config_framework.HTTP_CONNECTIONS_PER_CLIENT)
+
+    return [create_http_client(math.ceil(maximum_connections / number_of_clients), base_url, headers) for _ in range(number_of_clients)]
+
+
+@lru_cache(maxsize=1024)
+def serialize_request_prefix(model: str, system: str, limits: GenerationLimits = NO_GENERATION_LIMITS, stream: bool = False) -> bytes:
+    """
+    Serializes the part of the request body which is shared by all requests with the same system prompt and limits (model, usage accounting, limits, streaming and system message).
+
+    Parameters:
+        model (str): The model.
+        system (str): The system prompt.
+        limits (GenerationLimits): The limits of the documents.
+        stream (bool): Whether the response is streamed as server-sent events.
+
+    Returns:
+        bytes: The body up to (and including the separator before) the user message.
+    """
+
+    prefix = {"model": model, "usage": {"include": True}}
+    if limits.maximum_tokens is not None:
+        prefix["max_tokens"] = limits.maximum_tokens
+    if limits.stop_sequences:
+        prefix["stop"] = list(limits.stop_sequences)
+    if stream:
+        prefix["stream"] = True
+    prefix = json.dumps(
+        {**prefix, "messages": [{"role": "system", "content": system}]})
+
+    # Cut off the closing brackets of the messages and the body
+    return prefix[:-2].encode('utf-8') + b", "
+
+
+def serialize_request_body(system: str, seed: str, limits: GenerationLimits = NO_GENERATION_LIMITS, stream: bool = False) -> bytes:
+    """
+    Serializes the body of a request once (it is reused for every attempt), reusing the serialized system message.
+
+    Parameters:
+        system (str): The system prompt.
+        seed (str): The user prompt (the blank seed).
+        limits (GenerationLimits): The limits of the document.
+        stream (bool): Whether the response is streamed as server-sent events.
+
+    Returns:
+        bytes: The json body of the request.
+    """
+
+    return serialize_request_prefix(config_framework.MODEL, system, limits, stream) + json.dumps({"role": "user", "content": seed}).encode('utf-8') + b"]}"
+
+
+async def read_completion_stream(response: httpx.Response, limits: GenerationLimits, sent_at: float) -> dict:
+    """
+    Reads a streamed completion (server-sent events) chunk by chunk and stops reading as soon as the document reaches a stop sequence or its maximum number of (estimated) tokens, such that the request does not occupy a slot any longer than necessary. Closing the response afterwards cancels the rest of the generation.
+
+    Parameters:
+        response (httpx.Response): The streamed response.
+        limits (GenerationLimits): The limits of the document.
+        sent_at (float): The time (time.perf_counter) the request was sent at, for the time to first token.
+
+    Returns:
+        dict: The completion in the form of a non-streamed completion (with the usage reported by the provider, None if the stream was cut off before the provider reported it).
+    """
+
+    telemetry = get_telemetry()
+    content = ""
+    finish_reason = None
+    usage = None
+    longest_stop_sequence = max((len(stop_sequence)
+                                for stop_sequence in limits.stop_sequences), default=0)
+
+    async for line in response.aiter_lines():
+        # Skip keep-alive comments and the blank lines between events
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+
+        chunk = json.loads(data)
+        if "error" in chunk:
+            # Provider failed after the stream started (treated like a malformed response)
+            raise ValueError(f"Error in stream: {chunk["error"]}")
+        if chunk.get("usage"):
+            usage = chunk["usage"]
+        if not chunk.get("choices"):
+            continue
+
+        finish_reason = chunk["choices"][0].get(
+            "finish_reason") or finish_reason
+        delta = (chunk["choices"][0].get("delta") or {}).get("content")
+        if not delta:
+            continue
+        if not content:
+            telemetry.observe("time_to_first_token_seconds",
+                              time.perf_counter() - sent_at)
+
+        # Only the new content (and the end of the previous content) can contain a new stop sequence
+        search_start = max(0, len(content) - longest_stop_sequence + 1)
+        content, stopped = apply_stop_sequences(
+            content + delta, limits.stop_sequences, search_start)
+        if stopped:
+            finish_reason = "stop"
+        elif limits.maximum_tokens is not None and estimate_number_of_tokens(content) >= limits.maximum_tokens:
+            finish_reason = "length"
+        else:
+            continue
+
+        # Stop reading once the document reached its limits
+        telemetry.increment("early_terminations")
+        break
+
+    return {"choices": [{"message": {"content": content}, "finish_reason": finish_reason}], "usage": usage}
+
+
+async def get_model_response(system: str, seed: str, client: httpx.AsyncClient, limiter: AdaptiveConcurrencyLimiter, cache: ResponseCache = None, variant: int = 0, limits: GenerationLimits = NO_GENERATION_LIMITS) -> tuple[str, dict]:
+    """
+    Returns the model response to the provided prompt. Requests which fail transiently (timeouts, connection errors, rate limits and server errors) are retried with jittered exponential backoff, honoring the Retry-After header of the provider. Requests found in the response cache are answered from it without being sent, and new responses are added to it. If DOCUMENT_GENERATION_STREAMING is set, the response is streamed and cut off as soon as it reaches the limits of its text type.
+
+    Parameters:
+        system (str): The system information which is used for text generation.
+        seed (str): The seed information which is used for text generation.
+        client (httpx.AsyncClient): The client used for the API requests (see create_http_client).
+        limiter (AdaptiveConcurrencyLimiter): The limiter of the number of requests in flight.
+        cache (ResponseCache): The response cache (None disables caching).
+        variant (int): Distinguishes identical requests which should still be answered independently in the cache (e.g. the documents of a seed whose blank seeds coincide).
+        limits (GenerationLimits): The limits of the document (sent to the provider and enforced on the response).
+
+    Returns:
+        tuple[str, dict]: The model response and its token usage (None if the provider did not report it; cached responses use no tokens).
+    """
+
+    telemetry = get_telemetry()
+    stream = config_framework.DOCUMENT_GENERATION_STREAMING
+
+    # Create prompt
+    body = serialize_request_body(system, seed, limits, stream)
+
+    # Answer request from cache if the identical request was answered before (streamed and non-streamed responses are interchangeable)
+    if cache is not None:
+        full_prompt = {"model": config_framework.MODEL, "messages": [{"role": "system", "content": system}, {
+            "role": "user", "content": seed}], "usage": {"include": True}}
+        if limits.maximum_tokens is not None:
+            full_prompt["max_tokens"] = limits.maximum_tokens
+        if limits.stop_sequences:
+            full_prompt["stop"] = list(limits.stop_sequences)
+        cache_key = compute_cache_key(
+            {"request": full_prompt, "variant": variant})
+        cached_response = await cache.get(cache_key)
+        if cached_response is not None:
+            telemetry.increment("cache_hits")
+            return cached_response[0], {"prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0, "cached": True}
+
+    for attempt in range(config_framework.MAXIMUM_NUMBER_OF_REQUEST_ATTEMPTS):
+        # Post request to model once the limiter admits another request in flight
+        retry_after = None
+        throttled = False
+        error_class = "cancelled"
+        with telemetry.time("waiting_for_limiter"):
+            admitted_at = await limiter.acquire()
+        sent_at = time.perf_counter()
+        try:
+            if stream:
+                # Read the events while holding the slot, errors are read as a whole
+                async with client.stream("POST", OPEN_ROUTER_API_COMPLETIONS_PATH, content=body) as response:
+                    if response.status_code == 200:
+                        completion = await read_completion_stream(response, limits, sent_at)
+                    else:
+                        await response.aread()
+            else:
+                response = await client.post(OPEN_ROUTER_API_COMPLETIONS_PATH, content=body)
+                if response.status_code == 200:
+                    completion = response.json()
+
+            if response.status_code == 200:
+                content, _ = apply_stop_sequences(
+                    completion["choices"][0]["message"]["content"] or "", limits.stop_sequences)
+                if content:
+                    error_class = None
+                    if completion.get("usage") is None and stream:
+                        # Stream was cut off before the provider reported the usage
+                        completion["usage"] = {"prompt_tokens": estimate_number_of_tokens(
+                            system) + estimate_number_of_tokens(seed), "completion_tokens": estimate_number_of_tokens(content)}
+                    if cache is not None:
+                        cache.put(cache_key, content,
+                                  completion.get("usage"))
+                    return content, completion.get("usage")
+                reason = f"Empty response (finish reason: {completion["choices"][0].get("finish_reason")})"
+                error_class = "empty"
+            elif response.status_code in RETRYABLE_STATUS_CODES:
+                reason = f"HTTP {response.status_code}: {response.text[:200]}"
+                throttled = response.status_code in THROTTLING_STATUS_CODES
+                error_class = "rate_limited" if response.status_code == 429 else "overloaded" if throttled else "server_error"
+                retry_after = parse_retry_after(
+                    response.headers.get("Retry-After"))
+            else:
+                # Request can not succeed (e.g. invalid request, authentication or insufficient credits)
+                error_class = "client_error"
+                raise DocumentRequestFailedError(
+                    f"HTTP {response.status_code}: {response.text[:200]}", attempt + 1)
+        except httpx.PoolTimeout as e:
+            # No connection became free in time (the provider did not signal overload)
+            reason = f"Timeout: {e!r}"
+            error_class = "pool_timeout"
+        except httpx.TimeoutException as e:
+            reason = f"Timeout: {e!r}"
+            throttled = True
+            error_class = "timeout"
+        except httpx.TransportError as e:
+            reason = f"Connection error: {e!r}"
+            error_class = "connection_error"
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            # Malformed response body (providers occasionally answer with an error object instead of a completion)
+            reason = f"Malformed response: {e!r}"
+            error_class = "malformed"
+        finally:
+            await limiter.release(admitted_at, throttled)
+
+            # Record latency and outcome of the attempt
+            telemetry.increment("attempts")
+            telemetry.observe("attempt_latency_seconds",
+                              time.perf_counter() - sent_at)
+            if error_class is not None:
+                telemetry.count_error(error_class)
+
+        # Hold back all requests if the provider asked for it, then wait before the next attempt
+        with telemetry.time("backoff"):
+            if retry_after is not None:
+                await limiter.pause(retry_after)
+            if attempt + 1 < config_framework.MAXIMUM_NUMBER_OF_REQUEST_ATTEMPTS:
+                await asyncio.sleep(compute_backoff(attempt, config_framework.REQUEST_BACKOFF_BASE, config_framework.REQUEST_BACKOFF_MAXIMUM, retry_after))
+
+    raise DocumentRequestFailedError(
+        reason, config_framework.MAXIMUM_NUMBER_OF_REQUEST_ATTEMPTS)
+
+
+class DocumentGenerationBackend(ABC):
+    # Number of requests answered together (None answers requests one by one) and number of workers feeding the backend
+    batch_size = None
+    number_of_workers = 1
+
+    async def __aenter__(self) -> "DocumentGenerationBackend":
+        """
+        Acquires the resources of the backend (e.g. connections or the model).
+        """
+
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """
+        Releases the resources of the backend.
+        """
+
+        pass
+
+    @abstractmethod
+    async def complete(self, system: str, prompt: str, variant: int = 0, limits: GenerationLimits = NO_GENERATION_LIMITS) -> tuple[str, dict]:
+        """
+        Answers a single chat completion request.
+
+        Parameters:
+            system (str): The system prompt.
+            prompt (str): The user prompt (the blank seed).
+            variant (int): Distinguishes identical requests which should still be answered independently (the index of the document within its seed).
+            limits (GenerationLimits): The limits of the document.
+
+        Returns:
+            tuple[str, dict]: The document and its token usage (None if unknown).
+        """
+
+        pass
+
+    async def complete_batch(self, requests: list[tuple[str, str, int, GenerationLimits]]) -> list[tuple[str, dict] | DocumentRequestFailedError]:
+        """
+        Answers a batch of chat completion requests (concurrently through complete unless the backend batches natively).
+
+        Parameters:
+            requests (list[tuple[str, str, int, GenerationLimits]]): The system prompts, user prompts, variants and limits of the requests.
+
+        Returns:
+            list[tuple[str, dict] | DocumentRequestFailedError]: The document and token usage, or the error, of every request (in order).
+        """
+
+        results = await asyncio.gather(*(self.complete(system, prompt, variant, limits) for system, prompt, variant, limits in requests), return_exceptions=True)
+
+        # Only failed requests are expected, everything else is a bug
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, DocumentRequestFailedError):
+                raise result
+
+        return results
+
+
+class OpenRouterBackend(DocumentGenerationBackend):
+    def __init__(self, api_key: str = None) -> None:
+        """
+        Initializes the backend sending one request per document to the OpenRouter API, with as many requests in flight as the adaptive limiter admits.
+
+        Parameters:
+            api_key (str): The API key the requests are billed to (OPEN_ROUTER_API_KEY if None).
+        """
+        self.headers = {**OPEN_ROUTER_API_HEADERS,
+                        "Authorization": f"Bearer {api_key}"} if api_key is not None else OPEN_ROUTER_API_HEADERS
+        self.number_of_workers = config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS
+        self.limiter = AdaptiveConcurrencyLimiter(
+            config_framework.MINIMUM_NUMBER_OF_CONCURRENT_REQUESTS, config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS)
+        self.clients = []
+        self.requests_per_client = []
+        self.client = None
+        self.cache = None
+
+    async def __aenter__(self) -> "OpenRouterBackend":
+        """
+        Opens the clients shared by all requests (with a connection per request in flight and one for polling the credits through the first client) and the response cache.
+        """
+
+        self.clients = create_http_clients(
+            config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS + 1, headers=self.headers)
+        self.requests_per_client = [0] * len(self.clients)
+        self.client = self.clients[0]
+        if config_framework.RESPONSE_CACHE is not None:
+            self.cache = ResponseCache(config_framework.RESPONSE_CACHE, config_framework.RESPONSE_CACHE_MAXIMUM_SIZE,
+                                       read=config_framework.RESPONSE_CACHE_MODE != "write", write=config_framework.RESPONSE_CACHE_MODE != "read")
+
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """
+        Closes the clients and the response cache.
+        """
+
+        for client in self.clients:
+            await client.aclose()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def complete(self, system: str, prompt: str, variant: int = 0, limits: GenerationLimits = NO_GENERATION_LIMITS) -> tuple[str, dict]:
+        """
+        Answers a single chat completion request through the OpenRouter API.
+
+        Parameters:
+            system (str): The system prompt.
+            prompt (str): The user prompt (the blank seed).
+            variant (int): Distinguishes identical requests which should still be answered independently (the index of the document within its seed).
+            limits (GenerationLimits): The limits of the document.
+
+        Returns:
+            tuple[str, dict]: The document and its token usage (None if the provider did not report it).
+        """
+
+        # Send request through the client with the fewest requests, such that no pool runs out of connections
+        client_index = min(range(len(self.clients)),
+                           key=self.requests_per_client.__getitem__)
+        self.requests_per_client[client_index] += 1
+        try:
+            return await get_model_response(system, prompt, self.clients[client_index], self.limiter, self.cache, variant, limits)
+        finally:
+            self.requests_per_client[client_index] -= 1
+
+
+class OfflineBackend(DocumentGenerationBackend):
+    def __init__(self) -> None:
+        """
+        Initializes the backend generating batches of documents with a local vLLM engine, which schedules the requests of a batch through continuous batching.
+        """
+        self.batch_size = config_framework.OFFLINE_BATCH_SIZE
+        self.model = None
+
+        # Sampling parameters per limits of a text type
+        self.sampling_params = {}
+
+    async def __aenter__(self) -> "OfflineBackend":
+        """
+        Loads the model (vLLM is only required if this backend is used).
+        """
+
+        from vllm import LLM
+
+        self.model = LLM(config_framework.OFFLINE_MODEL,
+                         max_model_len=config_framework.OFFLINE_MAX_MODEL_LEN)
+
+        return self
+
+    def get_sampling_params(self, limits: GenerationLimits):
+        """
+        Returns the sampling parameters enforcing the limits of a text type (created once per text type).
+
+        Parameters:
+            limits (GenerationLimits): The limits of the documents.
+
+        Returns:
+            SamplingParams: The sampling parameters.
+        """
+
+        from vllm import SamplingParams
+
+        if limits not in self.sampling_params:
+            self.sampling_params[limits] = SamplingParams(max_tokens=min(limits.maximum_tokens or config_framework.OFFLINE_MAX_TOKENS,
+                                                                         config_framework.OFFLINE_MAX_TOKENS), stop=list(limits.stop_sequences) or None)
+
+        return self.sampling_params[limits]
+
+    async def complete(self, system: str, prompt: str, variant: int = 0, limits: GenerationLimits = NO_GENERATION_LIMITS) -> tuple[str, dict]:
+        """
+        Answers a single chat completion request (as a batch of one).
+
+        Parameters:
+            system (str): The system prompt.
+            prompt (str): The user prompt (the blank seed).
+            variant (int): Distinguishes identical requests which should still be answered independently (the index of the document within its seed).
+            limits (GenerationLimits): The limits of the document.
+
+        Returns:
+            tuple[str, dict]: The document and its token usage.
+        """
+
+        result = (await self.complete_batch([(system, prompt, variant, limits)]))[0]
+        if isinstance(result, DocumentRequestFailedError):
+            raise result
+
+        return result
+
+    async def complete_batch(self, requests: list[tuple[str, str, int, GenerationLimits]]) -> list[tuple[str, dict] | DocumentRequestFailedError]:
+        """
+        Generates the documents of a batch of requests in one call of the engine (in a separate thread, such that the reader and writer keep running), with the limits of every text type enforced by the engine.
+
+        Parameters:
+            requests (list[tuple[str, str, int, GenerationLimits]]): The system prompts, user prompts, variants and limits of the requests.
+
+        Returns:
+            list[tuple[str, dict] | DocumentRequestFailedError]: The document and token usage, or the error, of every request (in order).
+        """
+
+        conversations = [[{"role": "system", "content": system}, {
+            "role": "user", "content": prompt}] for system, prompt, _, _ in requests]
+        sampling_params = [self.get_sampling_params(
+            limits) for _, _, _, limits in requests]
+        model_outputs = await asyncio.to_thread(self.model.chat, conversations, sampling_params, use_tqdm=False)
+
+        results = []
+        for model_output in model_outputs:
+            output = model_output.outputs[0]
+            if output.text:
+                results.append((output.text, {"prompt_tokens": len(model_output.prompt_token_ids), "completion_tokens": len(
+                    output.token_ids), "cost": 0.0}))
+            else:
+                results.append(DocumentRequestFailedError(
+                    f"Empty response (finish reason: {output.finish_reason})", 1))
+
+        return results
+
+
+class StubBackend(DocumentGenerationBackend):
+    def __init__(self) -> None:
+        """
+        Initializes the backend answering every request instantly with a deterministic document derived from the prompts.
+        """
+        self.number_of_workers = config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS
+
+    async def complete(self, system: str, prompt: str, variant: int = 0, limits: GenerationLimits = NO_GENERATION_LIMITS) -> tuple[str, dict]:
+        """
+        Answers a single chat completion request with a document which only depends on the prompts.
+
+        Parameters:
+            system (str): The system prompt.
+            prompt (str): The user prompt (the blank seed).
+            variant (int): Distinguishes identical requests which should still be answered independently (the index of the document within its seed).
+            limits (GenerationLimits): The limits of the document.
+
+        Returns:
+            tuple[str, dict]: The document and its token usage.
+        """
+
+        digest = hashlib.sha256(
+            f"{system}\n{prompt}\n{variant}".encode('utf-8')).hexdigest()
+        document, _ = apply_stop_sequences(
+            f"Stub document {digest[:16]} for: {prompt}", limits.stop_sequences)
+        if limits.maximum_tokens is not None:
+            document = document[:4 * limits.maximum_tokens]
+
+        return document, {"prompt_tokens": estimate_number_of_tokens(system) + estimate_number_of_tokens(prompt), "completion_tokens": estimate_number_of_tokens(document), "cost": 0.0}
+
+
+# Backends selectable through DOCUMENT_GENERATION_BACKEND
+DOCUMENT_GENERATION_BACKENDS = {"openrouter": OpenRouterBackend,
+                                "offline": OfflineBackend, "stub": StubBackend}
+
+
+def create_document_generation_backend(name: str, api_key: str = None) -> DocumentGenerationBackend:
+    """
+    Creates the backend of the document generation.
+
+    Parameters:
+        name (str): The name of the backend ("openrouter", "offline" or "stub").
+        api_key (str): The API key of the OpenRouter backend (OPEN_ROUTER_API_KEY if None, ignored by the other backends).
+
+    Returns:
+        DocumentGenerationBackend: The backend (to be entered with async with).
+    """
+
+    if name not in DOCUMENT_GENERATION_BACKENDS:
+        raise UnknownDocumentGenerationBackendError(
+            name, list(DOCUMENT_GENERATION_BACKENDS))
+
+    if DOCUMENT_GENERATION_BACKENDS[name] is OpenRouterBackend:
+        return OpenRouterBackend(api_key)
+
+    return DOCUMENT_GENERATION_BACKENDS[name]()
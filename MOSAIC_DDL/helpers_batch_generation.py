@@ -0,0 +1,586 @@
+"""
+helpers_batch_generation.py
+
+This module contains the batch mode of the document generation of MOSAIC_DDL: the prompts are written into batch request files, submitted to the asynchronous batch API of a provider (at lower cost and much higher aggregate throughput than one request per document), polled until they are completed and their results are reassembled into the documents file in the order of the blank seeds.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from helpers_document_generation import load_completed_documents, load_dead_letters, is_retryable_dead_letter, get_set_aside_file_path, report_document_generation_costs
+from helpers_budget import CostLedger, estimate_number_of_tokens, compute_cost
+from helpers_stage_manifest import compute_file_hash
+from errors import UnknownBatchProviderError
+from abc import ABC, abstractmethod
+from dotenv import load_dotenv
+from tqdm import tqdm
+import config_framework
+import hashlib
+import random
+import httpx
+import uuid
+import json
+import time
+import os
+
+# Load environment variables
+load_dotenv()
+
+# Statuses after which a batch does not change anymore
+TERMINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Endpoint every request of a batch is sent to
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+class BatchProvider(ABC):
+    @abstractmethod
+    def submit(self, requests_file_path: str) -> str:
+        """
+        Submits a batch request file (one chat completion request per line, identified by its custom_id).
+
+        Parameters:
+            requests_file_path (str): The path to the batch request file.
+
+        Returns:
+            str: The id of the batch.
+        """
+
+        pass
+
+    @abstractmethod
+    def poll(self, batch_id: str) -> dict:
+        """
+        Fetches the status of a batch.
+
+        Parameters:
+            batch_id (str): The id of the batch.
+
+        Returns:
+            dict: The status ("validating", "in_progress", "completed", "failed", "expired" or "cancelled") and the number of completed, failed and total requests.
+        """
+
+        pass
+
+    @abstractmethod
+    def download(self, batch_id: str, results_file_path: str) -> None:
+        """
+        Downloads the results of a finished batch (one result per line, identified by its custom_id, in any order).
+
+        Parameters:
+            batch_id (str): The id of the batch.
+            results_file_path (str): The path the results are written to.
+        """
+
+        pass
+
+
+class OpenAIBatchProvider(BatchProvider):
+    def __init__(self) -> None:
+        """
+        Initializes the provider submitting the batches to an OpenAI-compatible batch API (authorized through the OPENAI_API_KEY environment variable).
+        """
+        self.client = httpx.Client(base_url=config_framework.BATCH_API_BASE_URL, headers={
+                                   "Authorization": f"Bearer {os.getenv("OPENAI_API_KEY")}"}, timeout=config_framework.REQUEST_TIMEOUT)
+
+    def submit(self, requests_file_path: str) -> str:
+        """
+        Uploads a batch request file and creates a batch of it.
+
+        Parameters:
+            requests_file_path (str): The path to the batch request file.
+
+        Returns:
+            str: The id of the batch.
+        """
+
+        with open(requests_file_path, "rb") as requests_file:
+            response = self.client.post(
+                "/files", data={"purpose": "batch"}, files={"file": requests_file})
+        response.raise_for_status()
+
+        response = self.client.post("/batches", json={"input_file_id": response.json()[
+                                    "id"], "endpoint": BATCH_ENDPOINT, "completion_window": "24h"})
+        response.raise_for_status()
+
+        return response.json()["id"]
+
+    def poll(self, batch_id: str) -> dict:
+        """
+        Fetches the status of a batch.
+
+        Parameters:
+            batch_id (str): The id of the batch.
+
+        Returns:
+            dict: The status and the number of completed, failed and total requests.
+        """
+
+        response = self.client.get(f"/batches/{batch_id}")
+        response.raise_for_status()
+        batch = response.json()
+        request_counts = batch.get("request_counts") or {}
+
+        return {"status": batch["status"], "completed": request_counts.get("completed", 0), "failed": request_counts.get("failed", 0), "total": request_counts.get("total", 0)}
+
+    def download(self, batch_id: str, results_file_path: str) -> None:
+        """
+        Downloads the output file (successful requests) and the error file (failed requests) of a finished batch.
+
+        Parameters:
+            batch_id (str): The id of the batch.
+            results_file_path (str): The path the results are written to.
+        """
+
+        response = self.client.get(f"/batches/{batch_id}")
+        response.raise_for_status()
+        batch = response.json()
+
+        with open(results_file_path, "wb") as results_file:
+            for file_id in (batch.get("output_file_id"), batch.get("error_file_id")):
+                if file_id is None:
+                    continue
+                response = self.client.get(f"/files/{file_id}/content")
+                response.raise_for_status()
+                results_file.write(response.content)
+                if response.content and not response.content.endswith(b"\n"):
+                    results_file.write(b"\n")
+
+
+class LocalBatchProvider(BatchProvider):
+    def __init__(self, directory: str = None) -> None:
+        """
+        Initializes the file-based stand-in of a batch API: a batch is completed once config_framework.BATCH_LOCAL_LATENCY seconds passed since its submission, every request is answered with a deterministic document (failing with config_framework.BATCH_LOCAL_FAILURE_PROBABILITY) and the results are returned in shuffled order.
+
+        Parameters:
+            directory (str): The directory holding the submitted batches (config_framework.BATCH_DIRECTORY if None).
+        """
+        self.directory = directory or config_framework.BATCH_DIRECTORY
+
+    def get_batch_file_path(self, batch_id: str, suffix: str) -> str:
+        """
+        Returns the path to a file of a submitted batch.
+
+        Parameters:
+            batch_id (str): The id of the batch.
+            suffix (str): The kind of the file ("input.jsonl", "output.jsonl" or "status.json").
+
+        Returns:
+            str: The path to the file.
+        """
+
+        return os.path.join(self.directory, f"{batch_id}.{suffix}")
+
+    def submit(self, requests_file_path: str) -> str:
+        """
+        Stores a copy of a batch request file as a new batch.
+
+        Parameters:
+            requests_file_path (str): The path to the batch request file.
+
+        Returns:
+            str: The id of the batch.
+        """
+
+        batch_id = f"local-batch-{uuid.uuid4().hex}"
+        with open(requests_file_path, "rb") as requests_file, open(self.get_batch_file_path(batch_id, "input.jsonl"), "wb") as input_file:
+            input_file.write(requests_file.read())
+        with open(self.get_batch_file_path(batch_id, "status.json"), "w", encoding='utf-8') as status_file:
+            json.dump({"status": "in_progress", "submitted_at": time.time()}, status_file)
+
+        return batch_id
+
+    def poll(self, batch_id: str) -> dict:
+        """
+        Fetches the status of a batch, processing all of its requests once its latency passed.
+
+        Parameters:
+            batch_id (str): The id of the batch.
+
+        Returns:
+            dict: The status and the number of completed, failed and total requests.
+        """
+
+        with open(self.get_batch_file_path(batch_id, "status.json"), "r", encoding='utf-8') as status_file:
+            status = json.load(status_file)
+
+        if status["status"] == "in_progress" and time.time() - status["submitted_at"] >= config_framework.BATCH_LOCAL_LATENCY:
+            # Answer every request, failing some of them
+            failure_random = random.Random(batch_id)
+            results = []
+            with open(self.get_batch_file_path(batch_id, "input.jsonl"), "r", encoding='utf-8') as input_file:
+                for request in input_file:
+                    request = json.loads(request)
+                    if failure_random.random() < config_framework.BATCH_LOCAL_FAILURE_PROBABILITY:
+                        results.append({"custom_id": request["custom_id"], "response": None, "error": {
+                                       "code": "server_error", "message": "Request failed in local batch"}})
+                        continue
+
+                    messages = request["body"]["messages"]
+                    digest = hashlib.sha256("\n".join(
+                        message["content"] for message in messages).encode('utf-8')).hexdigest()
+                    document = f"Batch document {digest[:16]} for: {messages[-1]["content"]}"
+                    prompt_tokens = sum(estimate_number_of_tokens(
+                        message["content"]) for message in messages)
+                    completion_tokens = estimate_number_of_tokens(document)
+                    results.append({"custom_id": request["custom_id"], "response": {"status_code": 200, "body": {"model": request["body"]["model"], "choices": [{"index": 0, "finish_reason": "stop", "message": {
+                                   "role": "assistant", "content": document}}], "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}}}, "error": None})
+
+            # Providers do not keep the order of the requests
+            failure_random.shuffle(results)
+            with open(self.get_batch_file_path(batch_id, "output.jsonl"), "w", encoding='utf-8') as output_file:
+                for result in results:
+                    output_file.write(json.dumps(result) + "\n")
+
+            status.update({"status": "completed", "completed": sum(1 for result in results if result["error"] is None), "failed": sum(
+                1 for result in results if result["error"] is not None), "total": len(results)})
+            with open(self.get_batch_file_path(batch_id, "status.json"), "w", encoding='utf-8') as status_file:
+                json.dump(status, status_file)
+
+        return {"status": status["status"], "completed": status.get("completed", 0), "failed": status.get("failed", 0), "total": status.get("total", 0)}
+
+    def download(self, batch_id: str, results_file_path: str) -> None:
+        """
+        Copies the results of a completed batch.
+
+        Parameters:
+            batch_id (str): The id of the batch.
+            results_file_path (str): The path the results are written to.
+        """
+
+        with open(self.get_batch_file_path(batch_id, "output.jsonl"), "rb") as output_file, open(results_file_path, "wb") as results_file:
+            results_file.write(output_file.read())
+
+
+# Providers selectable through BATCH_PROVIDER
+BATCH_PROVIDERS = {"openai": OpenAIBatchProvider, "local": LocalBatchProvider}
+
+
+def create_batch_provider(name: str) -> BatchProvider:
+    """
+    Creates the batch provider of the document generation.
+
+    Parameters:
+        name (str): The name of the provider ("openai" or "local").
+
+    Returns:
+        BatchProvider: The provider.
+    """
+
+    if name not in BATCH_PROVIDERS:
+        raise UnknownBatchProviderError(name, list(BATCH_PROVIDERS))
+
+    return BATCH_PROVIDERS[name]()
+
+
+def parse_batch_result(result: dict) -> tuple[str, dict, str]:
+    """
+    Extracts the document and its token usage (or the error) from the result of a request of a batch.
+
+    Parameters:
+        result (dict): The result.
+
+    Returns:
+        tuple[str, dict, str]: The document and its token usage (None if the request failed) and the error (None if the request succeeded).
+    """
+
+    response = result.get("response") or {}
+    if response.get("status_code") == 200:
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            if content:
+                return content, response["body"].get("usage"), None
+            return None, None, f"Empty response (finish reason: {response["body"]["choices"][0].get("finish_reason")})"
+        except (KeyError, IndexError, TypeError) as e:
+            return None, None, f"Malformed response: {e!r}"
+
+    error = result.get("error") or (response.get("body") or {}).get("error")
+
+    return None, None, f"HTTP {response.get("status_code")}: {json.dumps(error)[:200]}"
+
+
+def write_batch_request_files(system: list[str], blank_seeds_file_path: str, reusable_documents: dict[str, tuple[str, int, int]], dead_letters: dict[str, dict]) -> tuple[list[str], int]:
+    """
+    Writes the requests of all documents which were not finished by a previous run into batch request files of at most config_framework.BATCH_MAXIMUM_NUMBER_OF_REQUESTS requests, in the order of the blank seeds. Requests are only written while their estimated cost stays within config_framework.MAXIMUM_DOCUMENT_GENERATION_COST.
+
+    Parameters:
+        system (list[str]): The system prompts which should be used.
+        blank_seeds_file_path (str): The path to the blank seeds file.
+        reusable_documents (dict[str, tuple[str, int, int]]): The documents written by a previous run.
+        dead_letters (dict[str, dict]): The dead letters written by a previous run.
+
+    Returns:
+        tuple[list[str], int]: The paths to the batch request files and the number of documents which were not requested because they exceed the maximum cost.
+    """
+
+    # Storage for batch request files
+    requests_file_paths = []
+    requests_file = None
+    number_of_requests_in_file = 0
+
+    number_of_skipped_documents = 0
+    estimated_cost = 0.0
+
+    with open(blank_seeds_file_path, "r", encoding='utf-8') as blank_seeds:
+        for idx, blank_seed in enumerate(blank_seeds):
+            # The model only receives the blank seed itself, not the id linking it to its document
+            blank_seed = json.loads(blank_seed)
+            document_id = blank_seed.pop("document_id")
+
+            # Skip documents which a previous run already finished (other dead letters are requested again)
+            if document_id in reusable_documents or (document_id in dead_letters and not is_retryable_dead_letter(dead_letters[document_id])):
+                continue
+
+            # Skip everything after the first request exceeding the maximum cost
+            prompt = json.dumps(blank_seed)
+            if number_of_skipped_documents == 0 and config_framework.MAXIMUM_DOCUMENT_GENERATION_COST is not None:
+                request_cost = compute_cost(estimate_number_of_tokens(system[idx][0]) + estimate_number_of_tokens(
+                    prompt), config_framework.ESTIMATED_COMPLETION_TOKENS) * config_framework.BATCH_PRICE_FACTOR
+                if estimated_cost + request_cost > config_framework.MAXIMUM_DOCUMENT_GENERATION_COST:
+                    number_of_skipped_documents = 1
+                else:
+                    estimated_cost += request_cost
+            elif number_of_skipped_documents > 0:
+                number_of_skipped_documents += 1
+            if number_of_skipped_documents > 0:
+                continue
+
+            # Start next batch request file once the current one is full
+            if requests_file is None or number_of_requests_in_file == config_framework.BATCH_MAXIMUM_NUMBER_OF_REQUESTS:
+                if requests_file is not None:
+                    requests_file.close()
+                requests_file_paths.append(os.path.join(
+                    config_framework.BATCH_DIRECTORY, f"requests-{len(requests_file_paths)}.jsonl"))
+                requests_file = open(
+                    requests_file_paths[-1], "w", encoding='utf-8')
+                number_of_requests_in_file = 0
+
+            # Limits of the text type are enforced by the provider
+            body = {"model": config_framework.BATCH_MODEL, "messages": [
+                {"role": "system", "content": system[idx][0]}, {"role": "user", "content": prompt}]}
+            if system[idx][2].maximum_tokens is not None:
+                body["max_tokens"] = system[idx][2].maximum_tokens
+            if system[idx][2].stop_sequences:
+                body["stop"] = list(system[idx][2].stop_sequences)
+            requests_file.write(json.dumps(
+                {"custom_id": document_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}) + "\n")
+            number_of_requests_in_file += 1
+
+    if requests_file is not None:
+        requests_file.close()
+
+    return requests_file_paths, number_of_skipped_documents
+
+
+def load_submitted_batches() -> dict[str, str]:
+    """
+    Loads the ids of the batches submitted by previous runs whose results were not reassembled yet.
+
+    Returns:
+        dict[str, str]: A dictionary mapping the hashes of the batch request files to the batch ids.
+    """
+
+    batches_file_path = os.path.join(
+        config_framework.BATCH_DIRECTORY, "batches.json")
+    if not os.path.exists(batches_file_path):
+        return {}
+
+    with open(batches_file_path, "r", encoding='utf-8') as batches_file:
+        return json.load(batches_file)
+
+
+def save_submitted_batches(submitted_batches: dict[str, str]) -> None:
+    """
+    Saves the ids of the submitted batches whose results were not reassembled yet.
+
+    Parameters:
+        submitted_batches (dict[str, str]): A dictionary mapping the hashes of the batch request files to the batch ids.
+    """
+
+    with open(os.path.join(config_framework.BATCH_DIRECTORY, "batches.json"), "w", encoding='utf-8') as batches_file:
+        json.dump(submitted_batches, batches_file, indent=4)
+
+
+def run_batches(provider: BatchProvider, requests_file_paths: list[str]) -> list[str]:
+    """
+    Submits the batch request files (reusing the batches of a previous run which submitted the same requests, unless they failed, expired or were cancelled), polls them until all of them are finished and downloads their results.
+
+    Parameters:
+        provider (BatchProvider): The batch provider.
+        requests_file_paths (list[str]): The paths to the batch request files.
+
+    Returns:
+        list[str]: The paths to the results files (in the order of the batch request files).
+    """
+
+    # Ids of the batches submitted by previous runs, keyed by the hash of their requests
+    submitted_batches = load_submitted_batches()
+
+    # Submit batches which were not submitted before (or whose batch ended without answering its requests, which would only yield the same failures again)
+    batch_ids = []
+    for requests_file_path in requests_file_paths:
+        requests_hash = compute_file_hash(requests_file_path)
+        if requests_hash in submitted_batches and provider.poll(submitted_batches[requests_hash])["status"] in TERMINAL_BATCH_STATUSES - {"completed"}:
+            print(
+                f"{'\033[33m'}Resubmitting the requests of batch {submitted_batches[requests_hash]}, which ended without completing{'\033[0m'}")
+            del submitted_batches[requests_hash]
+        if requests_hash not in submitted_batches:
+            submitted_batches[requests_hash] = provider.submit(
+                requests_file_path)
+            save_submitted_batches(submitted_batches)
+        batch_ids.append(submitted_batches[requests_hash])
+
+    # Poll batches until all of them are finished
+    number_of_requests = 0
+    for requests_file_path in requests_file_paths:
+        with open(requests_file_path, "r", encoding='utf-8') as requests_file:
+            number_of_requests += sum(1 for _ in requests_file)
+    progress_bar = tqdm(total=number_of_requests,
+                        desc=f"{'\033[34m'}Waiting for batches...{'\033[0m'}")
+    statuses = {}
+    while True:
+        for batch_id in batch_ids:
+            if batch_id not in statuses or statuses[batch_id]["status"] not in TERMINAL_BATCH_STATUSES:
+                statuses[batch_id] = provider.poll(batch_id)
+        progress_bar.update(sum(status["completed"] + status["failed"]
+                            for status in statuses.values()) - progress_bar.n)
+        if all(status["status"] in TERMINAL_BATCH_STATUSES for status in statuses.values()):
+            break
+        time.sleep(config_framework.BATCH_POLL_INTERVAL)
+    progress_bar.close()
+
+    # Download results of all batches (requests of failed or expired batches without result become dead letters)
+    results_file_paths = []
+    for idx, batch_id in enumerate(batch_ids):
+        results_file_paths.append(os.path.join(
+            config_framework.BATCH_DIRECTORY, f"results-{idx}.jsonl"))
+        if statuses[batch_id]["status"] != "completed":
+            print(
+                f"{'\033[33m'}Batch {batch_id} finished with status \"{statuses[batch_id]["status"]}\"{'\033[0m'}")
+        provider.download(batch_id, results_file_paths[-1])
+
+    return results_file_paths
+
+
+def generate_batched_document_file(provider: BatchProvider, system: list[str], blank_seeds_file_path: str, documents_file_path: str) -> int:
+    """
+    Create a .jsonl file containing the LLM-based generations of documents like generate_document_file, but through the batch API of a provider: the prompts of all documents are submitted as batches and the results are reassembled in the order of the blank seeds once all batches are finished. Documents and dead letters of a previous run are reused, and batches which were already submitted with the same requests are not submitted again.
+
+    Parameters:
+        provider (BatchProvider): The batch provider.
+        system (list[str]): The system prompts which should be used.
+        blank_seeds_file_path (str): The path to the blank seeds file.
+        documents_file_path (str): The path to the documents file.
+
+    Returns:
+        int: The number of documents which could not be generated (dead letters and documents skipped because the budget is exhausted).
+    """
+
+    os.makedirs(config_framework.BATCH_DIRECTORY, exist_ok=True)
+
+    # Documents written (or set aside) by a previous (interrupted) run, wherever they are in its files, and its dead letters
+    reusable_documents = {}
+    for file_path in (get_set_aside_file_path(documents_file_path), documents_file_path):
+        start = 0
+        for document_id, end in load_completed_documents(file_path):
+            reusable_documents[document_id] = (file_path, start, end - start)
+            start = end
+    dead_letters = load_dead_letters(config_framework.DEAD_LETTERS)
+    if reusable_documents or dead_letters:
+        print(
+            f"{'\033[32m'}Found {len(reusable_documents)} documents of a previous run, resuming document generation{'\033[0m'}")
+
+    requests_file_paths, number_of_skipped_documents = write_batch_request_files(
+        system, blank_seeds_file_path, reusable_documents, dead_letters)
+    results_file_paths = run_batches(provider, requests_file_paths)
+
+    cost_ledger = CostLedger()
+    number_of_dead_letters = 0
+
+    # Documents are reassembled into a new file which replaces the documents file once complete (the documents of the previous run are copied from its files)
+    previous_files = {file_path: open(file_path, "rb") for file_path in {
+        file_path for file_path, _, _ in reusable_documents.values()}}
+    try:
+        with open(documents_file_path + ".tmp", "w", encoding='utf-8') as documents, open(config_framework.DEAD_LETTERS, "w", encoding='utf-8') as dead_letters_file, open(blank_seeds_file_path, "r", encoding='utf-8') as blank_seeds:
+            # Reassemble results batch by batch in the order of the requests (which is the order of the blank seeds)
+            requests_and_results = iter(
+                zip(requests_file_paths, results_file_paths))
+            requested_document_ids = []
+            results = {}
+
+            for idx, blank_seed in enumerate(blank_seeds):
+                blank_seed = json.loads(blank_seed)
+                document_id = blank_seed.pop("document_id")
+
+                # Same decisions as when writing the batch request files
+                if document_id in reusable_documents:
+                    file_path, start, length = reusable_documents[document_id]
+                    previous_files[file_path].seek(start)
+                    documents.write(
+                        previous_files[file_path].read(length).decode('utf-8'))
+                    continue
+                elif document_id in dead_letters and not is_retryable_dead_letter(dead_letters[document_id]):
+                    dead_letters_file.write(json.dumps(
+                        dead_letters[document_id]) + "\n")
+                    number_of_dead_letters += 1
+                    continue
+
+                # Load requests and results of the next batch once all requests of the current one are reassembled
+                if not requested_document_ids:
+                    try:
+                        requests_file_path, results_file_path = next(
+                            requests_and_results)
+                    except StopIteration:
+                        # Remaining documents exceed the maximum cost (documents of the previous run after them are still kept)
+                        continue
+                    with open(requests_file_path, "r", encoding='utf-8') as requests_file:
+                        requested_document_ids = [json.loads(
+                            request)["custom_id"] for request in requests_file][::-1]
+                    with open(results_file_path, "r", encoding='utf-8') as results_file:
+                        results = {}
+                        for result in results_file:
+                            result = json.loads(result)
+                            results[result["custom_id"]] = result
+
+                requested_document_ids.pop()
+                document, usage, error = parse_batch_result(results.get(document_id, {"error": {
+                    "message": "No result (the batch failed or expired before answering the request)"}}))
+
+                if document is not None:
+                    usage = usage or {}
+                    usage["cost"] = compute_cost(usage.get("prompt_tokens", 0) or 0, usage.get(
+                        "completion_tokens", 0) or 0) * config_framework.BATCH_PRICE_FACTOR
+                    cost_ledger.record(
+                        blank_seed["domain"], blank_seed["text_type"], usage)
+                    documents.write(json.dumps(
+                        {"document_id": document_id, "document": document}) + "\n")
+                else:
+                    # Keep failed work item out of the corpus
+                    dead_letters_file.write(json.dumps({"document_id": document_id, "domain": blank_seed["domain"], "text_type": blank_seed["text_type"], "system": system[idx][0], "prompt": json.dumps(
+                        blank_seed), "error": error, "attempts": 1}) + "\n")
+                    number_of_dead_letters += 1
+    finally:
+        for previous_file in previous_files.values():
+            previous_file.close()
+
+    # Replace the documents of the previous run (including the ones set aside by the pipeline)
+    os.replace(documents_file_path + ".tmp", documents_file_path)
+    if os.path.exists(get_set_aside_file_path(documents_file_path)):
+        os.remove(get_set_aside_file_path(documents_file_path))
+
+    # Forget the batches whose results are reassembled (requests which failed in them are dead letters now, and are submitted in a new batch when they are retried)
+    submitted_batches = load_submitted_batches()
+    for requests_file_path in requests_file_paths:
+        submitted_batches.pop(compute_file_hash(requests_file_path), None)
+    save_submitted_batches(submitted_batches)
+
+    report_document_generation_costs(cost_ledger)
+    if number_of_dead_letters > 0:
+        print(
+            f"{'\033[33m'}{number_of_dead_letters} document(s) could not be generated, see {config_framework.DEAD_LETTERS}{'\033[0m'}")
+    if number_of_skipped_documents > 0:
+        print(
+            f"{'\033[31m'}The estimated cost of the remaining {number_of_skipped_documents} document(s) exceeds the maximum cost of {config_framework.MAXIMUM_DOCUMENT_GENERATION_COST} USD. Raise MAXIMUM_DOCUMENT_GENERATION_COST and restart the framework to resume the document generation.{'\033[0m'}")
+
+    return number_of_dead_letters + number_of_skipped_documents
@@ -0,0 +1,270 @@
+"""
+helpers_blanking.py
+
+This module contains the (parallelized) blanking of seeds for the document generation of MOSAIC_DDL: the seed is filtered to the attributes of the text type and every attribute is kept with its configured frequency. The blank seeds of all documents of a seed are built from one precompiled layout of the seed, sharing the (never modified) values of the seed instead of copying them, and all inclusion decisions are drawn at once.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from helpers_random import derive_seed
+from dataclasses import dataclass
+import numpy as np
+import hashlib
+import json
+import sys
+
+# Kinds of the entries of a compiled seed layout
+KEEP = 0
+DRAW = 1
+ENTITIES = 2
+
+# Settings of the current worker process (set by initialize_blanking_worker)
+worker_domain_to_text_types_to_number_of_seeds_and_documents = None
+worker_blanking_masks = None
+
+
+@dataclass(frozen=True)
+class BlankingMask:
+    """
+    An immutable, precompiled description of the blanking of a text type.
+
+    Attributes:
+        allowed_attributes (frozenset[str]): The attributes which can occur in the text type (None if all attributes can occur).
+        probabilities (dict[str, float]): A dictionary mapping the attribute names to their respective probability of being included.
+    """
+
+    allowed_attributes: frozenset[str]
+    probabilities: dict[str, float]
+
+
+def compile_blanking_mask(allowed_attributes: str, probabilities: dict[str, float]) -> BlankingMask:
+    """
+    Compiles the blanking mask of a text type.
+
+    Parameters:
+        allowed_attributes (str): The comma separated attributes which can occur in the text type (or "all").
+        probabilities (dict[str, float]): A dictionary mapping the attribute names to their respective probability of being included.
+
+    Returns:
+        BlankingMask: The blanking mask.
+    """
+
+    # Fetch attributes which can be included in text type
+    allowed_attributes = set(allowed_attributes.split(","))
+
+    if allowed_attributes == {"all"}:
+        return BlankingMask(None, probabilities)
+    elif allowed_attributes and "all" not in allowed_attributes:
+        # The domain is always kept
+        return BlankingMask(frozenset(allowed_attributes | {"domain"}), probabilities)
+    else:
+        print(
+            "WARNING: Please specify either \"all\" OR list the attributes you wish to occurr in the text type!")
+        sys.exit("FRAMEWORK EXECUTION ABORTED")
+
+
+def compile_entity_layout(entity: dict, probabilities: dict[str, float], slot_probabilities: list[float]) -> list[tuple]:
+    """
+    Compiles the layout of an entity (or of nested entities): the domain and text type are always kept, non-empty lists of entities are compiled recursively, empty ones are removed and every other attribute is drawn.
+
+    Parameters:
+        entity (dict): The entity.
+        probabilities (dict[str, float]): A dictionary mapping the attribute names to their respective probability of being included.
+        slot_probabilities (list[float]): The probabilities of the drawn attributes so far, extended in drawing order.
+
+    Returns:
+        list[tuple]: The entries (kind, key, value or slot) of the layout.
+    """
+
+    # Storage for layout
+    layout = []
+
+    for key, value in entity.items():
+        if key == "domain" or key == "text_type":
+            layout.append((KEEP, key, value))
+        elif isinstance(value, list) and all(isinstance(element, dict) for element in value):
+            if value:
+                layout.append((ENTITIES, key, [compile_entity_layout(
+                    element, probabilities, slot_probabilities) for element in value]))
+        else:
+            layout.append((DRAW, key, value, len(slot_probabilities)))
+            slot_probabilities.append(probabilities[key])
+
+    return layout
+
+
+def compile_seed_layout(seed: dict, mask: BlankingMask) -> tuple[list[tuple], np.ndarray]:
+    """
+    Compiles the layout of a seed: the seed is filtered to the attributes of the text type (entity lists keep only their non-empty filtered entities) and every remaining attribute gets a slot in the drawing order.
+
+    Parameters:
+        seed (dict): The seed.
+        mask (BlankingMask): The blanking mask of the text type.
+
+    Returns:
+        tuple[list[tuple], np.ndarray]: The entries of the layout and the inclusion probabilities of its slots.
+    """
+
+    # Storage for layout
+    layout = []
+    slot_probabilities = []
+
+    for key, value in seed.items():
+        # Text type is set after blanking
+        if key == "text_type":
+            continue
+
+        # Filter out attributes (and entity attributes) which do not belong to text type
+        if mask.allowed_attributes is not None:
+            if isinstance(value, list):
+                value = [{entity_key: entity_value for entity_key, entity_value in element.items(
+                ) if entity_key in mask.allowed_attributes} for element in value if isinstance(element, dict)]
+                value = [element for element in value if element]
+                if not value:
+                    continue
+            elif key not in mask.allowed_attributes:
+                continue
+
+        if key == "domain":
+            layout.append((KEEP, key, value))
+        elif isinstance(value, list) and all(isinstance(element, dict) for element in value):
+            if value:
+                layout.append((ENTITIES, key, [compile_entity_layout(
+                    element, mask.probabilities, slot_probabilities) for element in value]))
+        else:
+            layout.append((DRAW, key, value, len(slot_probabilities)))
+            slot_probabilities.append(mask.probabilities[key])
+
+    return layout, np.array(slot_probabilities, dtype=np.float64)
+
+
+def build_entity(layout: list[tuple], included: list[bool]) -> dict:
+    """
+    Builds a blanked entity from its layout.
+
+    Parameters:
+        layout (list[tuple]): The entries of the layout.
+        included (list[bool]): The inclusion decision of every slot.
+
+    Returns:
+        dict: The blanked entity.
+    """
+
+    # Storage for blanked entity
+    entity = {}
+
+    for entry in layout:
+        if entry[0] == KEEP:
+            entity[entry[1]] = entry[2]
+        elif entry[0] == DRAW:
+            if included[entry[3]]:
+                entity[entry[1]] = entry[2]
+        else:
+            entity[entry[1]] = [build_entity(element, included)
+                                for element in entry[2]]
+
+    return entity
+
+
+def blank_seed(seed: dict, texttype: str, mask: BlankingMask, number_of_documents: int, rng: np.random.Generator) -> list[dict]:
+    """
+    Creates the blank seeds of all documents of a seed: every attribute of the text type is included with its configured probability, drawn independently for every document. The blank seeds share the values of the seed and must therefore not be modified.
+
+    Parameters:
+        seed (dict): The seed.
+        texttype (str): The text type of the documents.
+        mask (BlankingMask): The blanking mask of the text type.
+        number_of_documents (int): The number of documents of the seed.
+        rng (np.random.Generator): The random number generator used for the inclusion decisions.
+
+    Returns:
+        list[dict]: The blank seed of every document.
+    """
+
+    layout, slot_probabilities = compile_seed_layout(seed, mask)
+
+    # Draw inclusion decisions of all documents at once (a value below or equal to the probability means included)
+    included = (rng.random((number_of_documents, len(
+        slot_probabilities))) <= slot_probabilities).tolist()
+
+    # Storage for blank seeds
+    blank_seeds = []
+
+    for document_included in included:
+        blank_seed = build_entity(layout, document_included)
+
+        # Remove entity lists which only consist of a single empty entity
+        blank_seed = {key: value for key, value in blank_seed.items() if not (
+            isinstance(value, list) and value == [{}])}
+
+        # Add information about text type to seed
+        blank_seed["text_type"] = texttype
+        blank_seeds.append(blank_seed)
+
+    return blank_seeds
+
+
+def compute_document_id(seed_index: int, texttype: str, document_index: int, blank_seed: str) -> str:
+    """
+    Computes the stable id linking a document to its blank seed: the seed index, the text type, the document index and a hash of the blank seed.
+
+    Parameters:
+        seed_index (int): The index of the seed in the seeds file.
+        texttype (str): The text type of the document.
+        document_index (int): The index of the document among the documents of the seed.
+        blank_seed (str): The blank seed (as json string) the document is generated from.
+
+    Returns:
+        str: The document id.
+    """
+
+    return f"{seed_index}-{texttype}-{document_index}-{hashlib.sha256(blank_seed.encode('utf-8')).hexdigest()[:16]}"
+
+
+def initialize_blanking_worker(domain_to_text_types_to_number_of_seeds_and_documents: dict[str, dict[str, tuple[int, int]]], domain_to_text_types_to_allowed_attributes: dict[str, dict[str, str]], probabilities: dict[str, float]) -> None:
+    """
+    Compiles the blanking masks of all text types in a worker process (or in the main process for the sequential blanking).
+
+    Parameters:
+        domain_to_text_types_to_number_of_seeds_and_documents (dict[str, dict[str, tuple[int, int]]]): A dictionary mapping domain to text types and text types to number of seeds and number of documents per seed of that text type.
+        domain_to_text_types_to_allowed_attributes (dict[str, dict[str, str]]): A dictionary mapping domain to text types and text types to the comma separated attributes which can occur in them (or "all").
+        probabilities (dict[str, float]): A dictionary mapping the attribute names to their respective probability of being included.
+    """
+
+    global worker_domain_to_text_types_to_number_of_seeds_and_documents, worker_blanking_masks
+
+    worker_domain_to_text_types_to_number_of_seeds_and_documents = domain_to_text_types_to_number_of_seeds_and_documents
+    worker_blanking_masks = {domain: {texttype: compile_blanking_mask(allowed_attributes, probabilities) for texttype, allowed_attributes in text_types.items()}
+                             for domain, text_types in domain_to_text_types_to_allowed_attributes.items()}
+
+
+def blank_seed_chunk(seeds: list[tuple[int, str]], master_seed: int) -> list[str]:
+    """
+    Creates the blank seeds of all documents of a chunk of seeds. Every seed gets its own random number stream derived from the master seed, so the result does not depend on which worker processes the chunk.
+
+    Parameters:
+        seeds (list[tuple[int, str]]): The index and json line of every seed of the chunk.
+        master_seed (int): The master seed.
+
+    Returns:
+        list[str]: The blank seeds (each with the id of its document) as json lines, in the order of the documents.
+    """
+
+    # Storage for blank seeds
+    blank_seeds = []
+
+    for seed_index, seed in seeds:
+        seed = json.loads(seed)
+        domain = seed["domain"]
+        texttype = seed["text_type"]
+
+        for document_index, seed_modified in enumerate(blank_seed(seed, texttype, worker_blanking_masks[domain][texttype], worker_domain_to_text_types_to_number_of_seeds_and_documents[domain][texttype][1], np.random.default_rng(derive_seed(master_seed, "blanking", domain, seed_index)))):
+            # Link blank seed and document through their id (the model only receives the blank seed itself)
+            document_id = compute_document_id(
+                seed_index, texttype, document_index, json.dumps(seed_modified))
+            blank_seeds.append(json.dumps(
+                {**seed_modified, "document_id": document_id}) + "\n")
+
+    return blank_seeds
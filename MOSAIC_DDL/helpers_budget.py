@@ -0,0 +1,357 @@
+"""
+helpers_budget.py
+
+This module contains the budget handling of the document generation: the background monitor of the credits of the API key (which pauses the generation once the remaining credits fall below a configurable floor), the accounting of tokens and cost per domain and text type, the token bucket limiting tokens per minute and total cost, and the estimate of cost and duration of a run.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from errors import BudgetExhaustedError
+from tqdm.asyncio import tqdm
+import config_framework
+import asyncio
+import httpx
+import json
+import time
+
+
+class BudgetMonitor:
+    def __init__(self, client: httpx.AsyncClient, credits_url: str, headers: dict[str, str]) -> None:
+        """
+        Initializes the budget monitor.
+
+        Parameters:
+            client (httpx.AsyncClient): The (shared) client used for polling the credits.
+            credits_url (str): The url returning the credit usage of the API key.
+            headers (dict[str, str]): The headers (authorization) of the requests.
+        """
+        self.client = client
+        self.credits_url = credits_url
+        self.headers = headers
+
+        # Latest credit information of the API key (None until the first successful poll or if the key has no limit)
+        self.usage = None
+        self.limit_remaining = None
+        self.initial_usage = None
+
+        # Token usage reported by the responses since the start of the monitor
+        self.started_at = time.monotonic()
+        self.number_of_responses = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+        # Set while the budget allows sending requests
+        self.budget_available = asyncio.Event()
+        self.budget_available.set()
+
+    async def poll(self) -> None:
+        """
+        Fetches the current credit usage of the API key and pauses or resumes the generation depending on the remaining credits.
+        """
+
+        try:
+            response = await self.client.get(self.credits_url, headers=self.headers, timeout=config_framework.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            data = response.json()["data"]
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            tqdm.write(
+                f"{'\033[33m'}Could not fetch credits of API key: {e!r}{'\033[0m'}")
+            return
+
+        self.usage = data.get("usage")
+        self.limit_remaining = data.get("limit_remaining")
+        if self.initial_usage is None:
+            self.initial_usage = self.usage
+
+        # Pause generation while remaining credits are below the floor (keys without limit report None)
+        if self.limit_remaining is not None and self.limit_remaining < config_framework.MINIMUM_REMAINING_CREDITS:
+            if self.budget_available.is_set():
+                tqdm.write(
+                    f"{'\033[31m'}Remaining credits ({self.limit_remaining}) fell below {config_framework.MINIMUM_REMAINING_CREDITS}, pausing document generation until credits are added{'\033[0m'}")
+            self.budget_available.clear()
+        elif not self.budget_available.is_set():
+            tqdm.write(
+                f"{'\033[32m'}Remaining credits ({self.limit_remaining}) are sufficient again, resuming document generation{'\033[0m'}")
+            self.budget_available.set()
+
+    async def run(self) -> None:
+        """
+        Polls the credits in regular intervals until cancelled (the first poll is expected to be done before the generation starts).
+        """
+
+        while True:
+            await asyncio.sleep(config_framework.BUDGET_POLL_INTERVAL)
+            await self.poll()
+
+    async def wait_for_budget(self) -> None:
+        """
+        Waits until the budget allows sending another request.
+        """
+
+        await self.budget_available.wait()
+
+    def record_usage(self, usage: dict) -> None:
+        """
+        Adds the token usage of a response to the metrics.
+
+        Parameters:
+            usage (dict): The usage field of the response (may be None if the provider did not report it).
+        """
+
+        self.number_of_responses += 1
+        if usage:
+            self.prompt_tokens += usage.get("prompt_tokens", 0) or 0
+            self.completion_tokens += usage.get("completion_tokens", 0) or 0
+
+    def metrics(self) -> dict:
+        """
+        Returns the live spend and token metrics.
+
+        Returns:
+            dict: The metrics.
+        """
+
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+
+        return {"usage": self.usage, "limit_remaining": self.limit_remaining, "spend": self.usage - self.initial_usage if self.usage is not None and self.initial_usage is not None else None, "responses": self.number_of_responses,
+                "prompt_tokens": self.prompt_tokens, "completion_tokens": self.completion_tokens, "tokens_per_second": (self.prompt_tokens + self.completion_tokens) / elapsed, "paused": not self.budget_available.is_set()}
+
+    def summary(self) -> str:
+        """
+        Returns a printable summary of the credit usage.
+
+        Returns:
+            str: The summary.
+        """
+
+        metrics = self.metrics()
+
+        return f"{'\033[32m'}Credit usage (total): {metrics["usage"]} Credits remaining: {metrics["limit_remaining"]} Spend of this run: {metrics["spend"]} Tokens (prompt/completion): {metrics["prompt_tokens"]}/{metrics["completion_tokens"]}{'\033[0m'}"
+
+
+def estimate_number_of_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens of a text (roughly four characters per token).
+
+    Parameters:
+        text (str): The text.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+
+    return max(1, len(text) // 4)
+
+
+def compute_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Computes the cost of a request from the configured token prices.
+
+    Parameters:
+        prompt_tokens (int): The number of prompt tokens.
+        completion_tokens (int): The number of completion tokens.
+
+    Returns:
+        float: The cost in USD.
+    """
+
+    return (prompt_tokens * config_framework.PROMPT_TOKEN_PRICE + completion_tokens * config_framework.COMPLETION_TOKEN_PRICE) / 1e6
+
+
+class CostLedger:
+    def __init__(self) -> None:
+        """
+        Initializes the ledger of the token usage and cost per domain and text type.
+        """
+        self.costs = {}
+
+    def record(self, domain: str, texttype: str, usage: dict) -> tuple[int, float]:
+        """
+        Adds the usage of a response to the ledger. The cost reported by the provider is used if present, otherwise it is computed from the configured token prices.
+
+        Parameters:
+            domain (str): The domain of the document.
+            texttype (str): The text type of the document.
+            usage (dict): The usage field of the response (may be None if the provider did not report it).
+
+        Returns:
+            tuple[int, float]: The number of tokens and the cost of the response.
+        """
+
+        usage = usage or {}
+        prompt_tokens = usage.get("prompt_tokens", 0) or 0
+        completion_tokens = usage.get("completion_tokens", 0) or 0
+        cost = usage.get("cost")
+        cost = float(cost) if cost is not None else compute_cost(
+            prompt_tokens, completion_tokens)
+
+        entry = self.costs.setdefault((domain, texttype), {
+                                      "requests": 0, "cached": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0})
+        entry["requests"] += 1
+        entry["cached"] += 1 if usage.get("cached", False) else 0
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+        entry["cost"] += cost
+
+        return prompt_tokens + completion_tokens, cost
+
+    def merge(self, costs: dict[tuple[str, str], dict]) -> None:
+        """
+        Adds the entries of another ledger (e.g. of a shard of the document generation) to the ledger.
+
+        Parameters:
+            costs (dict[tuple[str, str], dict]): The entries of the other ledger, keyed by domain and text type.
+        """
+
+        for key, other_entry in costs.items():
+            entry = self.costs.setdefault(key, {
+                                          "requests": 0, "cached": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0})
+            for field in entry:
+                entry[field] += other_entry[field]
+
+    def total(self) -> dict:
+        """
+        Returns the usage summed over all domains and text types.
+
+        Returns:
+            dict: The total number of requests (and of those answered from the response cache), prompt tokens, completion tokens and cost.
+        """
+
+        total = {"requests": 0, "cached": 0, "prompt_tokens": 0,
+                 "completion_tokens": 0, "cost": 0.0}
+        for entry in self.costs.values():
+            for key in total:
+                total[key] += entry[key]
+
+        return total
+
+    def write(self, file_path: str) -> None:
+        """
+        Writes the ledger as .json file.
+
+        Parameters:
+            file_path (str): The path to the file.
+        """
+
+        # Nest ledger by domain and text type
+        domains = {}
+        for (domain, texttype), entry in self.costs.items():
+            domains.setdefault(domain, {})[texttype] = entry
+
+        with open(file_path, "w", encoding='utf-8') as file:
+            json.dump({"total": self.total(), "domains": domains}, file, indent=4)
+
+
+class TokenBucketLimiter:
+    def __init__(self, tokens_per_minute: int, maximum_cost: float) -> None:
+        """
+        Initializes the limiter, which holds back requests while more than tokens_per_minute tokens were sent in the last minute and refuses requests which could exceed the maximum cost.
+
+        Parameters:
+            tokens_per_minute (int): The capacity of the bucket, refilled over one minute (None disables the limit).
+            maximum_cost (float): The maximum cost of all requests in USD (None disables the limit).
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self.maximum_cost = maximum_cost
+        self.tokens = float(tokens_per_minute) if tokens_per_minute is not None else 0.0
+        self.updated_at = time.monotonic()
+        self.spent_cost = 0.0
+        self.reserved_cost = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self) -> None:
+        """
+        Adds the tokens which flowed into the bucket since the last update.
+        """
+
+        now = time.monotonic()
+        self.tokens = min(self.tokens_per_minute, self.tokens +
+                          (now - self.updated_at) * self.tokens_per_minute / 60)
+        self.updated_at = now
+
+    async def acquire(self, tokens: int, cost: float) -> None:
+        """
+        Reserves the estimated tokens and cost of a request, waiting until the bucket holds enough tokens.
+
+        Parameters:
+            tokens (int): The estimated number of tokens of the request.
+            cost (float): The estimated cost of the request in USD.
+        """
+
+        # Refuse request if it could exceed the maximum cost (requests in flight count with their estimate)
+        if self.maximum_cost is not None and self.spent_cost + self.reserved_cost + cost > self.maximum_cost:
+            raise BudgetExhaustedError(
+                self.spent_cost, self.maximum_cost)
+        self.reserved_cost += cost
+
+        if self.tokens_per_minute is None:
+            return
+
+        # Requests larger than the bucket only wait for a full bucket; waiting requests are served in order
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self.lock:
+            self.refill()
+            if self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) * 60 / self.tokens_per_minute)
+                self.refill()
+            self.tokens -= tokens
+
+    def settle(self, tokens: int, cost: float, used_tokens: int, used_cost: float) -> None:
+        """
+        Replaces the estimate of a finished request by its actual usage (a failed request uses nothing).
+
+        Parameters:
+            tokens (int): The estimated number of tokens which were reserved.
+            cost (float): The estimated cost which was reserved.
+            used_tokens (int): The actual number of tokens.
+            used_cost (float): The actual cost.
+        """
+
+        self.reserved_cost -= cost
+        self.spent_cost += used_cost
+
+        # Tokens used beyond the estimate are taken from the bucket (possibly into debt), unused ones are returned
+        if self.tokens_per_minute is not None:
+            self.tokens = min(self.tokens_per_minute, self.tokens +
+                              min(tokens, self.tokens_per_minute) - used_tokens)
+
+
+def estimate_document_generation(domain_to_text_types_to_number_of_seeds_and_documents: dict[str, dict[str, tuple[int, int]]], prompt_tokens: dict[tuple[str, str], int]) -> dict:
+    """
+    Estimates tokens, cost and duration of the document generation from the planned number of requests.
+
+    Parameters:
+        domain_to_text_types_to_number_of_seeds_and_documents (dict[str, dict[str, tuple[int, int]]]): A dictionary mapping domain to text types and text types to number of seeds and number of documents per seed of that text type.
+        prompt_tokens (dict[tuple[str, str], int]): A dictionary mapping domain and text type to the expected number of prompt tokens of a request (system prompt and seed).
+
+    Returns:
+        dict: The estimate per domain and text type and in total; the duration (in seconds) is bounded by the number of concurrent requests and the token bucket.
+    """
+
+    # Estimate per text type
+    domains = {}
+    total = {"requests": 0, "prompt_tokens": 0,
+             "completion_tokens": 0, "cost": 0.0}
+    for domain, text_types in domain_to_text_types_to_number_of_seeds_and_documents.items():
+        for texttype, (number_of_seeds, number_of_documents) in text_types.items():
+            requests = number_of_seeds * number_of_documents
+            entry = {"requests": requests, "prompt_tokens": requests * prompt_tokens[(domain, texttype)],
+                     "completion_tokens": requests * config_framework.ESTIMATED_COMPLETION_TOKENS}
+            entry["cost"] = compute_cost(
+                entry["prompt_tokens"], entry["completion_tokens"])
+            domains.setdefault(domain, {})[texttype] = entry
+
+            for key in total:
+                total[key] += entry[key]
+
+    # Duration is bounded by the requests in flight and by the tokens per minute
+    duration = total["requests"] * config_framework.ESTIMATED_REQUEST_LATENCY / \
+        config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS
+    if config_framework.MAXIMUM_TOKENS_PER_MINUTE is not None:
+        duration = max(duration, (total["prompt_tokens"] + total["completion_tokens"]) *
+                       60 / config_framework.MAXIMUM_TOKENS_PER_MINUTE)
+    total["duration"] = duration
+
+    return {"total": total, "domains": domains}
@@ -1,281 +1,868 @@
 """
 helpers_document_generation.py
 
-This module contains the parallelized document generation of MOSAIC_DDL.
+This module contains the parallelized document generation of MOSAIC_DDL, optionally sharded across processes (and API keys).
 
 Author: Benjamin Koch
 Date: July 2025
 """
 
 # Imports
-from dotenv import load_dotenv
+from helpers_backends import DocumentGenerationBackend, OpenRouterBackend, create_document_generation_backend, OPEN_ROUTER_API_CREDITS_URL, OPEN_ROUTER_API_KEYS
+from helpers_budget import BudgetMonitor, CostLedger, TokenBucketLimiter, estimate_number_of_tokens, compute_cost
+from helpers_telemetry import TelemetryExporter, get_telemetry
+from helpers_request_scheduling import INVALID_REQUEST_STATUS_CODES
+from errors import DocumentRequestFailedError, BudgetExhaustedError
+from concurrent.futures import ProcessPoolExecutor
+from typing import TextIO
 from tqdm.asyncio import tqdm
+import multiprocessing
 import config_framework
-from os import getenv
-import requests
 import asyncio
-import random
-import httpx
+import heapq
 import json
-import copy
-import sys
+import glob
+import time
 import os
+import re
 
-# Load environment variables
-load_dotenv()
 
-# Define API parts
-OPEN_ROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-OPEN_ROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
-OPEN_ROUTER_API_HEADERS = {
-    "Authorization": f"Bearer {OPEN_ROUTER_API_KEY}", "Content-Type": "application/json"}
+def load_completed_documents(documents_file_path: str) -> list[tuple[str, int]]:
+    """
+    Loads the ids of the documents which were completely written by a previous (interrupted) run. The file is its own journal: every intact line marks one finished work item.
 
+    Parameters:
+        documents_file_path (str): The path to the documents file.
 
-async def get_model_response(system: str, seed: str, client: httpx.AsyncClient, semaphore: asyncio.Semaphore) -> str:
+    Returns:
+        list[tuple[str, int]]: The id of every intact document together with the byte offset at which its line ends.
     """
-    Returns the model response to the provided prompt.
+
+    # Storage for completed documents
+    completed_documents = []
+
+    if not config_framework.RESUME_DOCUMENT_GENERATION or not os.path.exists(documents_file_path):
+        return completed_documents
+
+    offset = 0
+    with open(documents_file_path, "rb") as documents:
+        for document in documents:
+            # Stop at the first partially written or corrupted line
+            if not document.endswith(b"\n"):
+                break
+            try:
+                document_id = json.loads(document)["document_id"]
+            except (ValueError, KeyError, TypeError):
+                break
+
+            offset += len(document)
+            completed_documents.append((document_id, offset))
+
+    return completed_documents
+
+
+def load_dead_letters(dead_letters_file_path: str) -> dict[str, dict]:
+    """
+    Loads the work items whose requests failed permanently in a previous (interrupted) run.
 
     Parameters:
-        system (str): The system information which is used for text generation.
-        seed (str): The seed information which is used for text generation.
+        dead_letters_file_path (str): The path to the dead letters file.
 
     Returns:
-        str: The model response.
+        dict[str, dict]: A dictionary mapping the document ids to the dead letters.
     """
 
-    # Create prompt
-    system_prompt = {"role": "system", "content": system}
+    # Storage for dead letters
+    dead_letters = {}
 
-    user_prompt = {"role": "user", "content": seed}
+    if not config_framework.RESUME_DOCUMENT_GENERATION or not os.path.exists(dead_letters_file_path):
+        return dead_letters
 
-    full_prompt = {"model": config_framework.MODEL,
-                   "messages": [system_prompt, user_prompt]}
+    with open(dead_letters_file_path, "r", encoding='utf-8') as dead_letters_file:
+        for dead_letter in dead_letters_file:
+            # Stop at the first partially written or corrupted line
+            try:
+                dead_letter = json.loads(dead_letter)
+                dead_letters[dead_letter["document_id"]] = dead_letter
+            except (ValueError, KeyError, TypeError):
+                break
 
-    # Post request to model using the semaphore which ensure that only a certain number of parallel requests are posted
-    async with semaphore:
-        try:
-            response = await client.post(OPEN_ROUTER_API_URL, headers=OPEN_ROUTER_API_HEADERS, json=full_prompt, timeout=60)
-            response.raise_for_status()
-            completion = response.json()
-            return completion["choices"][0]["message"]["content"]
-        except Exception as e:
-            return f"An error occurred: {str(e)}"
+    return dead_letters
 
 
-def get_credits_of_API_key() -> str:
+def is_retryable_dead_letter(dead_letter: dict) -> bool:
     """
-    Returns the remaining number of tokens of the API key.
+    Checks whether the request of a dead letter of a previous run should be sent again. Only requests which the provider rejected as invalid are not retried, since they fail the same way again (timeouts, overloaded providers, malformed or empty responses, missing credits etc. may have been resolved since).
+
+    Parameters:
+        dead_letter (dict): The dead letter.
 
     Returns:
-        str: The information regarding credit usage of the API key.
+        bool: Whether the request should be sent again.
     """
 
-    # Fetch number of credits
-    response = requests.get(
-        url="https://openrouter.ai/api/v1/auth/key",
-        headers={
-            "Authorization": f"Bearer {getenv("OPENROUTER_API_KEY")}"
-        }
-    )
+    status_code = re.match(r"HTTP (\d+):", dead_letter.get("error") or "")
 
-    try:
-        # Convert to dictionary-type for easy access of response fields
-        response = response.json()
+    return status_code is None or int(status_code.group(1)) not in INVALID_REQUEST_STATUS_CODES
+
+
+def get_set_aside_file_path(documents_file_path: str) -> str:
+    """
+    Returns the path of the file holding the documents of a previous run which are set aside until the documents before them are written (next to the documents file).
+
+    Parameters:
+        documents_file_path (str): The path to the documents file.
+
+    Returns:
+        str: The path to the file of the set aside documents.
+    """
+
+    root, extension = os.path.splitext(documents_file_path)
+
+    return f"{root}.set-aside{extension}"
+
+
+def read_document_lines(file_path: str, start: int, end: int):
+    """
+    Streams the lines of a documents file between two byte offsets.
+
+    Parameters:
+        file_path (str): The path to the documents file.
+        start (int): The byte offset at which the first line starts.
+        end (int): The byte offset at which the last line ends.
+
+    Returns:
+        Iterator[bytes]: The lines.
+    """
 
-        return f"{'\033[32m'}Credit usage (total): {response["data"]["usage"]} Credits remaining: {response["data"]["limit_remaining"]}{'\033[0m'}"
-    except (KeyError, ValueError):
-        return f"{'\033[32m'}Error: Unexpected response structure or failed to properly parse JSON{'\033[0m'}"
+    with open(file_path, "rb") as documents:
+        documents.seek(start)
+        while start < end:
+            line = documents.readline()
+            start += len(line)
+            yield line
 
 
-def delete_seed_fields_probabilistically(seed: str, probabilities: dict[str, float]) -> str:
+def compute_document_order_key(document_id: str) -> tuple[int, int]:
     """
-    Recursively deletes fields of the seed probabilistically.
+    Computes the position of a document in the blank seeds file from its id (the blank seeds are written seed by seed, and document by document within a seed).
 
     Parameters:
-        seed (str): The seed to modify.
-        probabilities (dict[str, float]): A dictionary mapping the attribute names to their respective probability of being included.
+        document_id (str): The document id (seed index, text type, document index and hash).
 
     Returns:
-        str: The modified/blanked out seed.
+        tuple[int, int]: The seed index and the document index.
+    """
+
+    return int(document_id.split("-", 1)[0]), int(document_id.rsplit("-", 2)[1])
+
+
+def get_shard_file_path(file_path: str, shard_index: int, number_of_shards: int) -> str:
+    """
+    Returns the path of the file of a shard of the document generation (next to the file of the unsharded generation).
+
+    Parameters:
+        file_path (str): The path to the file of the unsharded generation.
+        shard_index (int): The index of the shard.
+        number_of_shards (int): The number of shards.
+
+    Returns:
+        str: The path to the file of the shard.
+    """
+
+    root, extension = os.path.splitext(file_path)
+
+    return f"{root}.shard-{shard_index}-of-{number_of_shards}{extension}"
+
+
+def list_shard_file_paths(file_path: str) -> list[str]:
     """
+    Lists the existing files of the shards of the document generation for any number of shards (including the documents they set aside).
 
-    # Check whether seed is dictionary or list
-    if isinstance(seed, dict):
-        for attribute in list(seed.keys()):
-            if attribute == "domain" or attribute == "text_type":
-                continue
-            if isinstance(seed[attribute], list) and all(isinstance(l, dict) for l in seed[attribute]):
-                # Attribute is start of humans, animals, vehicles or objects list; hence recursively delete seed or delete entity entry if it is simply empty
-                if len(seed[attribute]) == 0:
-                    del seed[attribute]
-                else:
-                    seed[attribute] = delete_seed_fields_probabilistically(
-                        seed[attribute], probabilities)
-            else:
-                # Attribute is simple entry/value; hence fetch probability of attribute (based on second letter)
-                probability = probabilities[attribute]
+    Parameters:
+        file_path (str): The path to the file of the unsharded generation.
 
-                # Probability defines the probability of being included; hence < probability means excluded
-                if random.random() > probability:
-                    del seed[attribute]
+    Returns:
+        list[str]: The paths to the files of the shards.
+    """
 
-    elif isinstance(seed, list):
-        return [delete_seed_fields_probabilistically(
-            attribute, probabilities) for attribute in seed]
+    root, extension = os.path.splitext(file_path)
 
-    return seed
+    return sorted(glob.glob(f"{glob.escape(root)}.shard-*-of-*{glob.escape(extension)}"))
 
 
-def filter_dictionary_keys(dictionary: dict, allowed_attributes: set[str]) -> dict:
+def list_previous_documents_file_paths(documents_file_path: str) -> list[str]:
     """
-    Filters out all key value pairs in the dictionary which do not have their key occurring in the allowed attributes set.
+    Lists the existing documents files which previous runs may have written, sharded with any number of shards or not sharded at all (including the documents they set aside).
 
     Parameters:
-        dictionary (dict): The dictionary to filter.
-        allowed_attributes (set[str]): A set of keys which should be kept in the dictionary.
+        documents_file_path (str): The path to the documents file of the unsharded generation.
 
     Returns:
-        dict: The filtered dictionary.
+        list[str]: The paths to the documents files.
     """
 
-    # Storage for filtered dictionary
-    filtered_dictionary = {}
+    return [file_path for file_path in (documents_file_path, get_set_aside_file_path(documents_file_path)) if os.path.exists(file_path)] + list_shard_file_paths(documents_file_path)
 
-    for key, value in dictionary.items():
-        if isinstance(value, list):
-            # Filter list of dictionaries
-            filtered_dictionary_list = []
-            for sub_dictionary in value:
-                if isinstance(sub_dictionary, dict):
-                    filtered_sub_dictionary = {
-                        key: value for key, value in sub_dictionary.items() if key in allowed_attributes}
 
-                    # If this dictionary is not empty, add it to filtered list
-                    if filtered_sub_dictionary:
-                        filtered_dictionary_list.append(
-                            filtered_sub_dictionary)
+def filter_document_lines(lines, document_ids: set[str]):
+    """
+    Keeps the lines of a documents file whose documents have one of the given ids.
 
-            # If this filtered list is not empty, add it to filtered dictionary
-            if filtered_dictionary_list:
-                filtered_dictionary[key] = filtered_dictionary_list
+    Parameters:
+        lines (Iterator[bytes]): The lines.
+        document_ids (set[str]): The ids of the documents which are kept.
+
+    Returns:
+        Iterator[bytes]: The kept lines.
+    """
+
+    for line in lines:
+        if json.loads(line)["document_id"] in document_ids:
+            yield line
+
+
+class DocumentGenerationPipeline:
+    def __init__(self, backend: DocumentGenerationBackend, system: list[str], blank_seeds_file_path: str, documents_file_path: str, dead_letters_file_path: str, number_of_text_types: int, domain_to_text_types_to_number_of_seeds_and_documents: dict[str, dict[str, tuple[int, int]]], shard: tuple[int, int] = None, previous_documents_file_paths: list[str] = None) -> None:
+        """
+        Initializes the pipeline: a reader streams the blank seeds (the prompts) into a bounded queue, a pool of workers hands the work items to the backend (one request per worker, or one batch per worker for batching backends) and a writer commits the documents in the order of the blank seeds.
+
+        Parameters:
+            backend (DocumentGenerationBackend): The backend answering the requests.
+            system (list[str]): The system prompts which should be used.
+            blank_seeds_file_path (str): The path to the blank seeds file (written by the blank seed generation).
+            documents_file_path (str): The path to the documents file.
+            dead_letters_file_path (str): The path to the file storing the work items whose requests failed permanently.
+            number_of_text_types (int): The number of text types.
+            domain_to_text_types_to_number_of_seeds_and_documents (dict[str, dict[str, tuple[int, int]]]): A dictionary mapping domain to text types and text types to number of seeds and number of documents per seed of that text type.
+            shard (tuple[int, int]): The index of the shard and the number of shards, if the pipeline generates a shard of the documents (the limits on tokens per minute and cost are split evenly between the shards).
+            previous_documents_file_paths (list[str]): The documents files of previous runs (with another number of shards or without sharding) whose documents of this pipeline are reused.
+        """
+        self.system = system
+        self.blank_seeds_file_path = blank_seeds_file_path
+        self.documents_file_path = documents_file_path
+        self.dead_letters_file_path = dead_letters_file_path
+        self.number_of_text_types = number_of_text_types
+        self.domain_to_text_types_to_number_of_seeds_and_documents = domain_to_text_types_to_number_of_seeds_and_documents
+        self.backend = backend
+        self.shard = shard
+
+        # Workers and work items per worker as the backend requests (for the OpenRouter backend one worker per request which may be in flight at most; its limiter decides how many of them are actually sending)
+        self.number_of_workers = backend.number_of_workers
+        self.batch_size = backend.batch_size or 1
+
+        # Bounded queue between reader and workers, unbounded queue between workers and writer
+        self.work_queue = asyncio.Queue(
+            maxsize=2 * self.number_of_workers * self.batch_size)
+        self.result_queue = asyncio.Queue()
+
+        # Documents and dead letters written by a previous (interrupted) run, including the documents it set aside
+        self.completed_documents = load_completed_documents(
+            documents_file_path)
+        self.set_aside_file_path = get_set_aside_file_path(
+            documents_file_path)
+        self.reusable_document_ids = {
+            document_id for document_id, _ in self.completed_documents}
+
+        # Documents of this pipeline in the documents it set aside and in the documents files of previous runs with another number of shards (mapping the file to the ids and the end of its last intact line)
+        self.previous_documents = {}
+        for file_path in [self.set_aside_file_path] + [file_path for file_path in previous_documents_file_paths or [] if file_path not in (documents_file_path, self.set_aside_file_path)]:
+            previous_documents = load_completed_documents(file_path)
+            document_ids = {document_id for document_id, _ in previous_documents if shard is None or compute_document_order_key(
+                document_id)[0] % shard[1] == shard[0]}
+            if document_ids:
+                self.previous_documents[file_path] = (
+                    document_ids, previous_documents[-1][1])
+                self.reusable_document_ids |= document_ids
+        self.dead_letters = load_dead_letters(dead_letters_file_path)
+        self.number_of_dead_letters = 0
+        self.budget_monitor = None
+
+        # Token and cost accounting, and the hard limits on tokens per minute and total cost (requests beyond the cost are skipped and generated when resuming)
+        number_of_shards = shard[1] if shard is not None else 1
+        self.cost_ledger = CostLedger()
+        self.token_bucket = TokenBucketLimiter(config_framework.MAXIMUM_TOKENS_PER_MINUTE / number_of_shards if config_framework.MAXIMUM_TOKENS_PER_MINUTE is not None else None,
+                                               config_framework.MAXIMUM_DOCUMENT_GENERATION_COST / number_of_shards if config_framework.MAXIMUM_DOCUMENT_GENERATION_COST is not None else None)
+        self.budget_exhausted = None
+        self.number_of_skipped_documents = 0
+
+        # Live telemetry (requests in flight are counted by the workers, out of order work items are held back in the reorder buffer of the writer)
+        self.telemetry = get_telemetry()
+        self.requests_in_flight = 0
+        self.reorder_buffer = {}
+
+    async def read_work_items(self) -> None:
+        """
+        Streams the blank seeds and puts one work item per document into the (bounded) work queue. Work items whose document was already written by a previous run (wherever it is in its documents file) are passed to the writer directly, as are the dead letters of requests which would fail again.
+        """
+
+        with open(self.blank_seeds_file_path, "r", encoding='utf-8') as blank_seeds:
+            for idx, blank_seed in enumerate(blank_seeds):
+                # The model only receives the blank seed itself, not the id linking it to its document (seed index, text type, document index and hash)
+                with self.telemetry.time("preparing"):
+                    blank_seed = json.loads(blank_seed)
+                    document_id = blank_seed.pop("document_id")
+                    document_index = compute_document_order_key(document_id)[
+                        1]
+
+                    work_item = {"index": idx, "document_id": document_id, "domain": blank_seed["domain"], "texttype": blank_seed["text_type"], "document_index": document_index, "system": self.system[idx][0],
+                                 "limits": self.system[idx][2], "prompt": json.dumps(blank_seed)}
+
+                # Skip work item if a previous run already finished it (other dead letters are requested again)
+                if document_id in self.reusable_document_ids:
+                    work_item["completed"] = True
+                    await self.result_queue.put(work_item)
+                    continue
+                elif document_id in self.dead_letters and not is_retryable_dead_letter(self.dead_letters[document_id]):
+                    work_item["dead_letter"] = self.dead_letters[document_id]
+                    await self.result_queue.put(work_item)
+                    continue
+
+                # Stop reading once the budget is exhausted
+                if self.budget_exhausted is not None:
+                    break
+
+                # Hand work item to the workers (waits while the queue is full)
+                with self.telemetry.time("waiting_for_queue"):
+                    await self.work_queue.put(work_item)
+
+        # Signal end of work items to every worker
+        for _ in range(self.number_of_workers):
+            await self.work_queue.put(None)
+
+    async def take_work_items(self) -> tuple[list[dict], bool]:
+        """
+        Takes the next batch of work items from the work queue (a single one unless the backend batches requests).
+
+        Returns:
+            tuple[list[dict], bool]: The work items and whether the end marker was received.
+        """
+
+        work_items = []
+        while len(work_items) < self.batch_size:
+            work_item = await self.work_queue.get()
+            if work_item is None:
+                return work_items, True
+            work_items.append(work_item)
+
+        return work_items, False
+
+    async def reserve_budget(self, work_item: dict) -> bool:
+        """
+        Waits until the budget allows the request of a work item and reserves its estimated tokens and cost.
+
+        Parameters:
+            work_item (dict): The work item.
+
+        Returns:
+            bool: Whether the request may be sent (False once the maximum cost would be exceeded).
+        """
+
+        # Wait while the remaining credits are below the floor
+        if self.budget_monitor is not None:
+            await self.budget_monitor.wait_for_budget()
+
+        work_item["reserved_tokens"] = estimate_number_of_tokens(work_item["system"]) + estimate_number_of_tokens(
+            work_item["prompt"]) + config_framework.ESTIMATED_COMPLETION_TOKENS
+        work_item["reserved_cost"] = compute_cost(work_item["reserved_tokens"] - config_framework.ESTIMATED_COMPLETION_TOKENS,
+                                                  config_framework.ESTIMATED_COMPLETION_TOKENS)
+        if self.budget_exhausted is None:
+            try:
+                await self.token_bucket.acquire(work_item["reserved_tokens"], work_item["reserved_cost"])
+                return True
+            except BudgetExhaustedError as e:
+                self.budget_exhausted = e
+
+        return False
+
+    async def process_work_items(self) -> None:
+        """
+        Takes work items from the work queue, hands their requests to the backend and puts the responses (or the dead letters of requests which failed permanently) into the result queue until the end marker is received. Work items are skipped once the budget is exhausted.
+        """
+
+        finished = False
+        while not finished:
+            with self.telemetry.time("waiting_for_work"):
+                work_items, finished = await self.take_work_items()
+
+            # Skip work items which exceed the budget
+            requested_work_items = []
+            with self.telemetry.time("waiting_for_budget"):
+                for work_item in work_items:
+                    if await self.reserve_budget(work_item):
+                        requested_work_items.append(work_item)
+                    else:
+                        work_item["skipped"] = True
+
+            if requested_work_items:
+                self.requests_in_flight += len(requested_work_items)
+                requested_at = time.perf_counter()
+                try:
+                    with self.telemetry.time("requesting"):
+                        results = await self.backend.complete_batch([(work_item["system"], work_item["prompt"], work_item["document_index"], work_item["limits"]) for work_item in requested_work_items])
+                finally:
+                    self.requests_in_flight -= len(requested_work_items)
+                request_latency = time.perf_counter() - requested_at
+
+                for work_item, result in zip(requested_work_items, results):
+                    # Latency of the request including its retries (of the whole batch for batching backends)
+                    self.telemetry.increment("requests")
+                    self.telemetry.observe(
+                        "request_latency_seconds", request_latency)
+
+                    used_tokens, used_cost = 0, 0.0
+                    if isinstance(result, DocumentRequestFailedError):
+                        self.telemetry.increment("dead_letters")
+                        work_item["dead_letter"] = {"document_id": work_item["document_id"], "domain": work_item["domain"], "text_type": work_item["texttype"],
+                                                    "system": work_item["system"], "prompt": work_item["prompt"], "error": result.reason, "attempts": result.attempts}
+                    else:
+                        work_item["document"], usage = result
+                        self.telemetry.increment("documents")
+                        if usage is not None:
+                            self.telemetry.increment(
+                                "prompt_tokens", usage.get("prompt_tokens") or 0)
+                            self.telemetry.increment(
+                                "completion_tokens", usage.get("completion_tokens") or 0)
+                        if self.budget_monitor is not None:
+                            self.budget_monitor.record_usage(usage)
+                        used_tokens, used_cost = self.cost_ledger.record(
+                            work_item["domain"], work_item["texttype"], usage)
+                    self.token_bucket.settle(
+                        work_item["reserved_tokens"], work_item["reserved_cost"], used_tokens, used_cost)
+
+            for work_item in work_items:
+                await self.result_queue.put(work_item)
+
+        # Forward end marker to the writer
+        await self.result_queue.put(None)
+
+    def open_documents_file(self, number_of_reused_documents: int) -> TextIO:
+        """
+        Opens the documents file for appending after the documents of a previous run which are kept in place. All later documents of the previous run (and the documents it set aside itself or wrote with another number of shards) are set aside in a separate file first, from which they are copied once their work items are written, such that documents after a gap (e.g. a retried dead letter) are not requested again.
+
+        Parameters:
+            number_of_reused_documents (int): The number of documents of the previous run which are kept in place.
+
+        Returns:
+            TextIO: The documents file opened for appending.
+        """
+
+        offset = self.completed_documents[number_of_reused_documents -
+                                          1][1] if number_of_reused_documents > 0 else 0
+
+        # Merge later documents with the previous ones (all are in the order of the blank seeds), dropping duplicates
+        self.set_aside_documents = {}
+        later_documents = read_document_lines(
+            self.documents_file_path, offset, self.completed_documents[-1][1]) if number_of_reused_documents < len(self.completed_documents) else iter([])
+        previous_documents = [filter_document_lines(read_document_lines(
+            file_path, 0, end), document_ids) for file_path, (document_ids, end) in self.previous_documents.items()]
+        with open(self.set_aside_file_path + ".tmp", "wb") as set_aside_file:
+            for document in heapq.merge(later_documents, *previous_documents, key=lambda line: compute_document_order_key(json.loads(line)["document_id"])):
+                document_id = json.loads(document)["document_id"]
+                if document_id not in self.set_aside_documents:
+                    self.set_aside_documents[document_id] = (
+                        set_aside_file.tell(), len(document))
+                    set_aside_file.write(document)
+        os.replace(self.set_aside_file_path + ".tmp", self.set_aside_file_path)
+        if number_of_reused_documents < len(self.completed_documents):
+            print(
+                f"{'\033[33m'}Set aside the documents of the previous run after document {number_of_reused_documents} until the documents before them are written{'\033[0m'}")
+
+        # Truncate file after last document kept in place
+        if number_of_reused_documents > 0:
+            with open(self.documents_file_path, "r+b") as documents:
+                documents.truncate(offset)
+
+            return open(self.documents_file_path, "a", encoding='utf-8', buffering=1)
+
+        return open(self.documents_file_path, "w", encoding='utf-8', buffering=1)
+
+    def read_set_aside_document(self, document_id: str) -> str:
+        """
+        Reads a document set aside by open_documents_file.
+
+        Parameters:
+            document_id (str): The document id.
+
+        Returns:
+            str: The line of the document.
+        """
+
+        start, length = self.set_aside_documents[document_id]
+        with open(self.set_aside_file_path, "rb") as set_aside_file:
+            set_aside_file.seek(start)
+
+            return set_aside_file.read(length).decode('utf-8')
+
+    async def write_documents(self) -> None:
+        """
+        Writes the documents (or the dead letters) of the finished work items, until every worker has finished. Work items which finish out of order are held back in a reorder buffer, such that the documents are written in the order of the blank seeds. Documents of a previous run are kept in place up to the first work item which has to be generated again, later ones are set aside and copied back in order. Once a work item was skipped because the budget is exhausted, nothing after it is written (such that the written documents can be resumed).
+        """
+
+        # Number of documents still outstanding per text type
+        remaining_documents = {(domain, texttype): number_of_seeds * number_of_documents for domain, text_types in self.domain_to_text_types_to_number_of_seeds_and_documents.items()
+                               for texttype, (number_of_seeds, number_of_documents) in text_types.items()}
+
+        # Shards only show their documents (one line per shard)
+        if self.shard is None:
+            outer_progress_bar = tqdm(
+                total=self.number_of_text_types, desc=f"{'\033[34m'}Processing text types...{'\033[0m'}", position=0)
+            inner_progress_bar = tqdm(total=sum(remaining_documents.values(
+            )), desc=f"{'\033[34m'}Generating documents...{'\033[0m'}", leave=False, position=1)
         else:
-            # Filter singular key value pair
-            if key in allowed_attributes:
-                filtered_dictionary[key] = value
+            outer_progress_bar = tqdm(
+                total=self.number_of_text_types, disable=True)
+            inner_progress_bar = tqdm(total=sum(remaining_documents.values(
+            )), desc=f"{'\033[34m'}Generating documents (shard {self.shard[0] + 1}/{self.shard[1]})...{'\033[0m'}", position=self.shard[0])
+
+        # Reorder buffer mapping the index of a finished work item to the work item
+        reorder_buffer = self.reorder_buffer
+        next_index = 0
+        number_of_reused_documents = 0
+        stopped = False
+
+        # The documents file is opened once the first document has to be written (after discarding the documents of a previous run which are not reused)
+        documents = None
+
+        finished_workers = 0
+        with open(self.dead_letters_file_path, "w", encoding='utf-8', buffering=1) as dead_letters:
+            while finished_workers < self.number_of_workers:
+                result = await self.result_queue.get()
+
+                if result is None:
+                    finished_workers += 1
+                    continue
+
+                # Write all buffered work items which are next in order
+                reorder_buffer[result["index"]] = result
+                writing_started_at = time.perf_counter()
+                while next_index in reorder_buffer:
+                    result = reorder_buffer.pop(next_index)
+                    next_index += 1
+
+                    # Keep work items from the first skipped one on for the next run
+                    if stopped or result.get("skipped", False):
+                        stopped = True
+                        continue
+
+                    if "dead_letter" in result:
+                        # Keep failed work item out of the corpus
+                        dead_letters.write(json.dumps(
+                            result["dead_letter"]) + "\n")
+                        self.number_of_dead_letters += 1
+                    elif documents is None and result.get("completed", False) and number_of_reused_documents < len(self.completed_documents) and self.completed_documents[number_of_reused_documents][0] == result["document_id"]:
+                        number_of_reused_documents += 1
+                    else:
+                        if documents is None:
+                            documents = self.open_documents_file(
+                                number_of_reused_documents)
+                        if result.get("completed", False):
+                            documents.write(
+                                self.read_set_aside_document(result["document_id"]))
+                        else:
+                            documents.write(json.dumps(
+                                {"document_id": result["document_id"], "document": result["document"]}) + "\n")
+                    inner_progress_bar.update(1)
+
+                    # Text type is done once all its work items are written
+                    remaining_documents[(result["domain"],
+                                         result["texttype"])] -= 1
+                    if remaining_documents[(result["domain"], result["texttype"])] == 0:
+                        outer_progress_bar.update(1)
+                self.telemetry.add_time(
+                    "writing", time.perf_counter() - writing_started_at)
+
+        # Set aside documents of a previous run beyond the last written work item
+        if documents is None:
+            documents = self.open_documents_file(number_of_reused_documents)
+        documents.close()
+
+        inner_progress_bar.close()
+        outer_progress_bar.close()
+
+        # Work items which were skipped (or never read) because the budget is exhausted, whose set aside documents are kept for the next run
+        self.number_of_skipped_documents = sum(remaining_documents.values())
+        if self.number_of_skipped_documents == 0:
+            os.remove(self.set_aside_file_path)
+
+        if self.number_of_dead_letters > 0:
+            print(
+                f"{'\033[33m'}{self.number_of_dead_letters} document(s) could not be generated, see {self.dead_letters_file_path}{'\033[0m'}")
+
+    def register_gauges(self) -> None:
+        """
+        Registers the gauges of the pipeline in the telemetry: the requests in flight (and, for the OpenRouter backend, how many of them the limiter admits), the depths of the queues and the size of the reorder buffer.
+        """
+
+        self.telemetry.register_gauge(
+            "requests_in_flight", lambda: self.requests_in_flight)
+        self.telemetry.register_gauge(
+            "work_queue_depth", self.work_queue.qsize)
+        self.telemetry.register_gauge(
+            "result_queue_depth", self.result_queue.qsize)
+        self.telemetry.register_gauge(
+            "reorder_buffer_size", lambda: len(self.reorder_buffer))
+        if isinstance(self.backend, OpenRouterBackend):
+            self.telemetry.register_gauge(
+                "requests_sending", lambda: self.backend.limiter.in_flight)
+            self.telemetry.register_gauge(
+                "concurrency_limit", lambda: self.backend.limiter.limit)
+
+    async def run(self) -> None:
+        """
+        Runs reader, workers and writer concurrently until all documents are written, exporting the telemetry in the background.
+        """
+
+        # Report documents of a previous (interrupted) run
+        if self.reusable_document_ids or self.dead_letters:
+            print(
+                f"{'\033[32m'}Found {len(self.reusable_document_ids)} documents of a previous run, resuming document generation{'\033[0m'}")
+
+        async with self.backend:
+            # Monitor credits in the background on the shared client (only the OpenRouter backend spends credits)
+            budget_monitor_task = None
+            if isinstance(self.backend, OpenRouterBackend):
+                self.budget_monitor = BudgetMonitor(
+                    self.backend.client, OPEN_ROUTER_API_CREDITS_URL, self.backend.headers)
+                await self.budget_monitor.poll()
+                budget_monitor_task = asyncio.create_task(
+                    self.budget_monitor.run())
+
+            # Export telemetry in the background (every shard to its own snapshots file and port)
+            self.register_gauges()
+            telemetry_file_path = config_framework.DOCUMENT_GENERATION_TELEMETRY
+            telemetry_port = config_framework.TELEMETRY_PROMETHEUS_PORT
+            if self.shard is not None:
+                if telemetry_file_path is not None:
+                    telemetry_file_path = get_shard_file_path(
+                        telemetry_file_path, *self.shard)
+                if telemetry_port is not None:
+                    telemetry_port += self.shard[0]
+
+            try:
+                with TelemetryExporter(telemetry_file_path, telemetry_port) as telemetry_exporter:
+                    telemetry_task = asyncio.create_task(
+                        telemetry_exporter.run())
+                    try:
+                        async with asyncio.TaskGroup() as task_group:
+                            task_group.create_task(self.read_work_items())
+                            for _ in range(self.number_of_workers):
+                                task_group.create_task(
+                                    self.process_work_items())
+                            task_group.create_task(self.write_documents())
+                    finally:
+                        telemetry_task.cancel()
+            finally:
+                self.telemetry.unregister_gauges()
+                if budget_monitor_task is not None:
+                    budget_monitor_task.cancel()
+
+            # Show remaining number of credits on API key
+            if self.budget_monitor is not None:
+                await self.budget_monitor.poll()
+                print(self.budget_monitor.summary())
+
+        if self.budget_exhausted is not None:
+            print(
+                f"{'\033[31m'}{self.budget_exhausted} {self.number_of_skipped_documents} document(s) were not generated.{'\033[0m'}")
+
+
+def report_document_generation_costs(cost_ledger: CostLedger) -> None:
+    """
+    Stores and shows the token usage and cost of a document generation run.
+
+    Parameters:
+        cost_ledger (CostLedger): The ledger of the run.
+    """
 
-    return filtered_dictionary
+    cost_ledger.write(config_framework.DOCUMENT_GENERATION_COSTS)
+    total = cost_ledger.total()
+    print(
+        f"{'\033[32m'}Cost of this run: {total["cost"]:.4f} USD for {total["requests"]} documents ({total["cached"]} from the response cache, {total["prompt_tokens"]} prompt and {total["completion_tokens"]} completion tokens), see {config_framework.DOCUMENT_GENERATION_COSTS}{'\033[0m'}")
 
 
-async def generate_document_file(system: list[str], seeds_file_path: str, documents_file_path: str, blank_seeds_file_path: str, number_of_text_types: int, domain_to_text_types_to_number_of_seeds_and_documents: dict[str, dict[str, tuple[int, int]]], probabilities: dict[str, float]) -> None:
+async def generate_document_file(system: list[str], blank_seeds_file_path: str, documents_file_path: str, number_of_text_types: int, domain_to_text_types_to_number_of_seeds_and_documents: dict[str, dict[str, tuple[int, int]]]) -> int:
     """
-    Create a .jsonl file containing the LLM-based generations of documents based on the previously generated seeds.
+    Create a .jsonl file containing the LLM-based generations of documents based on the previously generated blank seeds. Work items whose requests fail permanently are written to the dead letters file instead of the documents file, and the generation stops before exceeding the maximum cost.
 
     Parameters:
         system (list[str]): The system prompts which should be used.
-        seeds_file_path (str): The path to the seeds file.
+        blank_seeds_file_path (str): The path to the blank seeds file.
         documents_file_path (str): The path to the documents file.
+        number_of_text_types (int): The number of text types.
+        domain_to_text_types_to_number_of_seeds_and_documents (dict[str, dict[str, tuple[int, int]]]): A dictionary mapping domain to text types and text types to number of seeds and number of documents per seed of that text type.
+
+    Returns:
+        int: The number of documents which could not be generated (dead letters and documents skipped because the budget is exhausted).
+    """
+
+    # Run pipeline with the configured backend (reusing the documents of previous runs with any number of shards)
+    pipeline = DocumentGenerationPipeline(create_document_generation_backend(config_framework.DOCUMENT_GENERATION_BACKEND), system, blank_seeds_file_path, documents_file_path, config_framework.DEAD_LETTERS,
+                                          number_of_text_types, domain_to_text_types_to_number_of_seeds_and_documents, previous_documents_file_paths=list_previous_documents_file_paths(documents_file_path))
+    await pipeline.run()
+    report_document_generation_costs(pipeline.cost_ledger)
+
+    number_of_missing_documents = pipeline.number_of_dead_letters + \
+        pipeline.number_of_skipped_documents
+    if number_of_missing_documents == 0:
+        remove_intermediate_files(blank_seeds_file_path, documents_file_path)
+
+    return number_of_missing_documents
+
+
+def remove_intermediate_files(blank_seeds_file_path: str, documents_file_path: str) -> None:
+    """
+    Removes the files of the shards (for any number of shards) and the set aside documents once all documents are generated (otherwise they are resumed by the next run).
+
+    Parameters:
         blank_seeds_file_path (str): The path to the blank seeds file.
+        documents_file_path (str): The path to the documents file.
+    """
+
+    for file_path in (blank_seeds_file_path, documents_file_path, config_framework.DEAD_LETTERS):
+        for shard_file_path in list_shard_file_paths(file_path):
+            os.remove(shard_file_path)
+    if os.path.exists(get_set_aside_file_path(documents_file_path)):
+        os.remove(get_set_aside_file_path(documents_file_path))
+
+
+def generate_document_shard(shard_index: int, number_of_shards: int, api_key: str, system: list[str], blank_seeds_file_path: str, documents_file_path: str, dead_letters_file_path: str, number_of_text_types: int, domain_to_text_types_to_number_of_seeds_and_documents: dict[str, dict[str, tuple[int, int]]], previous_documents_file_paths: list[str]) -> tuple[int, dict]:
+    """
+    Generates the documents of a shard in a worker process (with its own event loop and backend), resuming the shard files of a previous run and reusing the documents of the shard written by previous runs with another number of shards (or without sharding).
+
+    Parameters:
+        shard_index (int): The index of the shard.
+        number_of_shards (int): The number of shards.
+        api_key (str): The API key of the shard.
+        system (list[str]): The system prompts of the blank seeds of the shard.
+        blank_seeds_file_path (str): The path to the blank seeds file of the shard.
+        documents_file_path (str): The path to the documents file of the shard.
+        dead_letters_file_path (str): The path to the dead letters file of the shard.
         number_of_text_types (int): The number of text types.
+        domain_to_text_types_to_number_of_seeds_and_documents (dict[str, dict[str, tuple[int, int]]]): A dictionary mapping domain to text types and text types to number of seeds (of the shard) and number of documents per seed of that text type.
+        previous_documents_file_paths (list[str]): The documents files of previous runs.
+
+    Returns:
+        tuple[int, dict]: The number of documents which could not be generated and the entries of the cost ledger of the shard.
+    """
+
+    pipeline = DocumentGenerationPipeline(create_document_generation_backend(config_framework.DOCUMENT_GENERATION_BACKEND, api_key), system, blank_seeds_file_path, documents_file_path,
+                                          dead_letters_file_path, number_of_text_types, domain_to_text_types_to_number_of_seeds_and_documents, (shard_index, number_of_shards), previous_documents_file_paths)
+    asyncio.run(pipeline.run())
+
+    return pipeline.number_of_dead_letters + pipeline.number_of_skipped_documents, pipeline.cost_ledger.costs
+
+
+def partition_blank_seeds(system: list[str], blank_seeds_file_path: str, number_of_shards: int, domain_to_text_types_to_number_of_seeds_and_documents: dict[str, dict[str, tuple[int, int]]]) -> tuple[list[list[str]], list[dict]]:
+    """
+    Splits the blank seeds by seed index into the blank seeds files of the shards, such that all documents of a seed belong to the same shard.
+
+    Parameters:
+        system (list[str]): The system prompts which should be used.
+        blank_seeds_file_path (str): The path to the blank seeds file.
+        number_of_shards (int): The number of shards.
         domain_to_text_types_to_number_of_seeds_and_documents (dict[str, dict[str, tuple[int, int]]]): A dictionary mapping domain to text types and text types to number of seeds and number of documents per seed of that text type.
-        probabilities (dict[str, float]): A dictionary mapping the attribute names to their respective probability of being included.
+
+    Returns:
+        tuple[list[list[str]], list[dict]]: The system prompts and the number of seeds and documents per text type (as domain_to_text_types_to_number_of_seeds_and_documents) of every shard.
     """
 
-    # Semaphore to control number of concurrent API requests
-    semaphore = asyncio.Semaphore(
-        config_framework.MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS)
+    # Storage for system prompts and number of documents per text type of every shard
+    shard_systems = [[] for _ in range(number_of_shards)]
+    shard_numbers_of_documents = [{} for _ in range(number_of_shards)]
 
-    # Read seed from .jsol file, blank seed, prompt model, write response to .jsonl file
-    idx = 0
-    async with httpx.AsyncClient() as client:
-        with open(seeds_file_path, "r", encoding='utf-8') as seeds, open(documents_file_path, "w", encoding='utf-8', buffering=1) as documents, open(blank_seeds_file_path, "w", encoding='utf-8', buffering=1) as blank_seeds:
-            # Load first seed
-            seed = seeds.readline()
-            if seed != "":
-                seed = json.loads(seed)
-            else:
-                return
+    shard_blank_seeds = [open(get_shard_file_path(blank_seeds_file_path, shard_index, number_of_shards),
+                              "w", encoding='utf-8') for shard_index in range(number_of_shards)]
+    try:
+        with open(blank_seeds_file_path, "r", encoding='utf-8') as blank_seeds:
+            for idx, blank_seed in enumerate(blank_seeds):
+                loaded_blank_seed = json.loads(blank_seed)
+                shard_index = compute_document_order_key(
+                    loaded_blank_seed["document_id"])[0] % number_of_shards
+
+                shard_blank_seeds[shard_index].write(blank_seed)
+                shard_systems[shard_index].append(system[idx])
+                key = (loaded_blank_seed["domain"],
+                       loaded_blank_seed["text_type"])
+                shard_numbers_of_documents[shard_index][key] = shard_numbers_of_documents[shard_index].get(
+                    key, 0) + 1
+    finally:
+        for shard_blank_seeds_file in shard_blank_seeds:
+            shard_blank_seeds_file.close()
+
+    # Number of seeds of every text type in every shard
+    shard_mappings = [{domain: {texttype: (numbers_of_documents.get((domain, texttype), 0) // number_of_documents, number_of_documents) for texttype, (_, number_of_documents) in text_types.items()}
+                       for domain, text_types in domain_to_text_types_to_number_of_seeds_and_documents.items()} for numbers_of_documents in shard_numbers_of_documents]
+
+    return shard_systems, shard_mappings
+
+
+def merge_shard_files(file_path: str, number_of_shards: int) -> None:
+    """
+    Merges the files of the shards (documents or dead letters) into one file in the order of the blank seeds. Each shard file is already in this order, so the merge is deterministic and streams through the files.
 
-            # Go through all text types in order
-            outer_progress_bar = tqdm(
-                total=number_of_text_types, desc=f"{'\033[34m'}Processing text types...{'\033[0m'}", position=0)
-            while True:
-                for texttype in domain_to_text_types_to_number_of_seeds_and_documents[seed["domain"]]:
-                    middle_progess_bar = tqdm(
-                        total=domain_to_text_types_to_number_of_seeds_and_documents[seed["domain"]][texttype][0], desc=f"{'\033[34m'}Processing seeds of text type...{'\033[0m'}", leave=False, position=1)
-
-                    # Go through all seeds belonging to that text type
-                    for _ in range(domain_to_text_types_to_number_of_seeds_and_documents[seed["domain"]][texttype][0]):
-                        inner_progess_bar = tqdm(
-                            total=domain_to_text_types_to_number_of_seeds_and_documents[seed["domain"]][texttype][1], desc=f"{'\033[34m'}Generating documents for current seed...{'\033[0m'}", leave=False, position=2)
-
-                        # Go through all documents that should be generated for that text type and that seed
-                        tasks_scheduled = []
-                        for _ in range(domain_to_text_types_to_number_of_seeds_and_documents[seed["domain"]][texttype][1]):
-                            # Fetch attributes which can be included in text type
-                            allowed_attributes = set(system[idx][1].split(","))
-
-                            # Filter seed based on attributes which should be included in seed
-                            if allowed_attributes == {"all"}:
-                                # Do nothing since all attributes should be used
-                                seed_modified = copy.deepcopy(seed)
-                            elif allowed_attributes and "all" not in allowed_attributes:
-                                # Filter out attributes which do not belong to text type
-                                allowed_attributes.add("domain")
-                                seed_modified = filter_dictionary_keys(
-                                    copy.deepcopy(seed), allowed_attributes)
-                            else:
-                                print(
-                                    "WARNING: Please specify either \"all\" OR list the attributes you wish to occurr in the text type!")
-                                sys.exit("FRAMEWORK EXECUTION ABORTED")
-
-                            # Deleted fields probabilistically according to specified frequency of attribute
-                            seed_modified = delete_seed_fields_probabilistically(
-                                seed_modified, probabilities)
-
-                            # Post process blanked seed to remove empty entity clauses
-                            seed_modified = {key: value for key, value in seed_modified.items() if not (
-                                isinstance(value, list) and value == [{}])}
-
-                            # Add information about text type to seed
-                            seed_modified["text_type"] = texttype
-
-                            blank_seeds.write(json.dumps(seed_modified) + "\n")
-
-                            task_for_scheduling = get_model_response(system[idx][0],
-                                                                     json.dumps(seed_modified), client, semaphore)
-
-                            tasks_scheduled.append(task_for_scheduling)
-
-                            idx += 1
-
-                        # Await responses/coroutines of concurrent API requests
-                        for coroutine in asyncio.as_completed(tasks_scheduled):
-                            model_response = await coroutine
-                            documents.write(json.dumps(
-                                {"document": model_response}) + "\n")
-                            documents.flush()
-                            inner_progess_bar.update(1)
-
-                        # Load next seed
-                        seed = seeds.readline()
-                        if seed != "":
-                            seed = json.loads(seed)
-                        else:
-                            outer_progress_bar.update(1)
-                            inner_progess_bar.close()
-                            middle_progess_bar.close()
-                            outer_progress_bar.close()
+    Parameters:
+        file_path (str): The path to the merged file.
+        number_of_shards (int): The number of shards.
+    """
+
+    # Open shard files (missing if a shard never started)
+    shard_files = [open(get_shard_file_path(file_path, shard_index, number_of_shards), "r", encoding='utf-8') for shard_index in range(
+        number_of_shards) if os.path.exists(get_shard_file_path(file_path, shard_index, number_of_shards))]
+    try:
+        with open(file_path, "w", encoding='utf-8') as merged_file:
+            merged_file.writelines(heapq.merge(
+                *shard_files, key=lambda line: compute_document_order_key(json.loads(line)["document_id"])))
+    finally:
+        for shard_file in shard_files:
+            shard_file.close()
 
-                            # Show remaining number of credits on API key
-                            print(get_credits_of_API_key())
-                            return
 
-                        inner_progess_bar.close()
-                        middle_progess_bar.update(1)
+def generate_sharded_document_file(system: list[str], blank_seeds_file_path: str, documents_file_path: str, number_of_text_types: int, domain_to_text_types_to_number_of_seeds_and_documents: dict[str, dict[str, tuple[int, int]]], number_of_shards: int) -> int:
+    """
+    Create a .jsonl file containing the LLM-based generations of documents like generate_document_file, but split by seed index into shards which run in separate processes, each with its own event loop and backend (and its own API key from OPENROUTER_API_KEYS, assigned round robin). Every shard writes its own documents and dead letters files (which are resumed by the next run), which are merged in the order of the blank seeds afterwards. Documents written by previous runs with another number of shards (or without sharding) are reused by the shards they belong to.
 
-                        # Show remaining number of credits on API key
-                        tqdm.write(
-                            f"Credits after last seed: {get_credits_of_API_key()}")
+    Parameters:
+        system (list[str]): The system prompts which should be used.
+        blank_seeds_file_path (str): The path to the blank seeds file.
+        documents_file_path (str): The path to the documents file.
+        number_of_text_types (int): The number of text types.
+        domain_to_text_types_to_number_of_seeds_and_documents (dict[str, dict[str, tuple[int, int]]]): A dictionary mapping domain to text types and text types to number of seeds and number of documents per seed of that text type.
+        number_of_shards (int): The number of shards.
+
+    Returns:
+        int: The number of documents which could not be generated (dead letters and documents skipped because the budget is exhausted).
+    """
 
-                    middle_progess_bar.close()
-                    outer_progress_bar.update(1)
+    shard_systems, shard_mappings = partition_blank_seeds(
+        system, blank_seeds_file_path, number_of_shards, domain_to_text_types_to_number_of_seeds_and_documents)
+
+    # Documents files of previous runs without sharding or with another number of shards (every shard resumes its own files)
+    shard_documents_file_paths = {get_shard_file_path(
+        documents_file_path, shard_index, number_of_shards) for shard_index in range(number_of_shards)}
+    shard_documents_file_paths |= {get_set_aside_file_path(
+        file_path) for file_path in shard_documents_file_paths}
+    previous_documents_file_paths = [file_path for file_path in list_previous_documents_file_paths(
+        documents_file_path) if file_path not in shard_documents_file_paths]
+
+    # Generate shards in worker processes
+    with ProcessPoolExecutor(max_workers=number_of_shards, mp_context=multiprocessing.get_context("spawn")) as executor:
+        shards = [executor.submit(generate_document_shard, shard_index, number_of_shards, OPEN_ROUTER_API_KEYS[shard_index % len(OPEN_ROUTER_API_KEYS)], shard_systems[shard_index], get_shard_file_path(blank_seeds_file_path, shard_index, number_of_shards), get_shard_file_path(
+            documents_file_path, shard_index, number_of_shards), get_shard_file_path(config_framework.DEAD_LETTERS, shard_index, number_of_shards), number_of_text_types, shard_mappings[shard_index], previous_documents_file_paths) for shard_index in range(number_of_shards)]
+        results = [shard.result() for shard in shards]
+
+    # Merge documents, dead letters and cost ledgers of all shards
+    merge_shard_files(documents_file_path, number_of_shards)
+    merge_shard_files(config_framework.DEAD_LETTERS, number_of_shards)
+    cost_ledger = CostLedger()
+    for _, costs in results:
+        cost_ledger.merge(costs)
+    report_document_generation_costs(cost_ledger)
+
+    # Remove shard files once all documents are generated (otherwise they are resumed by the next run)
+    number_of_missing_documents = sum(
+        number_of_missing_shard_documents for number_of_missing_shard_documents, _ in results)
+    if number_of_missing_documents == 0:
+        remove_intermediate_files(blank_seeds_file_path, documents_file_path)
+
+    return number_of_missing_documents
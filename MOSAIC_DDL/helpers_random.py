@@ -0,0 +1,249 @@
+"""
+helpers_random.py
+
+This module contains the derivation of independent random number streams from a single master seed of MOSAIC_DDL, and the claims of the unique instances the sampling procedures draw (such that seeds generated in parallel never share an instance).
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from errors import InstanceClaimDeferredError
+import numpy as np
+import hashlib
+import random
+
+# Size of the bitmap of the claims (log2 of the minimum number of bits and minimum number of bits per claim)
+CLAIMS_BITMAP_MINIMUM_BITS_LOG2 = 16
+CLAIMS_BITMAP_BITS_PER_CLAIM = 32
+
+
+def derive_seed(master_seed: int, *keys: object) -> int:
+    """
+    Derives a 64-bit seed from the master seed and a sequence of keys. The derivation is stable across processes and python versions, so the same keys always yield the same stream.
+
+    Parameters:
+        master_seed (int): The master seed.
+        *keys (object): The keys identifying the stream (e.g. stage, domain, text type and index).
+
+    Returns:
+        int: The derived seed.
+    """
+
+    digest = hashlib.blake2b(repr((master_seed,) + keys).encode(
+        'utf-8'), digest_size=8).digest()
+
+    return int.from_bytes(digest, "big")
+
+
+def seed_random_generators(seed: int) -> np.random.Generator:
+    """
+    Seeds the global random number generators of random and numpy (which are used by the sampling procedures) and returns a fresh numpy generator for the same stream.
+
+    Parameters:
+        seed (int): The seed.
+
+    Returns:
+        np.random.Generator: A numpy generator seeded with the same seed.
+    """
+
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+
+    return np.random.default_rng(seed)
+
+
+class InstanceClaims:
+    def __init__(self, snapshot: tuple[int, np.ndarray] = None) -> None:
+        """
+        Creates the claims of unique instances (e.g. humans which may occur in at most one seed). Without a snapshot, the claims are authoritative: they are made in the main process in the order of the work items. With a snapshot (the bitmap of the authoritative claims when a chunk was submitted), the claims are tentative: they are made in a worker process and journaled per work item, such that the main process can verify them in the order of the work items (see commit).
+
+        Parameters:
+            snapshot (tuple[int, np.ndarray]): The number of bits (log2) and the bitmap of the authoritative claims, or None for authoritative claims.
+        """
+
+        self.authoritative = snapshot is None
+
+        # Claimed instance ids per pool (authoritative claims or tentative claims of the current chunk)
+        self.claimed = {}
+
+        # Masks of the claimed instance ids per pool (authoritative claims, created by select_unclaimed)
+        self.masks = {}
+
+        # Claim attempts of the current work item as (pool key, instance id, claimed) (tentative claims)
+        self.journal = []
+
+        # Stable hashes of the pool keys
+        self.pool_key_hashes = {}
+
+        # Bitmap of the claims, in which every claim sets the bit of its hash (false positives only cause a tentative claim to be rejected)
+        if snapshot is None:
+            self.number_of_bits_log2, self.bitmap = CLAIMS_BITMAP_MINIMUM_BITS_LOG2, np.zeros(
+                2**CLAIMS_BITMAP_MINIMUM_BITS_LOG2 // 8, dtype=np.uint8)
+        else:
+            self.number_of_bits_log2, self.bitmap = snapshot
+
+    def hash_claims(self, pool_key: str, instance_ids: np.ndarray) -> np.ndarray:
+        """
+        Computes the bits of claims in the bitmap (fibonacci hashing of the instance ids offset by a stable hash of the pool key).
+
+        Parameters:
+            pool_key (str): The key of the pool.
+            instance_ids (np.ndarray): The ids of the instances.
+
+        Returns:
+            np.ndarray: The bits of the claims.
+        """
+
+        if pool_key not in self.pool_key_hashes:
+            self.pool_key_hashes[pool_key] = np.uint64(
+                derive_seed(0, pool_key))
+
+        with np.errstate(over="ignore"):
+            return ((self.pool_key_hashes[pool_key] + instance_ids.astype(np.uint64)) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(64 - self.number_of_bits_log2)
+
+    def set_bits(self, pool_key: str, instance_ids: np.ndarray) -> None:
+        """
+        Sets the bits of authoritative claims in the bitmap, growing the bitmap (to at least CLAIMS_BITMAP_BITS_PER_CLAIM bits per claim) beforehand if needed.
+
+        Parameters:
+            pool_key (str): The key of the pool.
+            instance_ids (np.ndarray): The ids of the claimed instances.
+        """
+
+        # Grow bitmap and set the bits of all claims again
+        number_of_claims = sum(len(instance_ids)
+                               for instance_ids in self.claimed.values())
+        if number_of_claims * CLAIMS_BITMAP_BITS_PER_CLAIM > 2**self.number_of_bits_log2:
+            while number_of_claims * CLAIMS_BITMAP_BITS_PER_CLAIM > 2**self.number_of_bits_log2:
+                self.number_of_bits_log2 += 1
+            self.bitmap = np.zeros(
+                2**self.number_of_bits_log2 // 8, dtype=np.uint8)
+            for claimed_pool_key, claimed_instance_ids in self.claimed.items():
+                self.set_bits(claimed_pool_key, np.fromiter(
+                    claimed_instance_ids, dtype=np.int64, count=len(claimed_instance_ids)))
+            return
+
+        bits = self.hash_claims(pool_key, instance_ids)
+        np.bitwise_or.at(self.bitmap, bits >> np.uint64(3), np.left_shift(
+            1, (bits & np.uint64(7)).astype(np.uint8)).astype(np.uint8))
+
+    def claim(self, pool_key: str, instance_id: int) -> bool:
+        """
+        Claims an instance of a pool if it is not claimed yet.
+
+        Parameters:
+            pool_key (str): The key of the pool (e.g. the path of the instances file).
+            instance_id (int): The id of the instance.
+
+        Returns:
+            bool: Whether the instance was claimed (False if it was already claimed).
+        """
+
+        claimed = self.claimed.setdefault(pool_key, set())
+
+        if self.authoritative:
+            if instance_id in claimed:
+                return False
+
+            claimed.add(instance_id)
+            if pool_key in self.masks:
+                self.masks[pool_key][instance_id] = True
+            self.set_bits(pool_key, np.array([instance_id]))
+
+            return True
+
+        # Tentative claims are rejected if the instance was claimed within the chunk or by the main process before the chunk was submitted
+        bit = int(self.hash_claims(pool_key, np.array([instance_id]))[0])
+        is_free = instance_id not in claimed and not self.bitmap[bit >> 3] & (
+            1 << (bit & 7))
+        self.journal.append((pool_key, instance_id, is_free))
+        if is_free:
+            claimed.add(instance_id)
+
+        return is_free
+
+    def select_unclaimed(self, pool_key: str, instance_ids: np.ndarray, pool_size: int) -> np.ndarray:
+        """
+        Selects the instances which are not claimed yet. Only the authoritative claims know all claims, so a work item of a worker process which needs them is deferred to the main process.
+
+        Parameters:
+            pool_key (str): The key of the pool.
+            instance_ids (np.ndarray): The ids of the instances to select from.
+            pool_size (int): The number of instances in the pool.
+
+        Returns:
+            np.ndarray: The ids of the unclaimed instances.
+        """
+
+        if not self.authoritative:
+            raise InstanceClaimDeferredError(pool_key)
+
+        # Create mask of the claimed instances on first use
+        if pool_key not in self.masks:
+            self.masks[pool_key] = np.zeros(pool_size, dtype=bool)
+            self.masks[pool_key][list(self.claimed.get(pool_key, ()))] = True
+
+        return instance_ids[~self.masks[pool_key][instance_ids]]
+
+    def commit(self, journal: list[tuple[str, int, bool]]) -> bool:
+        """
+        Verifies the tentative claims of a work item against the authoritative claims (made by all previous work items) and makes them if every claim attempt would have had the same outcome, in which case the work item is exactly what the main process would have generated.
+
+        Parameters:
+            journal (list[tuple[str, int, bool]]): The claim attempts of the work item as (pool key, instance id, claimed).
+
+        Returns:
+            bool: Whether the claims were made (otherwise the work item has to be generated again by the main process).
+        """
+
+        # Replay claim attempts
+        claims_of_work_item = set()
+        for pool_key, instance_id, is_free in journal:
+            if is_free != (instance_id not in self.claimed.get(pool_key, ()) and (pool_key, instance_id) not in claims_of_work_item):
+                return False
+            if is_free:
+                claims_of_work_item.add((pool_key, instance_id))
+
+        for pool_key, instance_id in claims_of_work_item:
+            self.claim(pool_key, instance_id)
+
+        return True
+
+    def snapshot(self) -> tuple[int, np.ndarray]:
+        """
+        Returns a copy of the bitmap of the authoritative claims, which is sent along with a chunk such that the worker rejects instances claimed before the chunk was submitted.
+
+        Returns:
+            tuple[int, np.ndarray]: The number of bits (log2) and the bitmap.
+        """
+
+        return self.number_of_bits_log2, self.bitmap.copy()
+
+
+# Claims of unique instances of the current seed generation (authoritative in the main process, tentative per chunk in the worker processes)
+instance_claims = InstanceClaims()
+
+
+def get_instance_claims() -> InstanceClaims:
+    """
+    Returns the claims of unique instances of the current seed generation.
+
+    Returns:
+        InstanceClaims: The claims.
+    """
+
+    return instance_claims
+
+
+def set_instance_claims(claims: InstanceClaims) -> None:
+    """
+    Replaces the claims of unique instances (with fresh claims at the start of a seed generation or with tentative claims at the start of a chunk).
+
+    Parameters:
+        claims (InstanceClaims): The claims.
+    """
+
+    global instance_claims
+
+    instance_claims = claims
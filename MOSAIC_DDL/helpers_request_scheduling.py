@@ -0,0 +1,150 @@
+"""
+helpers_request_scheduling.py
+
+This module contains the scheduling of the API requests of the document generation: an adaptive (AIMD) limit on the number of requests in flight and the backoff between retries of failed requests.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from email.utils import parsedate_to_datetime
+import datetime
+import asyncio
+import random
+import time
+
+# Status codes of responses which are worth retrying and status codes which signal that the provider is overloaded
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 520, 522, 524, 529}
+THROTTLING_STATUS_CODES = {429, 503, 529}
+
+# Status codes of responses rejecting the request itself (which fail the same way whenever the request is repeated)
+INVALID_REQUEST_STATUS_CODES = {400, 404, 413, 422}
+
+# Random number generator for the backoff jitter (kept separate such that retries do not shift the seeded random number streams)
+jitter_random = random.Random()
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, minimum_limit: int, maximum_limit: int) -> None:
+        """
+        Initializes the limiter, which admits up to maximum_limit requests in flight at first.
+
+        Parameters:
+            minimum_limit (int): The lowest the limit is decreased to.
+            maximum_limit (int): The highest the limit is increased to.
+        """
+        self.minimum_limit = minimum_limit
+        self.maximum_limit = maximum_limit
+        self.limit = float(maximum_limit)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """
+        Waits until a request may be sent: no pause requested by the provider is active and fewer requests than the current limit are in flight.
+
+        Returns:
+            float: The time at which the request was admitted (to be passed to release).
+        """
+
+        async with self.condition:
+            while True:
+                # Wait for pause requested through Retry-After to pass
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    try:
+                        await asyncio.wait_for(self.condition.wait(), pause)
+                    except TimeoutError:
+                        pass
+                    continue
+
+                if self.in_flight < int(self.limit):
+                    break
+
+                await self.condition.wait()
+
+            self.in_flight += 1
+
+        return time.monotonic()
+
+    async def release(self, admitted_at: float, throttled: bool) -> None:
+        """
+        Marks a request as finished and adapts the limit: additive increase (by one per limit requests) after a successful request, multiplicative decrease (halving) after the provider throttled a request.
+
+        Parameters:
+            admitted_at (float): The time at which the request was admitted.
+            throttled (bool): Whether the provider signalled overload (rate limit, overloaded or timed out).
+        """
+
+        async with self.condition:
+            self.in_flight -= 1
+
+            if throttled:
+                # Decrease at most once per round trip (requests admitted before the last decrease saw the old limit)
+                if admitted_at >= self.last_decrease:
+                    self.limit = max(self.minimum_limit, self.limit / 2)
+                    self.last_decrease = time.monotonic()
+            else:
+                self.limit = min(self.maximum_limit,
+                                 self.limit + 1 / self.limit)
+
+            self.condition.notify_all()
+
+    async def pause(self, seconds: float) -> None:
+        """
+        Holds back all requests for the given time (e.g. as requested by a Retry-After header).
+
+        Parameters:
+            seconds (float): The duration of the pause.
+        """
+
+        async with self.condition:
+            self.paused_until = max(
+                self.paused_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(value: str) -> float:
+    """
+    Parses the value of a Retry-After header, which is either a number of seconds or a http date.
+
+    Parameters:
+        value (str): The value of the header.
+
+    Returns:
+        float: The number of seconds to wait (or None if the value cannot be parsed).
+    """
+
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_backoff(attempt: int, base: float, maximum: float, retry_after: float = None) -> float:
+    """
+    Computes the time to wait before the next attempt of a request: exponential backoff with full jitter, but never less than the time requested by the provider.
+
+    Parameters:
+        attempt (int): The number of the failed attempt (starting at 0).
+        base (float): The backoff after the first failed attempt (in seconds).
+        maximum (float): The maximum backoff (in seconds).
+        retry_after (float): The time requested by the provider (in seconds, if any).
+
+    Returns:
+        float: The time to wait (in seconds).
+    """
+
+    backoff = jitter_random.uniform(0, min(maximum, base * 2 ** attempt))
+
+    return max(backoff, retry_after) if retry_after is not None else backoff
@@ -0,0 +1,227 @@
+"""
+helpers_response_cache.py
+
+This module contains the on-disk cache of the model responses of the document generation, keyed by the hash of the request (model, messages and sampling parameters), such that requests which did not change since a previous run are answered without being sent (and billed) again.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import sqlite3
+import asyncio
+import json
+import time
+
+# Number of cache hits whose last accesses are written together, and number of insertions after which the total size of the cache is read from the database again
+LAST_ACCESS_BATCH_SIZE = 64
+SIZE_REFRESH_INTERVAL = 100
+
+
+def compute_cache_key(request: dict) -> str:
+    """
+    Computes the key of a request: the hash of its canonical json representation.
+
+    Parameters:
+        request (dict): The body of the request (model, messages and sampling parameters).
+
+    Returns:
+        str: The key.
+    """
+
+    return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, file_path: str, maximum_size: int, read: bool = True, write: bool = True) -> None:
+        """
+        Opens (or creates) the cache. All accesses of the database run in a single background thread (which owns the connection), such that waiting for the database (e.g. for the locks of other shards) never blocks the event loop.
+
+        Parameters:
+            file_path (str): The path to the SQLite database.
+            maximum_size (int): The maximum total size of the cached responses in bytes; the least recently used responses are evicted beyond it.
+            read (bool): Whether requests are answered from the cache.
+            write (bool): Whether new responses are added to the cache.
+        """
+        self.file_path = file_path
+        self.maximum_size = maximum_size
+        self.read = read
+        self.write = write
+        self.hits = 0
+        self.misses = 0
+
+        # Keys of cache hits whose last access is not yet written, and the number of insertions since the total size was last read from the database
+        self.accessed_keys = {}
+        self.number_of_insertions = 0
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="response_cache")
+        self.connection = None
+        self.executor.submit(self.open_connection).result()
+
+    def open_connection(self) -> None:
+        """
+        Opens the connection to the database in the background thread.
+        """
+
+        # Wait for the locks of other processes (shards of the document generation share the cache)
+        self.connection = sqlite3.connect(self.file_path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, usage TEXT, size INTEGER NOT NULL, last_access REAL NOT NULL)")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self.connection.commit()
+
+        self.size = self.read_size()
+
+    def read_size(self) -> int:
+        """
+        Reads the total size of the cached responses from the database (including the responses added by other processes).
+
+        Returns:
+            int: The total size in bytes.
+        """
+
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    async def get(self, key: str) -> tuple[str, dict]:
+        """
+        Returns the cached response of a request.
+
+        Parameters:
+            key (str): The key of the request.
+
+        Returns:
+            tuple[str, dict]: The response and its original token usage (or None if the request is not cached).
+        """
+
+        if not self.read:
+            return None
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.lookup, key)
+
+    def lookup(self, key: str) -> tuple[str, dict]:
+        """
+        Looks up the cached response of a request in the background thread.
+
+        Parameters:
+            key (str): The key of the request.
+
+        Returns:
+            tuple[str, dict]: The response and its original token usage (or None if the request is not cached).
+        """
+
+        try:
+            row = self.connection.execute(
+                "SELECT response, usage FROM responses WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError:
+            # Database stayed locked by other processes, the request is sent instead
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+
+        # Mark response as recently used (written together with other accesses)
+        self.accessed_keys[key] = time.time()
+        if len(self.accessed_keys) >= LAST_ACCESS_BATCH_SIZE:
+            self.write_last_accesses()
+            self.connection.commit()
+        self.hits += 1
+
+        return row[0], json.loads(row[1]) if row[1] is not None else None
+
+    def write_last_accesses(self) -> None:
+        """
+        Writes the last accesses of the cache hits since the last write (without committing).
+        """
+
+        if self.accessed_keys:
+            self.connection.executemany("UPDATE responses SET last_access = ? WHERE key = ?", [
+                                        (last_access, key) for key, last_access in self.accessed_keys.items()])
+            self.accessed_keys = {}
+
+    def put(self, key: str, response: str, usage: dict) -> None:
+        """
+        Adds the response of a request to the cache in the background (without waiting for the database).
+
+        Parameters:
+            key (str): The key of the request.
+            response (str): The response.
+            usage (dict): The token usage of the response.
+        """
+
+        if not self.write:
+            return
+
+        self.executor.submit(self.insert, key, response, usage)
+
+    def insert(self, key: str, response: str, usage: dict) -> None:
+        """
+        Adds the response of a request to the cache in the background thread, evicting the least recently used responses if the cache (shared by all shards) grows beyond its maximum size.
+
+        Parameters:
+            key (str): The key of the request.
+            response (str): The response.
+            usage (dict): The token usage of the response.
+        """
+
+        usage = json.dumps(usage) if usage is not None else None
+        size = len(response.encode('utf-8')) + len(usage or "")
+
+        try:
+            previous = self.connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.connection.execute("INSERT OR REPLACE INTO responses (key, response, usage, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                                    (key, response, usage, size, time.time()))
+            self.size += size - (previous[0] if previous is not None else 0)
+            self.number_of_insertions += 1
+
+            # Other processes add responses as well, so the total size is read from the database regularly and before evicting
+            if self.size > self.maximum_size or self.number_of_insertions >= SIZE_REFRESH_INTERVAL:
+                self.size = self.read_size()
+                self.number_of_insertions = 0
+
+            # Evict least recently used responses down to 90% of the maximum size (such that not every insertion evicts)
+            if self.size > self.maximum_size:
+                self.write_last_accesses()
+                evicted_keys = []
+                least_recently_used = self.connection.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access")
+                for evicted_key, evicted_size in least_recently_used:
+                    if self.size <= 0.9 * self.maximum_size:
+                        break
+                    evicted_keys.append((evicted_key,))
+                    self.size -= evicted_size
+                least_recently_used.close()
+                self.connection.executemany(
+                    "DELETE FROM responses WHERE key = ?", evicted_keys)
+
+            self.connection.commit()
+        except sqlite3.OperationalError:
+            # Database stayed locked by other processes, the response is not cached
+            self.connection.rollback()
+
+    def close(self) -> None:
+        """
+        Waits for the outstanding insertions and closes the cache.
+        """
+
+        self.executor.submit(self.close_connection).result()
+        self.executor.shutdown()
+
+    def close_connection(self) -> None:
+        """
+        Writes the outstanding last accesses and closes the connection in the background thread.
+        """
+
+        try:
+            self.write_last_accesses()
+            self.connection.commit()
+        except sqlite3.OperationalError:
+            # Database stayed locked by other processes, the last accesses are lost
+            pass
+        self.connection.close()
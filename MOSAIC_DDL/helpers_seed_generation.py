@@ -0,0 +1,105 @@
+"""
+helpers_seed_generation.py
+
+This module contains the parallelized seed generation of MOSAIC_DDL.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from helpers_random import InstanceClaims, derive_seed, seed_random_generators, set_instance_claims
+from errors import InstanceClaimDeferredError
+import numpy as np
+import contextlib
+import importlib
+import json
+import io
+import os
+
+# Generator of the current worker process (set by initialize_seed_worker)
+worker_generator = None
+
+
+def initialize_seed_worker(config_file: str, sampling_procedures_file_path: str) -> None:
+    """
+    Creates the generator of a worker process and registers the sampling procedures in it (once per worker, the worker generates many chunks).
+
+    Parameters:
+        config_file (str): The path to the xml configuration file.
+        sampling_procedures_file_path (str): The path to the module registering the sampling procedures (config_framework.SAMPLING_PROCEDURES of the main process).
+    """
+
+    global worker_generator
+
+    # Import here since the generator module imports this module
+    from generator import Generator
+
+    worker_generator = Generator(config_file)
+
+    # Register sampling procedures (suppress the output of the preparation procedures, which already ran in the main process)
+    sampling_procedures = importlib.import_module(os.path.splitext(
+        os.path.basename(sampling_procedures_file_path))[0])
+    with contextlib.redirect_stdout(io.StringIO()):
+        sampling_procedures.register_all_sampling_procedures(worker_generator)
+
+
+def generate_seed_line(generator, domain_id: str, texttype: str, index: int, master_seed: int) -> str:
+    """
+    Generates the seed of a single work item. Every work item gets its own random number stream derived from the master seed, so the seed only depends on the work item and the instances claimed by the previous work items.
+
+    Parameters:
+        generator (Generator): The generator holding the sampling procedures.
+        domain_id (str): The name (id) of the domain.
+        texttype (str): The text type of the seed.
+        index (int): The index of the seed within the text type.
+        master_seed (int): The master seed.
+
+    Returns:
+        str: The seed as json line.
+    """
+
+    # Seed random number generators for this work item
+    generator.numpy_random = seed_random_generators(
+        derive_seed(master_seed, "seeds", domain_id, texttype, index))
+
+    # Generate seed
+    seed = generator.generate_seed(
+        domain_id, generator.generate_seed_batch(domain_id, 1).occurrences(0))
+    seed["text_type"] = texttype
+
+    return json.dumps(seed) + "\n"
+
+
+def generate_seed_chunk(work_items: list[tuple[str, str, int]], master_seed: int, snapshot: tuple[int, np.ndarray]) -> list[tuple[str, list[tuple[str, int, bool]]]]:
+    """
+    Generates the seeds of a chunk of work items with tentative claims of unique instances (e.g. humans), which the main process verifies in the order of the work items (see helpers_random.InstanceClaims.commit).
+
+    Parameters:
+        work_items (list[tuple[str, str, int]]): The (domain, text type, index) work items of the chunk.
+        master_seed (int): The master seed.
+        snapshot (tuple[int, np.ndarray]): The bitmap of the claims the main process made before submitting the chunk.
+
+    Returns:
+        list[tuple[str, list[tuple[str, int, bool]]]]: The seeds of the chunk as json lines (None if a work item was deferred to the main process) and the claim attempts of each, in the order of the work items.
+    """
+
+    # Claim instances tentatively
+    instance_claims = InstanceClaims(snapshot)
+    set_instance_claims(instance_claims)
+
+    # Storage for seeds
+    seeds = []
+
+    for domain_id, texttype, index in work_items:
+        instance_claims.journal = []
+
+        try:
+            seed_line = generate_seed_line(
+                worker_generator, domain_id, texttype, index, master_seed)
+        except InstanceClaimDeferredError:
+            seed_line = None
+
+        seeds.append((seed_line, instance_claims.journal))
+
+    return seeds
@@ -0,0 +1,119 @@
+"""
+helpers_stage_manifest.py
+
+This module contains the bookkeeping which allows reruns of MOSAIC_DDL with the same master seed to skip stages whose inputs have not changed.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+import config_framework
+import hashlib
+import json
+import os
+
+
+def compute_file_hash(file_path: str) -> str:
+    """
+    Computes the sha256 hash of a file (or an empty string if it does not exist).
+
+    Parameters:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The hex digest of the file content.
+    """
+
+    if not os.path.exists(file_path):
+        return ""
+
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+def list_input_files(input_paths: list[str]) -> list[str]:
+    """
+    Expands the input paths of a stage into files: directories are replaced by all files below them (in a stable order, without caches of the interpreter).
+
+    Parameters:
+        input_paths (list[str]): The paths to the files and directories the stage reads.
+
+    Returns:
+        list[str]: The paths to the files.
+    """
+
+    # Storage for input files
+    input_files = []
+
+    for input_path in input_paths:
+        if not os.path.isdir(input_path):
+            input_files.append(input_path)
+            continue
+
+        for directory, subdirectories, file_names in os.walk(input_path):
+            subdirectories[:] = sorted(
+                subdirectory for subdirectory in subdirectories if subdirectory != "__pycache__")
+            input_files.extend(os.path.join(directory, file_name)
+                               for file_name in sorted(file_names) if not file_name.endswith(".pyc"))
+
+    return input_files
+
+
+def compute_stage_fingerprint(stage: str, input_files: list[str], parameters: dict) -> str:
+    """
+    Computes a fingerprint of everything a stage depends on: the master seed, the content of its input files and its parameters.
+
+    Parameters:
+        stage (str): The name of the stage.
+        input_files (list[str]): The paths to the files (or directories, whose files are all included) the stage reads.
+        parameters (dict): Further json serializable parameters influencing the output of the stage.
+
+    Returns:
+        str: The fingerprint of the stage.
+    """
+
+    input_files = list_input_files(input_files)
+    fingerprint = {"stage": stage, "master_seed": config_framework.MASTER_SEED, "input_files": {
+        file_path: compute_file_hash(file_path) for file_path in input_files}, "parameters": parameters}
+
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def stage_is_up_to_date(output_files: list[str], fingerprint: str) -> bool:
+    """
+    Checks whether the outputs of a stage were produced from inputs with the same fingerprint and have not been modified since.
+
+    Parameters:
+        output_files (list[str]): The paths to the files the stage writes; the manifest is stored next to the first one.
+        fingerprint (str): The fingerprint of the current inputs of the stage.
+
+    Returns:
+        bool: Whether the stage can be skipped.
+    """
+
+    if not config_framework.SKIP_UNCHANGED_STAGES or not os.path.exists(output_files[0] + ".manifest.json"):
+        return False
+
+    with open(output_files[0] + ".manifest.json", "r", encoding='utf-8') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    return manifest.get("fingerprint") == fingerprint and all(manifest.get("output_files", {}).get(file_path) == compute_file_hash(file_path) != "" for file_path in output_files)
+
+
+def write_stage_manifest(output_files: list[str], fingerprint: str) -> None:
+    """
+    Records the fingerprint of the inputs and the hashes of the outputs of a completed stage.
+
+    Parameters:
+        output_files (list[str]): The paths to the files the stage wrote; the manifest is stored next to the first one.
+        fingerprint (str): The fingerprint of the inputs of the stage.
+    """
+
+    with open(output_files[0] + ".manifest.json", "w", encoding='utf-8') as manifest_file:
+        json.dump({"fingerprint": fingerprint, "output_files": {
+                  file_path: compute_file_hash(file_path) for file_path in output_files}}, manifest_file, indent=4)
@@ -0,0 +1,347 @@
+"""
+helpers_telemetry.py
+
+This module contains the telemetry of the document generation of MOSAIC_DDL: request latencies, requests in flight, queue depths, token throughput, errors by class and the time spent in every step, exported as periodic .jsonl snapshots and (optionally) as Prometheus metrics served locally, such that settings like MAXIMUM_NUMBER_OF_CONCURRENT_REQUESTS can be tuned from data.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from contextlib import contextmanager
+from collections import deque
+from tqdm import tqdm
+import config_framework
+import threading
+import asyncio
+import json
+import time
+
+# Upper bounds (in seconds) of the buckets of the exported latency histograms
+PROMETHEUS_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                      10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class LatencyHistogram:
+    def __init__(self, window: int) -> None:
+        """
+        Initializes the histogram, which counts all latencies in fixed buckets and keeps the most recent ones for the percentiles.
+
+        Parameters:
+            window (int): The number of most recent latencies the percentiles are computed from.
+        """
+        self.count = 0
+        self.sum = 0.0
+        self.bucket_counts = [0] * len(PROMETHEUS_BUCKETS)
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        """
+        Adds a latency.
+
+        Parameters:
+            seconds (float): The latency.
+        """
+
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+        for idx, bound in enumerate(PROMETHEUS_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[idx] += 1
+                break
+
+    def summary(self) -> dict:
+        """
+        Returns the percentiles of the most recent latencies and the mean of all latencies.
+
+        Returns:
+            dict: The 50th, 95th and 99th percentile and the mean (None while no latency was observed).
+        """
+
+        recent = sorted(self.recent)
+        if not recent:
+            return {"p50": None, "p95": None, "p99": None, "mean": None}
+
+        return {"p50": recent[int(0.50 * (len(recent) - 1))], "p95": recent[int(0.95 * (len(recent) - 1))], "p99": recent[int(0.99 * (len(recent) - 1))], "mean": self.sum / self.count}
+
+
+class Telemetry:
+    def __init__(self) -> None:
+        """
+        Initializes the telemetry. All methods may be called from the event loop and read from the thread serving the Prometheus endpoint.
+        """
+        self.lock = threading.Lock()
+        self.started_at = time.monotonic()
+
+        # Counters (requests, documents, tokens, ...), errors by class, latency histograms and time spent per step (summed over all tasks)
+        self.counters = {}
+        self.errors = {}
+        self.histograms = {}
+        self.times = {}
+
+        # Functions returning the current value of a gauge (e.g. the depth of a queue)
+        self.gauges = {}
+
+        # Counters of the previous snapshot (for the rates since then)
+        self.previous_snapshot_at = self.started_at
+        self.previous_counters = {}
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """
+        Increments a counter.
+
+        Parameters:
+            name (str): The name of the counter.
+            amount (int): The amount to add.
+        """
+
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_error(self, error_class: str) -> None:
+        """
+        Counts an error (e.g. of an attempt of a request).
+
+        Parameters:
+            error_class (str): The class of the error (e.g. "rate_limited", "timeout" or "server_error").
+        """
+
+        with self.lock:
+            self.errors[error_class] = self.errors.get(error_class, 0) + 1
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Adds a latency to a histogram.
+
+        Parameters:
+            name (str): The name of the histogram.
+            seconds (float): The latency.
+        """
+
+        with self.lock:
+            if name not in self.histograms:
+                self.histograms[name] = LatencyHistogram(
+                    config_framework.TELEMETRY_LATENCY_WINDOW)
+            self.histograms[name].observe(seconds)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Adds time spent in a step.
+
+        Parameters:
+            name (str): The name of the step.
+            seconds (float): The time spent.
+        """
+
+        with self.lock:
+            self.times[name] = self.times.get(name, 0.0) + seconds
+
+    @contextmanager
+    def time(self, name: str):
+        """
+        Measures the time spent in a step (also around awaits, in which case it is the time the task spent waiting).
+
+        Parameters:
+            name (str): The name of the step.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def register_gauge(self, name: str, function) -> None:
+        """
+        Registers a gauge whose value is read whenever a snapshot is taken.
+
+        Parameters:
+            name (str): The name of the gauge.
+            function (Callable[[], float]): The function returning the current value.
+        """
+
+        with self.lock:
+            self.gauges[name] = function
+
+    def unregister_gauges(self) -> None:
+        """
+        Removes all gauges (e.g. once the queues they read do not exist anymore).
+        """
+
+        with self.lock:
+            self.gauges = {}
+
+    def snapshot(self) -> dict:
+        """
+        Takes a snapshot of all metrics, including the rates since the previous snapshot.
+
+        Returns:
+            dict: The snapshot.
+        """
+
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.started_at
+            interval = max(now - self.previous_snapshot_at, 1e-9)
+
+            def rate(name: str) -> float:
+                return (self.counters.get(name, 0) - self.previous_counters.get(name, 0)) / interval
+
+            tokens = self.counters.get(
+                "prompt_tokens", 0) + self.counters.get("completion_tokens", 0)
+            attempts = self.counters.get("attempts", 0)
+            snapshot = {"time": time.time(), "elapsed": elapsed, "counters": dict(self.counters), "documents_per_second": rate("documents"), "tokens_per_second": rate("prompt_tokens") + rate("completion_tokens"),
+                        "tokens_per_second_total": tokens / max(elapsed, 1e-9), "latencies": {name: histogram.summary() for name, histogram in self.histograms.items()}, "errors": dict(self.errors),
+                        "error_rate": sum(self.errors.values()) / attempts if attempts else 0.0, "gauges": {name: function() for name, function in self.gauges.items()}, "time_spent": dict(self.times)}
+
+            self.previous_snapshot_at = now
+            self.previous_counters = dict(self.counters)
+
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        """
+        Renders all metrics in the Prometheus text format.
+
+        Returns:
+            str: The metrics.
+        """
+
+        lines = []
+        with self.lock:
+            for name, value in self.counters.items():
+                lines += [f"# TYPE mosaic_{name}_total counter",
+                          f"mosaic_{name}_total {value}"]
+
+            lines.append("# TYPE mosaic_errors_total counter")
+            for error_class, value in self.errors.items():
+                lines.append(
+                    f"mosaic_errors_total{{class=\"{error_class}\"}} {value}")
+
+            lines.append("# TYPE mosaic_time_spent_seconds_total counter")
+            for step, value in self.times.items():
+                lines.append(
+                    f"mosaic_time_spent_seconds_total{{step=\"{step}\"}} {value}")
+
+            for name, histogram in self.histograms.items():
+                lines.append(f"# TYPE mosaic_{name} histogram")
+                cumulative = 0
+                for bound, count in zip(PROMETHEUS_BUCKETS, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(
+                        f"mosaic_{name}_bucket{{le=\"{bound}\"}} {cumulative}")
+                lines += [f"mosaic_{name}_bucket{{le=\"+Inf\"}} {histogram.count}",
+                          f"mosaic_{name}_sum {histogram.sum}", f"mosaic_{name}_count {histogram.count}"]
+
+            for name, function in self.gauges.items():
+                lines += [f"# TYPE mosaic_{name} gauge",
+                          f"mosaic_{name} {function()}"]
+
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide telemetry
+telemetry = None
+
+
+def get_telemetry() -> Telemetry:
+    """
+    Returns the telemetry, creating it on first use.
+
+    Returns:
+        Telemetry: The telemetry.
+    """
+
+    global telemetry
+
+    if telemetry is None:
+        telemetry = Telemetry()
+
+    return telemetry
+
+
+class PrometheusRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        """
+        Answers the scrapes of the metrics (/metrics).
+        """
+
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+
+        content = get_telemetry().render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        Suppresses the logging of every scrape.
+        """
+
+        pass
+
+
+class TelemetryExporter:
+    def __init__(self, file_path: str, port: int) -> None:
+        """
+        Initializes the exporter of the telemetry.
+
+        Parameters:
+            file_path (str): The path to the .jsonl file the snapshots are appended to (None disables the snapshots).
+            port (int): The local port serving the Prometheus metrics (None disables the endpoint).
+        """
+        self.file_path = file_path
+        self.port = port
+        self.server = None
+
+    def __enter__(self) -> "TelemetryExporter":
+        """
+        Starts serving the Prometheus metrics in a background thread.
+        """
+
+        if self.port is not None:
+            self.server = ThreadingHTTPServer(
+                ("127.0.0.1", self.port), PrometheusRequestHandler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever,
+                             daemon=True).start()
+            tqdm.write(
+                f"{'\033[34m'}Serving document generation metrics on http://127.0.0.1:{self.port}/metrics{'\033[0m'}")
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Writes the final snapshot and stops serving the Prometheus metrics.
+        """
+
+        self.write_snapshot()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def write_snapshot(self) -> None:
+        """
+        Appends a snapshot of the telemetry to the snapshots file.
+        """
+
+        if self.file_path is None:
+            return
+
+        with open(self.file_path, "a", encoding='utf-8') as snapshots:
+            snapshots.write(json.dumps(get_telemetry().snapshot()) + "\n")
+
+    async def run(self) -> None:
+        """
+        Writes a snapshot in the configured interval (until cancelled).
+        """
+
+        while True:
+            await asyncio.sleep(config_framework.TELEMETRY_SNAPSHOT_INTERVAL)
+            self.write_snapshot()
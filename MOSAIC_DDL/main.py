@@ -62,6 +62,11 @@ def main() -> None:
     """framework.generate_seeds(
         ["occasion", "medical", "financial", "legal", "educational", "social"])"""
 
+    # Generate blank seeds (the prompts of the document generation) for specified domains
+    print(f"{'\033[31m'}Generating Blank Seeds...{'\033[0m'}")
+    """framework.generate_blank_seeds(
+        ["occasion", "medical", "financial", "legal", "educational", "social"])"""
+
     # Generate documents for specified domains
     print(f"{'\033[31m'}Generating Documents...{'\033[0m'}")
     """framework.generate_documents(
@@ -0,0 +1,279 @@
+"""
+mock_openrouter_server.py
+
+This module contains a local stand-in for the OpenRouter API which allows testing the document generation (retries, backoff, adaptive concurrency, dead letters and streaming) under induced errors without spending credits. Set OPEN_ROUTER_API_BASE_URL in config_framework.py to "http://127.0.0.1:8000/api/v1" and run this module.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import threading
+import random
+import json
+import time
+
+# Default behaviour of the mock server (error probabilities are per request)
+DEFAULT_MOCK_SETTINGS = {"minimum_latency": 0.05, "maximum_latency": 0.5, "maximum_concurrency": 50, "retry_after": 1, "rate_limit_probability": 0.05, "server_error_probability": 0.02,
+                         "overloaded_probability": 0.02, "timeout_probability": 0.0, "timeout_latency": 120.0, "malformed_probability": 0.01, "bad_request_probability": 0.0, "completion_tokens": 300, "cost_per_token": 1e-7, "credit_limit": 100.0,
+                         "document_words": 0, "token_interval": 0.0}  # Filler words appended to every document and delay between the streamed words (in seconds)
+
+
+class MockOpenRouterServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host: str, port: int, settings: dict) -> None:
+        """
+        Initializes the mock server.
+
+        Parameters:
+            host (str): The host to listen on.
+            port (int): The port to listen on (0 picks a free port).
+            settings (dict): The behaviour of the mock server (see DEFAULT_MOCK_SETTINGS).
+        """
+        super().__init__((host, port), MockOpenRouterRequestHandler)
+        self.settings = {**DEFAULT_MOCK_SETTINGS, **settings}
+        self.lock = threading.Lock()
+        self.random = random.Random(0)
+        self.in_flight = 0
+        self.statistics = {"requests": 0, "completions": 0, "rate_limited": 0, "server_errors": 0,
+                           "overloaded": 0, "timeouts": 0, "malformed": 0, "bad_requests": 0}
+        self.usage = 0.0
+
+    @property
+    def base_url(self) -> str:
+        """
+        Returns the base url which OPEN_ROUTER_API_BASE_URL has to be set to.
+        """
+
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/api/v1"
+
+
+class MockOpenRouterRequestHandler(BaseHTTPRequestHandler):
+    # Keep connections alive like the real API (every response has a Content-Length) and send headers and body without delay
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def send_json(self, status_code: int, body: dict, headers: dict = None) -> None:
+        """
+        Sends a json response.
+
+        Parameters:
+            status_code (int): The http status code.
+            body (dict): The body of the response.
+            headers (dict): Additional headers of the response.
+        """
+
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for header, value in (headers or {}).items():
+            self.send_header(header, str(value))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self) -> None:
+        """
+        Answers the credit requests (/auth/key).
+        """
+
+        if not self.path.endswith("/auth/key"):
+            self.send_json(404, {"error": {"code": 404, "message": "Not found"}})
+            return
+
+        with self.server.lock:
+            usage = self.server.usage
+        self.send_json(200, {"data": {"usage": usage, "limit": self.server.settings["credit_limit"],
+                       "limit_remaining": self.server.settings["credit_limit"] - usage}})
+
+    def do_POST(self) -> None:
+        """
+        Answers the chat completion requests (/chat/completions), inducing errors with the configured probabilities.
+        """
+
+        settings = self.server.settings
+        request = json.loads(self.rfile.read(
+            int(self.headers.get("Content-Length", 0))) or b"{}")
+
+        # Draw outcome of request and track requests in flight
+        with self.server.lock:
+            self.server.statistics["requests"] += 1
+            self.server.in_flight += 1
+            in_flight = self.server.in_flight
+            draw = self.server.random.random()
+            latency = self.server.random.uniform(
+                settings["minimum_latency"], settings["maximum_latency"])
+
+        try:
+            outcome = "completion"
+            for error, probability in (("rate_limited", settings["rate_limit_probability"]), ("server_errors", settings["server_error_probability"]), ("overloaded", settings["overloaded_probability"]), ("timeouts", settings["timeout_probability"]), ("malformed", settings["malformed_probability"]), ("bad_requests", settings["bad_request_probability"])):
+                if draw < probability:
+                    outcome = error
+                    break
+                draw -= probability
+            if in_flight > settings["maximum_concurrency"]:
+                outcome = "rate_limited"
+
+            with self.server.lock:
+                self.server.statistics[outcome if outcome != "completion" else "completions"] += 1
+
+            # Answer according to outcome
+            if outcome == "rate_limited":
+                self.send_json(429, {"error": {"code": 429, "message": "Rate limit exceeded"}}, {
+                               "Retry-After": settings["retry_after"]})
+            elif outcome == "server_errors":
+                time.sleep(latency)
+                self.send_json(
+                    500, {"error": {"code": 500, "message": "Internal server error"}})
+            elif outcome == "overloaded":
+                self.send_json(503, {"error": {"code": 503, "message": "Provider overloaded"}}, {
+                               "Retry-After": settings["retry_after"]})
+            elif outcome == "timeouts":
+                time.sleep(settings["timeout_latency"])
+                self.send_json(
+                    504, {"error": {"code": 504, "message": "Gateway timeout"}})
+            elif outcome == "malformed":
+                time.sleep(latency)
+                self.send_json(
+                    200, {"error": {"code": 502, "message": "Provider returned error"}})
+            elif outcome == "bad_requests":
+                self.send_json(
+                    400, {"error": {"code": 400, "message": "Bad request"}})
+            else:
+                time.sleep(latency)
+                completion = self.create_completion(request, settings)
+                if request.get("stream", False):
+                    self.send_completion_stream(completion, settings)
+                else:
+                    self.send_json(200, completion)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up on the request (e.g. timeout)
+            pass
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def send_chunk(self, content: bytes) -> None:
+        """
+        Sends a chunk of a response with chunked transfer encoding (an empty chunk ends the response).
+
+        Parameters:
+            content (bytes): The content of the chunk.
+        """
+
+        self.wfile.write(f"{len(content):x}\r\n".encode(
+            'utf-8') + content + b"\r\n")
+        self.wfile.flush()
+
+    def send_completion_stream(self, completion: dict, settings: dict) -> None:
+        """
+        Sends a completion as server-sent events like the real API: one event per word of the document, the finish reason, the usage and the end marker. Stop sequences are not honored (like by some providers), such that the client has to enforce them.
+
+        Parameters:
+            completion (dict): The chat completion.
+            settings (dict): The behaviour of the mock server.
+        """
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        # Keep-alive comment sent by the real API while the request is processed
+        self.send_chunk(b": OPENROUTER PROCESSING\n\n")
+
+        words = completion["choices"][0]["message"]["content"].split(" ")
+        for idx, word in enumerate(words):
+            if idx > 0:
+                time.sleep(settings["token_interval"])
+            self.send_chunk(f"data: {json.dumps({"id": completion["id"], "choices": [{"index": 0, "delta": {"content": word if idx == 0 else " " + word}, "finish_reason": None}]})}\n\n".encode('utf-8'))
+
+        self.send_chunk(f"data: {json.dumps({"id": completion["id"], "choices": [{"index": 0, "delta": {}, "finish_reason": completion["choices"][0]["finish_reason"]}]})}\n\n".encode('utf-8'))
+        self.send_chunk(
+            f"data: {json.dumps({"id": completion["id"], "choices": [], "usage": completion["usage"]})}\n\n".encode('utf-8'))
+        self.send_chunk(b"data: [DONE]\n\n")
+        self.send_chunk(b"")
+
+    def create_completion(self, request: dict, settings: dict) -> dict:
+        """
+        Creates a deterministic completion for a request (cut off after max_tokens words, if requested).
+
+        Parameters:
+            request (dict): The chat completion request.
+            settings (dict): The behaviour of the mock server.
+
+        Returns:
+            dict: The chat completion.
+        """
+
+        # Compute document and usage
+        messages = request.get("messages", [])
+        prompt = " ".join(str(message.get("content", ""))
+                          for message in messages)
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = settings["completion_tokens"]
+        document = f"Mock document for: {messages[-1].get("content", "") if messages else ""}" + " lorem" * settings["document_words"]
+        finish_reason = "stop"
+        if request.get("max_tokens") is not None and len(document.split(" ")) > request["max_tokens"]:
+            document = " ".join(document.split(" ")[:request["max_tokens"]])
+            completion_tokens = min(completion_tokens, request["max_tokens"])
+            finish_reason = "length"
+        cost = (prompt_tokens + completion_tokens) * settings["cost_per_token"]
+
+        with self.server.lock:
+            self.server.usage += cost
+
+        return {"id": f"gen-mock-{time.time_ns()}", "model": request.get("model"), "object": "chat.completion", "choices": [{"index": 0, "finish_reason": finish_reason, "message": {"role": "assistant", "content": document}}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens, "cost": cost}}
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        Suppresses the logging of every request.
+        """
+
+        pass
+
+
+def start_mock_openrouter_server(host: str = "127.0.0.1", port: int = 0, **settings) -> MockOpenRouterServer:
+    """
+    Starts the mock server in a background thread.
+
+    Parameters:
+        host (str): The host to listen on.
+        port (int): The port to listen on (0 picks a free port).
+        settings: Overrides of DEFAULT_MOCK_SETTINGS.
+
+    Returns:
+        MockOpenRouterServer: The running server (stop it with shutdown()).
+    """
+
+    server = MockOpenRouterServer(host, port, settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+def serve_mock_openrouter_server(host: str = "127.0.0.1", port: int = 8000, **settings) -> None:
+    """
+    Runs the mock server in the current process until it is terminated (e.g. as a separate process, such that clients being benchmarked do not compete with it for the interpreter).
+
+    Parameters:
+        host (str): The host to listen on.
+        port (int): The port to listen on.
+        settings: Overrides of DEFAULT_MOCK_SETTINGS.
+    """
+
+    MockOpenRouterServer(host, port, settings).serve_forever()
+
+
+if __name__ == "__main__":
+    server = MockOpenRouterServer("127.0.0.1", 8000, {})
+    print(
+        f"{'\033[34m'}Mock OpenRouter server listening on {server.base_url}{'\033[0m'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(server.statistics)
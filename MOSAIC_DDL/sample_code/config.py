@@ -111,6 +111,5 @@ MAXIMUM_ATTEMPTS_FOR_ACROSS_TREE_MARRIAGES = int(
 MAXIMUM_DEPTH_OF_FAMILY_TREES = 7
 
 # All domains generation parameters/variables
-GLOBAL_HUMAN_SET = set()
 START_DATE = datetime.date(1850, 1, 1)
 END_DATE = datetime.date(2025, 8, 1)
@@ -0,0 +1,160 @@
+"""
+country_registry.py
+
+This module contains the process-wide registry of the per-country data (phone codes, iso3 codes, regions, religions and politics) and the species living in each region, precomputed once such that the domain generators do not need to touch the underlying .csv files.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from sample_code.dataset_cache import dataset_cache
+from sample_code import config
+from itertools import accumulate
+from typing import Any
+import random
+import json
+import ast
+
+
+class CountryRegistry:
+    def __init__(self) -> None:
+        """
+        Builds the lookup tables from the countries, the country region religion politics and the species datasets.
+        """
+
+        # Phone and iso3 codes per country (the first occurrence of a country wins)
+        countries = dataset_cache.get(config.E_COUNTRIES_FILE_PATH)
+        self.phone_codes = {}
+        self.iso3_codes = {}
+        for index in range(len(countries)):
+            self.phone_codes.setdefault(
+                countries.value("name", index), countries.value("phone_code", index))
+            self.iso3_codes.setdefault(
+                countries.value("name", index), countries.value("iso3", index))
+
+        # Regions, religions (names and cumulative weights) and politics per country
+        crrps = dataset_cache.get(
+            config.COUNTRY_REGION_RELIGION_POLITICS_FILE_PATH)
+        self.regions = {}
+        self.religions = {}
+        self.politics = {}
+        for index in range(len(crrps)):
+            country = crrps.value("country", index)
+            self.regions.setdefault(country, crrps.value("region", index))
+
+            country = country.strip()
+            if country not in self.religions:
+                religions = json.loads(crrps.value("religions", index))
+                self.religions[country] = (
+                    list(religions.keys()), list(accumulate(religions.values())))
+                self.politics[country] = ast.literal_eval(
+                    crrps.value("politics", index))
+
+        # Species per region (in file order)
+        species = dataset_cache.get(
+            config.SPECIES_REGION_LIFETIME_ENDANGERED_FILE_PATH)
+        self.species_by_region = {}
+        for index in range(len(species)):
+            self.species_by_region.setdefault(
+                species.value("region", index), []).append(species.row(index))
+
+    def phone_code(self, country: str) -> Any:
+        """
+        Returns the phone code of a country.
+
+        Parameters:
+            country (str): The name of the country.
+
+        Returns:
+            Any: The phone code.
+        """
+
+        return self.phone_codes[country]
+
+    def iso3(self, country: str) -> str:
+        """
+        Returns the iso3 code of a country.
+
+        Parameters:
+            country (str): The name of the country.
+
+        Returns:
+            str: The iso3 code.
+        """
+
+        return self.iso3_codes[country]
+
+    def region(self, country: str) -> str:
+        """
+        Returns the broad region a country lies in.
+
+        Parameters:
+            country (str): The name of the country.
+
+        Returns:
+            str: The region.
+        """
+
+        return self.regions[country]
+
+    def sample_religion(self, country: str) -> str:
+        """
+        Returns a random religion, weighted by the share of the religion in the country.
+
+        Parameters:
+            country (str): The name of the country.
+
+        Returns:
+            str: The random religion.
+        """
+
+        religions, cumulative_weights = self.religions[country]
+
+        return random.choices(religions, cum_weights=cumulative_weights, k=1)[0]
+
+    def sample_politics(self, country: str) -> str:
+        """
+        Returns a random political party of the country.
+
+        Parameters:
+            country (str): The name of the country.
+
+        Returns:
+            str: The random political party.
+        """
+
+        return random.choice(self.politics[country])
+
+    def sample_species(self, region: str) -> dict[str, Any]:
+        """
+        Returns a random species living in the region.
+
+        Parameters:
+            region (str): The region.
+
+        Returns:
+            dict[str, Any]: The row of the species dataset describing the species.
+        """
+
+        return random.choice(self.species_by_region[region])
+
+
+# Process-wide country registry
+country_registry = None
+
+
+def get_country_registry() -> CountryRegistry:
+    """
+    Returns the country registry, building it on first use.
+
+    Returns:
+        CountryRegistry: The country registry.
+    """
+
+    global country_registry
+
+    if country_registry is None:
+        country_registry = CountryRegistry()
+
+    return country_registry
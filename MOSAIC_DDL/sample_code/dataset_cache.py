@@ -0,0 +1,254 @@
+"""
+dataset_cache.py
+
+This module contains the process-wide cache of the .csv datasets which are used by the generation functions. Every dataset is read only once and kept in a column-oriented store.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from typing import Any
+import pandas as pd
+import numpy as np
+import random
+
+
+class Dataset:
+    def __init__(self, file_path: str, header: bool = True) -> None:
+        """
+        Loads a .csv file into one numpy array per column.
+
+        Parameters:
+            file_path (str): The path to the .csv file.
+            header (bool): Whether the first row of the .csv file holds the column names (otherwise the columns are numbered).
+        """
+        dataset = pd.read_csv(file_path, header=0 if header else None)
+        self.file_path = file_path
+        self.column_names = dataset.columns.tolist()
+        self.columns = {column_name: dataset[column_name].to_numpy()
+                        for column_name in self.column_names}
+        self.number_of_rows = len(dataset)
+        self.key_indexes = {}
+        self.sorted_indexes = {}
+        self.group_indexes = {}
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rows of the dataset.
+        """
+
+        return self.number_of_rows
+
+    def value(self, column_name: str, index: int) -> Any:
+        """
+        Returns a single value of the dataset as a python object.
+
+        Parameters:
+            column_name (str): The name of the column.
+            index (int): The index of the row.
+
+        Returns:
+            Any: The value.
+        """
+
+        value = self.columns[column_name][index]
+
+        return value.item() if isinstance(value, np.generic) else value
+
+    def row(self, index: int) -> dict[str, Any]:
+        """
+        Returns a single row of the dataset.
+
+        Parameters:
+            index (int): The index of the row.
+
+        Returns:
+            dict[str, Any]: A dictionary mapping the column names to the values of the row.
+        """
+
+        return {column_name: self.value(column_name, index) for column_name in self.column_names}
+
+    def sample_index(self, file_length: int = None) -> int:
+        """
+        Returns a random row index. The index is drawn the same way as the former skiprows offset, such that seeded runs draw the same rows.
+
+        Parameters:
+            file_length (int): The number of rows to draw from (defaults to all rows).
+
+        Returns:
+            int: The random row index.
+        """
+
+        return random.randint(1, file_length if file_length is not None else self.number_of_rows) - 1
+
+    def sample_row(self, file_length: int = None) -> dict[str, Any]:
+        """
+        Returns a random row of the dataset.
+
+        Parameters:
+            file_length (int): The number of rows to draw from (defaults to all rows).
+
+        Returns:
+            dict[str, Any]: The random row.
+        """
+
+        return self.row(self.sample_index(file_length))
+
+    def sample_column(self, column_name: str, n: int, file_length: int = None) -> list[Any]:
+        """
+        Returns n random values (drawn with replacement) of a column of the dataset.
+
+        Parameters:
+            column_name (str): The name of the column.
+            n (int): The number of values.
+            file_length (int): The number of rows to draw from (defaults to all rows).
+
+        Returns:
+            list[Any]: The random values.
+        """
+
+        return [self.value(column_name, self.sample_index(file_length)) for _ in range(n)]
+
+    def lookup(self, key_column_name: str, key: Any, column_name: str) -> Any:
+        """
+        Returns the value of a column in the first row whose key column equals the key.
+
+        Parameters:
+            key_column_name (str): The name of the column holding the keys.
+            key (Any): The key to look up.
+            column_name (str): The name of the column whose value is returned.
+
+        Returns:
+            Any: The value.
+        """
+
+        # Build index of key column on first use (the first occurrence of a key wins)
+        if key_column_name not in self.key_indexes:
+            key_index = {}
+            for index, value in enumerate(self.columns[key_column_name].tolist()):
+                key_index.setdefault(value, index)
+            self.key_indexes[key_column_name] = key_index
+
+        return self.value(column_name, self.key_indexes[key_column_name][key])
+
+    def sample_row_where_at_most(self, column_name: str, maximum: Any) -> dict[str, Any]:
+        """
+        Returns a random row among all rows whose value in the column does not exceed the maximum.
+
+        Parameters:
+            column_name (str): The name of the column.
+            maximum (Any): The maximum value.
+
+        Returns:
+            dict[str, Any]: The random row.
+        """
+
+        # Sort rows by column on first use
+        if column_name not in self.sorted_indexes:
+            order = np.argsort(self.columns[column_name], kind="stable")
+            self.sorted_indexes[column_name] = (
+                order, self.columns[column_name][order])
+        order, sorted_values = self.sorted_indexes[column_name]
+
+        # All rows up to the insertion point of the maximum match
+        number_of_matches = int(np.searchsorted(
+            sorted_values, maximum, side="right"))
+
+        return self.row(int(order[random.randrange(number_of_matches)]))
+
+    def sample_row_where_equal(self, column_name: str, value: Any) -> dict[str, Any]:
+        """
+        Returns a random row among all rows whose value in the column equals the value.
+
+        Parameters:
+            column_name (str): The name of the column.
+            value (Any): The value.
+
+        Returns:
+            dict[str, Any]: The random row.
+        """
+
+        # Group rows by column on first use
+        if column_name not in self.group_indexes:
+            group_index = {}
+            for index, group in enumerate(self.columns[column_name].tolist()):
+                group_index.setdefault(group, []).append(index)
+            self.group_indexes[column_name] = group_index
+
+        return self.row(random.choice(self.group_indexes[column_name][value]))
+
+
+class DatasetCache:
+    def __init__(self) -> None:
+        """
+        Initializes the (empty) cache.
+        """
+        self.datasets = {}
+
+    def get(self, file_path: str, header: bool = True) -> Dataset:
+        """
+        Returns the dataset stored in the .csv file, loading it on first use.
+
+        Parameters:
+            file_path (str): The path to the .csv file.
+            header (bool): Whether the first row of the .csv file holds the column names (otherwise the columns are numbered).
+
+        Returns:
+            Dataset: The dataset.
+        """
+
+        if (file_path, header) not in self.datasets:
+            self.datasets[(file_path, header)] = Dataset(file_path, header)
+
+        return self.datasets[(file_path, header)]
+
+    def sample_row(self, file_path: str, file_length: int = None) -> dict[str, Any]:
+        """
+        Returns a random row of the specified file.
+
+        Parameters:
+            file_path (str): The path to the .csv file.
+            file_length (int): The number of rows to draw from (defaults to all rows).
+
+        Returns:
+            dict[str, Any]: The random row.
+        """
+
+        return self.get(file_path).sample_row(file_length)
+
+    def sample_column(self, file_path: str, column_name: str, n: int, file_length: int = None) -> list[Any]:
+        """
+        Returns n random values (drawn with replacement) of a column of the specified file.
+
+        Parameters:
+            file_path (str): The path to the .csv file.
+            column_name (str): The name of the column.
+            n (int): The number of values.
+            file_length (int): The number of rows to draw from (defaults to all rows).
+
+        Returns:
+            list[Any]: The random values.
+        """
+
+        return self.get(file_path).sample_column(column_name, n, file_length)
+
+    def lookup(self, file_path: str, key_column_name: str, key: Any, column_name: str) -> Any:
+        """
+        Returns the value of a column in the first row of the specified file whose key column equals the key.
+
+        Parameters:
+            file_path (str): The path to the .csv file.
+            key_column_name (str): The name of the column holding the keys.
+            key (Any): The key to look up.
+            column_name (str): The name of the column whose value is returned.
+
+        Returns:
+            Any: The value.
+        """
+
+        return self.get(file_path).lookup(key_column_name, key, column_name)
+
+
+# Process-wide dataset cache
+dataset_cache = DatasetCache()
@@ -9,10 +9,11 @@ Date: July 2025
 
 # Imports
 from sample_code.helpers_event_generation import get_random_csv_entry
+from sample_code.jsonl_index import get_jsonl_pool
+from sample_code.human_pool import get_human_pool
 from sample_code import config
 from typing import Union
 import random
-import json
 
 
 def get_random_school_and_location() -> tuple[str, str]:
@@ -23,15 +24,9 @@ def get_random_school_and_location() -> tuple[str, str]:
         tuple[str, str]: A tuple containing the school name and location.
     """
 
-    # Choose a random row (which represent a country)
-    random_row = random.randint(0, config.E_COUNTRIES_FILE_LENGTH - 1)
-
-    # Traverse school file and pick chosen row
-    with open(config.SCHOOL_INSTANCES_PATH, "r", encoding='utf-8') as schools:
-        for i, school in enumerate(schools):
-            if i == random_row:
-                school_entry = json.loads(school)
-                break
+    # Choose a random row (which represents a country) and read it using the index
+    school_entry = get_jsonl_pool(config.SCHOOL_INSTANCES_PATH).sample(
+        config.E_COUNTRIES_FILE_LENGTH)
 
     # Choose a random school
     return random.choice(school_entry["schools"]), school_entry["country"]
@@ -50,50 +45,20 @@ def get_random_instructor(school_name: str, school_location: str, school_year: i
         str: The randomly selected instructor from the selected school or country, together with his email address and id.
     """
 
-    # Storage for all instructors of the school
-    all_instructors_of_school = []
-
-    # Storage for random instructor
-    random_instructor = ""
-
-    # Traverse humans and search for instructor working at the school
-    with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-        for human in humans:
-            # Fetch content
-            human_content = json.loads(human)
-
-            if human_content["occupation"] == "Instructor" and human_content["is_instructor_at"] == school_name and (18 <= school_year - human_content["birth_year"] <= 100):
-                all_instructors_of_school.append(human_content)
-
-    if len(all_instructors_of_school) == 0:
-        # Storage for all instructors of the country
-        all_instructors_of_country = []
+    # Query instructors working at the school and fall back to instructors of the country
+    human_pool = get_human_pool(config.HUMAN_INSTANCES_PATH)
+    instructor_id = human_pool.sample(
+        "Instructor", school_year, 18, 100, employer=school_name)
+    if instructor_id is None:
+        instructor_id = human_pool.sample(
+            "Instructor", school_year, 18, 100, nationality=school_location)
 
-        with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-            for human in humans:
-                # Fetch content
-                human_content = json.loads(human)
+    if instructor_id is None:
+        return "Unknown", "Unknown", "Unknown"
 
-                if human_content["occupation"] == "Instructor" and human_content["nationality"] == school_location and (18 <= school_year - human_content["birth_year"] <= 100):
-                    all_instructors_of_country.append(human_content)
+    random_instructor_content = human_pool.record(instructor_id)
 
-        if len(all_instructors_of_country) == 0:
-            random_instructor = "Unknown"
-            random_instructor_email_address = "Unknown"
-            random_instructor_id = "Unknown"
-        else:
-            random_instructor_content = random.choice(
-                all_instructors_of_country)
-            random_instructor = random_instructor_content["name"]
-            random_instructor_email_address = random_instructor_content["instructor_email_address"]
-            random_instructor_id = random_instructor_content["instructor_id"]
-    else:
-        random_instructor_content = random.choice(all_instructors_of_school)
-        random_instructor = random_instructor_content["name"]
-        random_instructor_email_address = random_instructor_content["instructor_email_address"]
-        random_instructor_id = random_instructor_content["instructor_id"]
-
-    return random_instructor, random_instructor_email_address, random_instructor_id
+    return random_instructor_content["name"], random_instructor_content["instructor_email_address"], random_instructor_content["instructor_id"]
 
 
 def get_random_student(school_name: str, school_location: str, school_year: int) -> str:
@@ -109,49 +74,20 @@ def get_random_student(school_name: str, school_location: str, school_year: int)
         str: The randomly selected student from the selected school or country, together with his email address and id.
     """
 
-    # Storage for all students of the school
-    all_students_of_school = []
-
-    # Storage for random student
-    random_student = ""
-
-    # Traverse humans and search for student studying at the school
-    with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-        for human in humans:
-            # Fetch content
-            human_content = json.loads(human)
-
-            if human_content["occupation"] == "Student" and human_content["is_student_at"] == school_name and (5 <= school_year - human_content["birth_year"] <= 100):
-                all_students_of_school.append(human_content)
-
-    if len(all_students_of_school) == 0:
-        # Storage for all students of the country
-        all_students_of_country = []
-
-        with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-            for human in humans:
-                # Fetch content
-                human_content = json.loads(human)
-
-                if human_content["occupation"] == "Student" and human_content["nationality"] == school_location and (5 <= school_year - human_content["birth_year"] <= 100):
-                    all_students_of_country.append(human_content)
-
-        if len(all_students_of_country) == 0:
-            random_student = "Unknown"
-            random_student_email_address = "Unknown"
-            random_student_id = "Unknown"
-        else:
-            random_student_content = random.choice(all_students_of_country)
-            random_student = random_student_content["name"]
-            random_student_email_address = random_student_content["student_email_address"]
-            random_student_id = random_student_content["student_id"]
-    else:
-        random_student_content = random.choice(all_students_of_school)
-        random_student = random_student_content["name"]
-        random_student_email_address = random_student_content["student_email_address"]
-        random_student_id = random_student_content["student_id"]
-
-    return random_student, random_student_email_address, random_student_id
+    # Query students studying at the school and fall back to students of the country
+    human_pool = get_human_pool(config.HUMAN_INSTANCES_PATH)
+    student_id = human_pool.sample(
+        "Student", school_year, 5, 100, employer=school_name)
+    if student_id is None:
+        student_id = human_pool.sample(
+            "Student", school_year, 5, 100, nationality=school_location)
+
+    if student_id is None:
+        return "Unknown", "Unknown", "Unknown"
+
+    random_student_content = human_pool.record(student_id)
+
+    return random_student_content["name"], random_student_content["student_email_address"], random_student_content["student_id"]
 
 
 def generate_educational_event(entity_to_count: dict[str, int]) -> dict[str, Union[int, str]]:
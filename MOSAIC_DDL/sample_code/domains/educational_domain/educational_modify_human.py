@@ -9,6 +9,7 @@ Date: June 2025
 
 # Imports
 from sample_code.helpers_event_generation import count_number_of_humans
+from sample_code.jsonl_index import get_jsonl_pool, build_jsonl_index
 from sample_code import config
 from tqdm import tqdm
 import random
@@ -24,6 +25,9 @@ def educational_modify_human() -> None:
     # Count number of humans
     number_of_humans = count_number_of_humans()
 
+    # Open schools using the index
+    school_pool = get_jsonl_pool(config.SCHOOL_INSTANCES_PATH)
+
     # Iterate through humans
     with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans, open(config.HUMAN_INSTANCES_TEMPORARY_PATH, "w", encoding='utf-8') as humans_temporary:
         for human in tqdm(humans, total=number_of_humans, desc=f"{'\033[34m'}Applying modifications for educational domain...{'\033[0m'}"):
@@ -32,19 +36,15 @@ def educational_modify_human() -> None:
 
             if human_content["occupation"] == "Instructor":
                 # Search schools from his country
-                with open(config.SCHOOL_INSTANCES_PATH, "r", encoding='utf-8') as schools:
-                    for school in schools:
-                        # Fetch content
-                        school_content = json.loads(school)
-
-                        if school_content["country"] == human_content["nationality"]:
-                            # Choose a random school
-                            random_school = random.choice(
-                                school_content["schools"])
+                school_content = school_pool.find(
+                    "country", human_content["nationality"])
+                if school_content is not None:
+                    # Choose a random school
+                    random_school = random.choice(
+                        school_content["schools"])
 
-                            # Assign new attribute to human
-                            human_content["is_instructor_at"] = random_school
-                            break
+                    # Assign new attribute to human
+                    human_content["is_instructor_at"] = random_school
 
                 # Compute name school abbreviation
                 name_concatenation = ".".join(
@@ -63,19 +63,15 @@ def educational_modify_human() -> None:
                 humans_temporary.write(json.dumps(human_content) + "\n")
             elif human_content["occupation"] == "Student":
                 # Search schools from his country
-                with open(config.SCHOOL_INSTANCES_PATH, "r", encoding='utf-8') as schools:
-                    for school in schools:
-                        # Fetch content
-                        school_content = json.loads(school)
+                school_content = school_pool.find(
+                    "country", human_content["nationality"])
+                if school_content is not None:
+                    # Choose a random school
+                    random_school = random.choice(
+                        school_content["schools"])
 
-                        if school_content["country"] == human_content["nationality"]:
-                            # Choose a random school
-                            random_school = random.choice(
-                                school_content["schools"])
-
-                            # Assign new attribute to human
-                            human_content["is_student_at"] = random_school
-                            break
+                    # Assign new attribute to human
+                    human_content["is_student_at"] = random_school
 
                 # Compute name school abbreviation
                 name_concatenation = ".".join(
@@ -98,3 +94,6 @@ def educational_modify_human() -> None:
     # Overwrite old file
     os.replace(config.HUMAN_INSTANCES_TEMPORARY_PATH,
                config.HUMAN_INSTANCES_PATH)
+
+    # Index modified humans
+    build_jsonl_index(config.HUMAN_INSTANCES_PATH)
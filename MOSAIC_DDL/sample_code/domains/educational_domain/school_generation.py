@@ -9,6 +9,7 @@ Date: June 2025
 
 # Imports
 from sample_code.helpers_event_generation import extract_formatting_fields
+from sample_code.jsonl_index import build_jsonl_index
 from sample_code import config
 import random
 import json
@@ -53,7 +54,7 @@ def generate_schools() -> None:
                 1, config.MAX_NUMBER_OF_SCHOOLS_PER_COUNTRY)
 
             # Compute schools
-            school_names = set()
+            school_names = {}
             while (len(school_names) < number_of_schools):
                 # Fetch random template and extract formatting fields
                 template = random.choice(school_template)
@@ -63,8 +64,8 @@ def generate_schools() -> None:
                 formatting_fields_values = {"prefixes": random.choice(prefixes), "types": random.choice(types), "regions": random.choice(
                     regions), "modifiers": random.choice(modifiers), "descriptors": random.choice(descriptors), "suffixes": random.choice(suffixes), "country": country_name}
 
-                school_names.add(template.format(
-                    **{v: formatting_fields_values[v] for v in formatting_fields}))
+                school_names[template.format(
+                    **{v: formatting_fields_values[v] for v in formatting_fields})] = None
 
             school_names = list(school_names)
 
@@ -73,3 +74,6 @@ def generate_schools() -> None:
                 "schools": school_names, "country": country_name}
 
             schools.write(json.dumps(school_names_dict) + "\n")
+
+    # Index schools for random access
+    build_jsonl_index(config.SCHOOL_INSTANCES_PATH)
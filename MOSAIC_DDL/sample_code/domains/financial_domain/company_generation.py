@@ -9,6 +9,7 @@ Date: June 2025
 
 # Imports
 from sample_code.helpers_event_generation import extract_formatting_fields
+from sample_code.jsonl_index import build_jsonl_index
 from sample_code import config
 import random
 import json
@@ -53,7 +54,7 @@ def generate_companies() -> None:
                 1, config.MAX_NUMBER_OF_COMPANIES_PER_COUNTRY)
 
             # Compute companies
-            company_names = set()
+            company_names = {}
             while (len(company_names) < number_of_companies):
                 # Fetch random template and extract formatting fields
                 template = random.choice(company_template)
@@ -63,8 +64,8 @@ def generate_companies() -> None:
                 formatting_fields_values = {"prefixes": random.choice(prefixes), "sectors": random.choice(sectors), "types": random.choice(
                     types), "regions": random.choice(regions), "modifiers": random.choice(modifiers), "descriptors": random.choice(descriptors), "country": country_name}
 
-                company_names.add(template.format(
-                    **{v: formatting_fields_values[v] for v in formatting_fields}))
+                company_names[template.format(
+                    **{v: formatting_fields_values[v] for v in formatting_fields})] = None
 
             company_names = list(company_names)
 
@@ -73,3 +74,6 @@ def generate_companies() -> None:
                 "companies": company_names, "country": country_name}
 
             companies.write(json.dumps(company_names_dict) + "\n")
+
+    # Index companies for random access
+    build_jsonl_index(config.COMPANY_INSTANCES_PATH)
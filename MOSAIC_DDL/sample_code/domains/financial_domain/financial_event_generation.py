@@ -8,12 +8,13 @@ Date: July 2025
 """
 
 # Imports
+from sample_code.country_registry import get_country_registry
+from sample_code.jsonl_index import get_jsonl_pool
+from sample_code.human_pool import get_human_pool
 from sample_code import config
 from typing import Union
-import pandas as pd
 import datetime
 import random
-import json
 
 
 def get_random_company_and_location() -> tuple[str, str]:
@@ -24,15 +25,9 @@ def get_random_company_and_location() -> tuple[str, str]:
         tuple[str, str]: A tuple containing the company name and location.
     """
 
-    # Choose a random row (which represents a country)
-    random_row = random.randint(0, config.E_COUNTRIES_FILE_LENGTH - 1)
-
-    # Traverse companies file and pick chosen row
-    with open(config.COMPANY_INSTANCES_PATH, "r", encoding='utf-8') as companies:
-        for i, company_list in enumerate(companies):
-            if i == random_row:
-                company_entry = json.loads(company_list)
-                break
+    # Choose a random row (which represents a country) and read it using the index
+    company_entry = get_jsonl_pool(config.COMPANY_INSTANCES_PATH).sample(
+        config.E_COUNTRIES_FILE_LENGTH)
 
     # Choose a random company
     return random.choice(company_entry["companies"]), company_entry["country"]
@@ -71,23 +66,18 @@ def get_ceo_name(company_name: str, company_location: str, transaction_date: str
         str: The name of the CEO or unknown.
     """
 
-    # Storage for ceo name
-    ceo_name = "Unknown"
-
     # Extract year from date
     year_of_transaction = int(transaction_date.split("-")[2])
 
-    # Traverse human instances and search for ceo
-    with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-        for human in humans:
-            # Fetch content
-            human_content = json.loads(human)
+    # Query the first ceo (in file order) of the company
+    human_pool = get_human_pool(config.HUMAN_INSTANCES_PATH)
+    ceo_id = human_pool.first("CEO", year_of_transaction, 18,
+                              100, nationality=company_location, employer=company_name)
 
-            if human_content["occupation"] == "CEO" and human_content["is_ceo_of"] == company_name and human_content["nationality"] == company_location and (18 <= year_of_transaction - human_content["birth_year"] <= 100):
-                ceo_name = human_content["name"]
-                break
+    if ceo_id is None:
+        return "Unknown"
 
-    return ceo_name
+    return human_pool.names[ceo_id]
 
 
 def get_employee_name(company_name: str, company_location: str, transaction_date: str) -> str:
@@ -103,25 +93,18 @@ def get_employee_name(company_name: str, company_location: str, transaction_date
         str: The name of an employee or unknown.
     """
 
-    # Storage for all employees of the company
-    all_employees_of_company = []
-
     # Extract year from date
     year_of_transaction = int(transaction_date.split("-")[2])
 
-    # Traverse human instances and search for employees
-    with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-        for human in humans:
-            # Fetch content
-            human_content = json.loads(human)
-
-            if human_content["occupation"] == "Employee" and human_content["is_employee_at"] == company_name and human_content["nationality"] == company_location and (18 <= year_of_transaction - human_content["birth_year"] <= 100):
-                all_employees_of_company.append(human_content["name"])
+    # Query employees of the company
+    human_pool = get_human_pool(config.HUMAN_INSTANCES_PATH)
+    employee_id = human_pool.sample("Employee", year_of_transaction, 18,
+                                    100, nationality=company_location, employer=company_name)
 
-    if len(all_employees_of_company) == 0:
+    if employee_id is None:
         return "Unknown"
 
-    return random.choice(all_employees_of_company)
+    return human_pool.names[employee_id]
 
 
 def generate_financial_event(entity_to_count: dict[str, int]) -> dict[str, Union[int, str]]:
@@ -148,9 +131,7 @@ def generate_financial_event(entity_to_count: dict[str, int]) -> dict[str, Union
         company_name, company_location, transaction_date)
 
     # Compute account id
-    country_information = pd.read_csv(config.E_COUNTRIES_FILE_PATH)
-    country_iso_code = country_information.loc[country_information["name"]
-                                               == company_location, "iso3"].values[0]
+    country_iso_code = get_country_registry().iso3(company_location)
     account_id = f"{stock_ticker}-{country_iso_code}-{random.randint(1, 1000000000)}"
 
     # Assemble dictionary
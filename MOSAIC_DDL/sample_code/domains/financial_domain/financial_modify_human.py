@@ -9,6 +9,7 @@ Date: June 2025
 
 # Imports
 from sample_code.helpers_event_generation import count_number_of_humans
+from sample_code.jsonl_index import get_jsonl_pool, build_jsonl_index
 from sample_code import config
 from tqdm import tqdm
 import random
@@ -24,6 +25,9 @@ def financial_modify_human() -> None:
     # Count number of humans
     number_of_humans = count_number_of_humans()
 
+    # Open companies using the index
+    company_pool = get_jsonl_pool(config.COMPANY_INSTANCES_PATH)
+
     # Iterate through humans
     with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans, open(config.HUMAN_INSTANCES_TEMPORARY_PATH, "w", encoding='utf-8') as humans_temporary:
         for human in tqdm(humans, total=number_of_humans, desc=f"{'\033[34m'}Applying modifications for financial domain...{'\033[0m'}"):
@@ -32,35 +36,27 @@ def financial_modify_human() -> None:
 
             if human_content["occupation"] == "CEO":
                 # Search companies from his country
-                with open(config.COMPANY_INSTANCES_PATH, "r", encoding='utf-8') as companies:
-                    for company in companies:
-                        # Fetch content
-                        company_content = json.loads(company)
-
-                        if company_content["country"] == human_content["nationality"]:
-                            # Choose a random company
-                            random_company = random.choice(
-                                company_content["companies"])
+                company_content = company_pool.find(
+                    "country", human_content["nationality"])
+                if company_content is not None:
+                    # Choose a random company
+                    random_company = random.choice(
+                        company_content["companies"])
 
-                            # Assign new attribute to human
-                            human_content["is_ceo_of"] = random_company
-                            break
+                    # Assign new attribute to human
+                    human_content["is_ceo_of"] = random_company
                 humans_temporary.write(json.dumps(human_content) + "\n")
             elif human_content["occupation"] == "Employee":
                 # Search companies from his country
-                with open(config.COMPANY_INSTANCES_PATH, "r", encoding='utf-8') as companies:
-                    for company in companies:
-                        # Fetch content
-                        company_content = json.loads(company)
+                company_content = company_pool.find(
+                    "country", human_content["nationality"])
+                if company_content is not None:
+                    # Choose a random company
+                    random_company = random.choice(
+                        company_content["companies"])
 
-                        if company_content["country"] == human_content["nationality"]:
-                            # Choose a random company
-                            random_company = random.choice(
-                                company_content["companies"])
-
-                            # Assign new attribute to human
-                            human_content["is_employee_at"] = random_company
-                            break
+                    # Assign new attribute to human
+                    human_content["is_employee_at"] = random_company
                 humans_temporary.write(json.dumps(human_content) + "\n")
             else:
                 humans_temporary.write(json.dumps(human_content) + "\n")
@@ -68,3 +64,6 @@ def financial_modify_human() -> None:
     # Overwrite old file
     os.replace(config.HUMAN_INSTANCES_TEMPORARY_PATH,
                config.HUMAN_INSTANCES_PATH)
+
+    # Index modified humans
+    build_jsonl_index(config.HUMAN_INSTANCES_PATH)
@@ -9,6 +9,7 @@ Date: June 2025
 
 # Imports
 from sample_code.helpers_event_generation import extract_formatting_fields
+from sample_code.jsonl_index import build_jsonl_index
 from sample_code import config
 import random
 import json
@@ -53,7 +54,7 @@ def generate_courts() -> None:
                 1, config.MAX_NUMBER_OF_COURTS_PER_COUNTRY)
 
             # Compute courts
-            court_names = set()
+            court_names = {}
             while (len(court_names) < number_of_courts):
                 # Fetch random template and extract formatting fields
                 template = random.choice(court_template)
@@ -63,8 +64,8 @@ def generate_courts() -> None:
                 formatting_fields_values = {"prefixes": random.choice(prefixes), "types": random.choice(types), "regions": random.choice(
                     regions), "modifiers": random.choice(modifiers), "descriptors": random.choice(descriptors), "suffixes": random.choice(suffixes), "country": country_name}
 
-                court_names.add(template.format(
-                    **{v: formatting_fields_values[v] for v in formatting_fields}))
+                court_names[template.format(
+                    **{v: formatting_fields_values[v] for v in formatting_fields})] = None
 
             court_names = list(court_names)
 
@@ -72,3 +73,6 @@ def generate_courts() -> None:
             court_names_dict = {"courts": court_names, "country": country_name}
 
             courts.write(json.dumps(court_names_dict) + "\n")
+
+    # Index courts for random access
+    build_jsonl_index(config.COURT_INSTANCES_PATH)
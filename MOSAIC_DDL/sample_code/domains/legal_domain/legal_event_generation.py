@@ -8,13 +8,14 @@ Date: July 2025
 """
 
 # Imports
-from sample_code.helpers_event_generation import get_random_csv_full, get_random_jsonl_entry, count_number_of_humans
+from sample_code.human_pool import get_human_pool, get_human_allocator
+from sample_code.helpers_event_generation import get_random_csv_full
+from sample_code.dataset_cache import dataset_cache
+from sample_code.jsonl_index import get_jsonl_pool
 from sample_code import config
 from typing import Union
-import pandas as pd
 import datetime
 import random
-import json
 
 
 def get_random_court_and_location() -> tuple[str, str]:
@@ -25,15 +26,9 @@ def get_random_court_and_location() -> tuple[str, str]:
         tuple[str, str]: A tuple containing the court name and location.
     """
 
-    # Choose a random row (which represents a country)
-    random_row = random.randint(0, config.E_COUNTRIES_FILE_LENGTH - 1)
-
-    # Traverse court file and pick chosen row
-    with open(config.COURT_INSTANCES_PATH, "r", encoding='utf-8') as courts:
-        for i, court in enumerate(courts):
-            if i == random_row:
-                court_entry = json.loads(court)
-                break
+    # Choose a random row (which represents a country) and read it using the index
+    court_entry = get_jsonl_pool(config.COURT_INSTANCES_PATH).sample(
+        config.E_COUNTRIES_FILE_LENGTH)
 
     # Choose a random court
     return random.choice(court_entry["courts"]), court_entry["country"]
@@ -71,25 +66,18 @@ def get_random_lawyer(court_location: str, hearing_date: str) -> str:
         str: The name of a lawyer from that location.
     """
 
-    # Storage for all lawyers of the country
-    all_lawyers_of_country = []
-
     # Extract year from date
     year_of_hearing = int(hearing_date.split("-")[2])
 
-    # Traverse human instances and search for lawyers
-    with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-        for human in humans:
-            # Fetch content
-            human_content = json.loads(human)
-
-            if human_content["occupation"] == "Lawyer" and human_content["nationality"] == court_location and (18 <= year_of_hearing - human_content["birth_year"] <= 100):
-                all_lawyers_of_country.append(human_content["name"])
+    # Query lawyers of the country
+    human_pool = get_human_pool(config.HUMAN_INSTANCES_PATH)
+    lawyer_id = human_pool.sample(
+        "Lawyer", year_of_hearing, 18, 100, nationality=court_location)
 
-    if len(all_lawyers_of_country) == 0:
+    if lawyer_id is None:
         return "Unknown"
 
-    return random.choice(all_lawyers_of_country)
+    return human_pool.names[lawyer_id]
 
 
 def get_random_judge(court_name: str, court_location: str, hearing_date: str) -> str:
@@ -105,44 +93,21 @@ def get_random_judge(court_name: str, court_location: str, hearing_date: str) ->
         str: The randomly selected judge from the selected court or country.
     """
 
-    # Storage for all judges of the court
-    all_judges_of_court = []
-
-    # Storage for random judge
-    random_judge = ""
-
     # Extract year from date
     year_of_hearing = int(hearing_date.split("-")[2])
 
-    # Traverse humans and search for judge working at the court
-    with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-        for human in humans:
-            # Fetch content
-            human_content = json.loads(human)
-
-            if human_content["occupation"] == "Judge" and human_content["is_judge_at"] == court_name and (18 <= year_of_hearing - human_content["birth_year"] <= 100):
-                all_judges_of_court.append(human_content["name"])
+    # Query judges working at the court and fall back to judges of the country
+    human_pool = get_human_pool(config.HUMAN_INSTANCES_PATH)
+    judge_id = human_pool.sample(
+        "Judge", year_of_hearing, 18, 100, employer=court_name)
+    if judge_id is None:
+        judge_id = human_pool.sample(
+            "Judge", year_of_hearing, 18, 100, nationality=court_location)
 
-    if len(all_judges_of_court) == 0:
-        # Storage for all judges of the country
-        all_judges_of_country = []
-
-        with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-            for human in humans:
-                # Fetch content
-                human_content = json.loads(human)
-
-                if human_content["occupation"] == "Judge" and human_content["nationality"] == court_location and (18 <= year_of_hearing - human_content["birth_year"] <= 100):
-                    all_judges_of_country.append(human_content["name"])
-
-        if len(all_judges_of_country) == 0:
-            random_judge = "Unknown"
-        else:
-            random_judge = random.choice(all_judges_of_country)
-    else:
-        random_judge = random.choice(all_judges_of_court)
+    if judge_id is None:
+        return "Unknown"
 
-    return random_judge
+    return human_pool.names[judge_id]
 
 
 def get_random_plaintiff_defendant(hearing_date: str) -> tuple[str, str]:
@@ -159,24 +124,16 @@ def get_random_plaintiff_defendant(hearing_date: str) -> tuple[str, str]:
     # Storage for plaintiff and defendant
     plaintiff_and_defendant = []
 
-    # Compute number of human instances
-    number_of_humans = count_number_of_humans()
+    # Fetch human allocator
+    human_allocator = get_human_allocator(config.HUMAN_INSTANCES_PATH)
 
     # Extract year from date
     year_of_hearing = int(hearing_date.split("-")[2])
 
-    # Sample until new humans are selected
+    # Allocate new humans
     while len(plaintiff_and_defendant) < 2:
-        # Sample as long as new human is selected
-        human = get_random_jsonl_entry(
-            config.HUMAN_INSTANCES_PATH, number_of_humans)
-
-        while json.dumps(human) in config.GLOBAL_HUMAN_SET or (year_of_hearing - human["birth_year"] > 100) or (year_of_hearing - human["birth_year"] < 18):
-            human = get_random_jsonl_entry(
-                config.HUMAN_INSTANCES_PATH, number_of_humans)
-
-        plaintiff_and_defendant.append(human["name"])
-        config.GLOBAL_HUMAN_SET.add(json.dumps(human))
+        plaintiff_and_defendant.append(human_allocator.human_pool.names[human_allocator.allocate_by_age(
+            year_of_hearing, 18, 100)])
 
     return plaintiff_and_defendant[0], plaintiff_and_defendant[1]
 
@@ -202,13 +159,12 @@ def generate_legal_event(entity_to_count: dict[str, int]) -> dict[str, Union[int
     plaintiff, defendant = get_random_plaintiff_defendant(hearing_date)
 
     # Extract values from cs entry
-    sentence = cs_entry["sentence"].iloc[0]
-    crime_type = cs_entry["crimetype"].iloc[0]
+    sentence = cs_entry["sentence"]
+    crime_type = cs_entry["crimetype"]
 
     # Compute case id
-    country_information = pd.read_csv(config.E_COUNTRIES_FILE_PATH)
-    country_iso_code = country_information.loc[country_information["name"]
-                                               == court_location, "iso3"].values[0]
+    country_iso_code = dataset_cache.lookup(
+        config.E_COUNTRIES_FILE_PATH, "name", court_location, "iso3")
     court_abbreviation = "".join([c for c in court_name if c.isupper()])
     case_id = f"{court_abbreviation}-{country_iso_code}-{random.randint(1, 1000000000)}"
 
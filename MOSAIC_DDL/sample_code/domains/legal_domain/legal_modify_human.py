@@ -9,6 +9,7 @@ Date: June 2025
 
 # Imports
 from sample_code.helpers_event_generation import count_number_of_humans
+from sample_code.jsonl_index import get_jsonl_pool, build_jsonl_index
 from sample_code import config
 from tqdm import tqdm
 import random
@@ -24,6 +25,9 @@ def legal_modify_human() -> None:
     # Count number of humans
     number_of_humans = count_number_of_humans()
 
+    # Open courts using the index
+    court_pool = get_jsonl_pool(config.COURT_INSTANCES_PATH)
+
     # Iterate through humans
     with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans, open(config.HUMAN_INSTANCES_TEMPORARY_PATH, "w", encoding='utf-8') as humans_temporary:
         for human in tqdm(humans, total=number_of_humans, desc=f"{'\033[34m'}Applying modifications for legal domain...{'\033[0m'}"):
@@ -32,19 +36,15 @@ def legal_modify_human() -> None:
 
             if human_content["occupation"] == "Judge":
                 # Search courts from his country
-                with open(config.COURT_INSTANCES_PATH, "r", encoding='utf-8') as courts:
-                    for court in courts:
-                        # Fetch content
-                        court_content = json.loads(court)
-
-                        if court_content["country"] == human_content["nationality"]:
-                            # Choose a random court
-                            random_court = random.choice(
-                                court_content["courts"])
-
-                            # Assign new attribute to human
-                            human_content["is_judge_at"] = random_court
-                            break
+                court_content = court_pool.find(
+                    "country", human_content["nationality"])
+                if court_content is not None:
+                    # Choose a random court
+                    random_court = random.choice(
+                        court_content["courts"])
+
+                    # Assign new attribute to human
+                    human_content["is_judge_at"] = random_court
                 humans_temporary.write(json.dumps(human_content) + "\n")
             else:
                 humans_temporary.write(json.dumps(human_content) + "\n")
@@ -52,3 +52,6 @@ def legal_modify_human() -> None:
     # Overwrite old file
     os.replace(config.HUMAN_INSTANCES_TEMPORARY_PATH,
                config.HUMAN_INSTANCES_PATH)
+
+    # Index modified humans
+    build_jsonl_index(config.HUMAN_INSTANCES_PATH)
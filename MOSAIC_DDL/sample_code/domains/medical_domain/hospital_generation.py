@@ -9,6 +9,7 @@ Date: June 2025
 
 # Imports
 from sample_code.helpers_event_generation import extract_formatting_fields
+from sample_code.jsonl_index import build_jsonl_index
 from sample_code import config
 import random
 import json
@@ -57,7 +58,7 @@ def generate_hospitals() -> None:
                 1, config.MAX_NUMBER_OF_NATIONAL_HOSPITALS_PER_COUNTRY)
 
             # Compute local hospitals
-            local_hospital_names = set()
+            local_hospital_names = {}
             while (len(local_hospital_names) < number_of_local_hospitals):
                 # Fetch random template and extract formatting fields
                 template = random.choice(local_template)
@@ -67,13 +68,13 @@ def generate_hospitals() -> None:
                 formatting_fields_values = {"directions": random.choice(directions), "districts": random.choice(
                     districts), "regions": random.choice(regions), "descriptors": random.choice(descriptors), "country": country_name}
 
-                local_hospital_names.add(template.format(
-                    **{v: formatting_fields_values[v] for v in formatting_fields}))
+                local_hospital_names[template.format(
+                    **{v: formatting_fields_values[v] for v in formatting_fields})] = None
 
             local_hospital_names = list(local_hospital_names)
 
             # Compute regional hospitals
-            regional_hospital_names = set()
+            regional_hospital_names = {}
             while (len(regional_hospital_names) < number_of_regional_hospitals):
                 # Fetch random template and extract formatting fields
                 template = random.choice(regional_template)
@@ -83,13 +84,13 @@ def generate_hospitals() -> None:
                 formatting_fields_values = {"directions": random.choice(directions), "districts": random.choice(
                     districts), "regions": random.choice(regions), "descriptors": random.choice(descriptors), "country": country_name}
 
-                regional_hospital_names.add(template.format(
-                    **{v: formatting_fields_values[v] for v in formatting_fields}))
+                regional_hospital_names[template.format(
+                    **{v: formatting_fields_values[v] for v in formatting_fields})] = None
 
             regional_hospital_names = list(regional_hospital_names)
 
             # Compute national hospitals
-            national_hospital_names = set()
+            national_hospital_names = {}
             while (len(national_hospital_names) < number_of_national_hospitals):
                 # Fetch random template and extract formatting fields
                 template = random.choice(national_template)
@@ -99,8 +100,8 @@ def generate_hospitals() -> None:
                 formatting_fields_values = {"directions": random.choice(directions), "districts": random.choice(
                     districts), "regions": random.choice(regions), "descriptors": random.choice(descriptors), "country": country_name}
 
-                national_hospital_names.add(template.format(
-                    **{v: formatting_fields_values[v] for v in formatting_fields}))
+                national_hospital_names[template.format(
+                    **{v: formatting_fields_values[v] for v in formatting_fields})] = None
 
             national_hospital_names = list(national_hospital_names)
 
@@ -109,3 +110,6 @@ def generate_hospitals() -> None:
                               "national_hospitals": national_hospital_names, "country": country_name}
 
             hospitals.write(json.dumps(hospitals_dict) + "\n")
+
+    # Index hospitals for random access
+    build_jsonl_index(config.HOSPITAL_INSTANCES_PATH)
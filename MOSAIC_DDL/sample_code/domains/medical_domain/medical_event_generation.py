@@ -8,12 +8,13 @@ Date: July 2025
 """
 
 # Imports
-from sample_code.helpers_event_generation import get_random_csv_full, get_random_jsonl_entry, count_number_of_humans
+from sample_code.human_pool import get_human_pool, get_human_allocator
+from sample_code.helpers_event_generation import get_random_csv_full
+from sample_code.jsonl_index import get_jsonl_pool
 from sample_code import config
 from typing import Union
 import datetime
 import random
-import json
 
 
 def get_random_hospital_and_location() -> tuple[str, str]:
@@ -21,14 +22,9 @@ def get_random_hospital_and_location() -> tuple[str, str]:
     Returns the name of a random hospital and the country it is located in.
     """
 
-    # Choose random row (which represents a country)
-    random_row = random.randint(0, config.E_COUNTRIES_FILE_LENGTH - 1)
-
-    # Traverse hospitals file and pick chosen row
-    with open(config.HOSPITAL_INSTANCES_PATH, "r", encoding='utf-8') as hospitals:
-        for i, hospital_lists in enumerate(hospitals):
-            if i == random_row:
-                hospital_entry = json.loads(hospital_lists)
+    # Choose a random row (which represents a country) and read it using the index
+    hospital_entry = get_jsonl_pool(config.HOSPITAL_INSTANCES_PATH).sample(
+        config.E_COUNTRIES_FILE_LENGTH)
 
     # Choose random hospital type
     random_hospital_type = random.choice(
@@ -71,44 +67,21 @@ def get_random_doctor(hospital_name: str, hospital_location: str, date_of_visit:
         str: The name of a doctor from the corresponding hospital or a random doctor.
     """
 
-    # Storage for all doctors of the hospital
-    all_doctors_of_hospital = []
-
-    # Storage for random doctor
-    random_doctor = ""
-
     # Extract year from date
     year_of_visit = int(date_of_visit.split("-")[2])
 
-    # Traverse humans and search for doctor working at the hospital
-    with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-        for human in humans:
-            # Fetch content
-            human_content = json.loads(human)
-
-            if human_content["occupation"] == "Doctor" and human_content["works_at"] == hospital_name and (18 <= year_of_visit - human_content["birth_year"] <= 100):
-                all_doctors_of_hospital.append(human_content["name"])
-
-    if len(all_doctors_of_hospital) == 0:
-        # Storage for all doctors of the country
-        all_doctors_of_country = []
+    # Query doctors working at the hospital and fall back to doctors of the country
+    human_pool = get_human_pool(config.HUMAN_INSTANCES_PATH)
+    doctor_id = human_pool.sample(
+        "Doctor", year_of_visit, 18, 100, employer=hospital_name)
+    if doctor_id is None:
+        doctor_id = human_pool.sample(
+            "Doctor", year_of_visit, 18, 100, nationality=hospital_location)
 
-        with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-            for human in humans:
-                # Fetch content
-                human_content = json.loads(human)
+    if doctor_id is None:
+        return "Unknown"
 
-                if human_content["occupation"] == "Doctor" and human_content["nationality"] == hospital_location and (18 <= year_of_visit - human_content["birth_year"] <= 100):
-                    all_doctors_of_country.append(human_content["name"])
-
-        if len(all_doctors_of_country) == 0:
-            random_doctor = "Unknown"
-        else:
-            random_doctor = random.choice(all_doctors_of_country)
-    else:
-        random_doctor = random.choice(all_doctors_of_hospital)
-
-    return random_doctor
+    return human_pool.names[doctor_id]
 
 
 def get_random_patient(date_of_visit: str) -> dict[str, Union[str, int]]:
@@ -125,22 +98,15 @@ def get_random_patient(date_of_visit: str) -> dict[str, Union[str, int]]:
     # Storage for random patient
     random_patient = ""
 
-    # Compute number of human instances
-    number_of_humans = count_number_of_humans()
+    # Fetch human allocator
+    human_allocator = get_human_allocator(config.HUMAN_INSTANCES_PATH)
 
     # Extract year from date
     year_of_visit = int(date_of_visit.split("-")[2])
 
-    # Sample until new human is selected
-    human = get_random_jsonl_entry(
-        config.HUMAN_INSTANCES_PATH, number_of_humans)
-
-    while json.dumps(human) in config.GLOBAL_HUMAN_SET or (year_of_visit - human["birth_year"] > 100) or (year_of_visit - human["birth_year"] < 18):
-        human = get_random_jsonl_entry(
-            config.HUMAN_INSTANCES_PATH, number_of_humans)
-
-    random_patient = human["name"]
-    config.GLOBAL_HUMAN_SET.add(json.dumps(human))
+    # Allocate new human
+    random_patient = human_allocator.human_pool.names[human_allocator.allocate_by_age(
+        year_of_visit, 18, 100)]
 
     return random_patient
 
@@ -166,9 +132,9 @@ def generate_medical_event(entity_to_count: dict[str, int]) -> dict[str, Union[i
     patient_name = get_random_patient(date_of_visit)
 
     # Extract values from scm entry
-    condition = csm_entry["condition"].iloc[0]
-    symptoms = csm_entry["symptoms"].iloc[0]
-    medication = csm_entry["medication"].iloc[0]
+    condition = csm_entry["condition"]
+    symptoms = csm_entry["symptoms"]
+    medication = csm_entry["medication"]
 
     # Assemble dictionary
     event = {"medical.hospital_name": hospital_name, "medical.date_of_visit": date_of_visit, "medical.doctors_name": doctor_name,
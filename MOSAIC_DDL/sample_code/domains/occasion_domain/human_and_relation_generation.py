@@ -9,17 +9,16 @@ Date: July 2025
 
 # Imports
 from sample_code.helpers_event_generation import get_random_csv_entry, get_unique_values_from_function
+from sample_code.first_name_table import get_first_name_table
+from sample_code.country_registry import get_country_registry
+from sample_code.jsonl_index import build_jsonl_index
 from sample_code import config
 from typing import Self
 from tqdm import tqdm
-import pandas as pd
-import secrets
 import random
 import string
 import json
 import csv
-import ast
-import os
 
 
 class Human:
@@ -114,45 +113,40 @@ def form_marriage(spouse1: Human, spouse2: Human, last_name_from_husband: float
     return husband, wife
 
 
-def get_random_first_name_and_gender() -> tuple[str, str]:
+def get_random_first_name_and_gender(gender: str = None) -> tuple[str, str]:
     """
     Returns a random first name.
 
+    Parameters:
+        gender (str): The gender of the first name (random if None).
+
     Returns:
         [str, str]: The randomly selected first name and its gender.
     """
 
-    # Get .txt files which store the first names.
-    txt_files = [file for file in os.listdir(
-        config.H_FIRST_NAMES_FOLDER_PATH) if file.endswith('.txt')]
-
-    # Choose a random .txt file and generate the path to it
-    random_txt_file = random.choice(txt_files)
-    random_txt_file_path = os.path.join(
-        config.H_FIRST_NAMES_FOLDER_PATH, random_txt_file)
-
-    # Read all entries and select a random entry
-    with open(random_txt_file_path, 'r', encoding='utf-8') as file:
-        entries = file.readlines()
-    random_entry = random.choice(entries).strip().split(',')
+    # Fetch first name table (loaded once)
+    first_name_table = get_first_name_table(config.H_FIRST_NAMES_FOLDER_PATH)
 
-    # Create first name and gender
-    first_name = random_entry[0]
-    gender = "male" if random_entry[1] == 'M' else "female"
+    # Draw first name of the gender or of a random gender
+    if gender is not None:
+        return first_name_table.sample(gender), gender
 
-    return first_name, gender
+    return first_name_table.sample_with_gender()
 
 
-def get_random_name_and_gender() -> tuple[str, str]:
+def get_random_name_and_gender(gender: str = None) -> tuple[str, str]:
     """
     Fetches first and last name and returns full name as well as its gender.
 
+    Parameters:
+        gender (str): The gender of the name (random if None).
+
     Returns:
         tuple[str, str]: The random name and the gender
     """
 
     # Fetch values
-    first_name, gender = get_random_first_name_and_gender()
+    first_name, gender = get_random_first_name_and_gender(gender)
     last_name = str(get_random_csv_entry(
         config.H_SURNAMES_FILE_PATH, config.H_SURNAMES_FILE_LENGTH, "name")).capitalize()
 
@@ -173,31 +167,12 @@ def get_random_politics_religion_given_nationality(nationality: str) -> tuple[st
         tuple[str, str, str]: A tuple containing the nationality, the political and religous affiliation.
     """
 
-    # Storage for full csv row
-    crrp_entry = dict()
-
-    # Fetch line corresponding to nationality
-    with open(config.COUNTRY_REGION_RELIGION_POLITICS_FILE_PATH, "r", encoding='utf-8') as crrps:
-        # Instantiate reader for csv
-        crrp_reader = csv.reader(crrps)
+    # Fetch precomputed religions and politics of nationality
+    country_registry = get_country_registry()
 
-        for crrp in crrp_reader:
-            if crrp[0].strip() == nationality:
-                crrp_entry = crrp
-                break
-
-    # Collect religion dictionary
-    religions = json.loads(crrp_entry[2])
-
-    # Sample random religion
-    random_religion = random.choices(
-        list(religions.keys()), list(religions.values()), k=1)[0]
-
-    # Collect politics list
-    politics = ast.literal_eval(crrp_entry[3])
-
-    # Sample random politics
-    random_politics = random.choice(politics)
+    # Sample random religion and politics
+    random_religion = country_registry.sample_religion(nationality)
+    random_politics = country_registry.sample_politics(nationality)
 
     return random_politics, random_religion
 
@@ -214,10 +189,7 @@ def get_random_phone_number(nationality: str) -> str:
     """
 
     # Look up nationality in countries dataset and extract phone code
-    country_information = pd.read_csv(config.E_COUNTRIES_FILE_PATH)
-    phone_code = ""
-    phone_code = country_information.loc[country_information["name"]
-                                         == nationality, "phone_code"].values[0]
+    phone_code = get_country_registry().phone_code(nationality)
 
     # Generate random digits
     random_digits = f"{random.randint(0, 999999999):09d}"
@@ -245,10 +217,10 @@ def get_random_email_address() -> str:
 
     # Compute local part
     if multiple_prefixes:
-        local_part = ''.join(secrets.choice(character) for _ in range(
-            6)) + "." + ''.join(secrets.choice(character) for _ in range(10))
+        local_part = ''.join(random.choice(character) for _ in range(
+            6)) + "." + ''.join(random.choice(character) for _ in range(10))
     else:
-        local_part = ''.join(secrets.choice(character) for _ in range(10))
+        local_part = ''.join(random.choice(character) for _ in range(10))
 
     # Compute domain
     domain = random.choice(["gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "icloud.com", "aol.com", "protonmail.com", "zoho.com", "mail.com", "yandex.com", "msn.com", "mail.ru", "fastmail.com", "tutanota.com", "gmx.com", "inbox.com", "lavabit.com", "gmane.org", "usa.com", "hushmail.com", "126.com", "163.com", "qq.com", "sina.com", "live.com", "rediffmail.com", "rakuten.com", "bol.com", "rocketmail.com", "juno.com", "lycos.com", "aim.com", "zoho.eu", "cox.net", "charter.net", "comcast.net", "sbcglobal.net", "frontier.com", "netzero.com", "bellsouth.net", "earthlink.net", "pacbell.net", "videotron.ca", "shaw.ca", "rogers.com", "tiscali.it", "telstra.com.au", "optusnet.com.au", "kpnmail.nl", "t-online.de", "mailchimp.com", "icloud.co.uk", "fastmail.fm", "neomailbox.com", "posteo.de", "zoho.in", "ymail.com", "bigpond.com", "btinternet.com", "alibaba.com"
@@ -275,10 +247,7 @@ def create_human(nationality: str, birth_year: int, gender_provided: str, last_n
     """
 
     # Fetch values
-    name, gender = get_random_name_and_gender()
-
-    while gender != gender_provided:
-        name, gender = get_random_name_and_gender()
+    name, gender = get_random_name_and_gender(gender_provided)
 
     birth_year = birth_year
     occupation = get_random_csv_entry(
@@ -298,9 +267,7 @@ def create_human(nationality: str, birth_year: int, gender_provided: str, last_n
         name = " ".join(name.strip().split()[:-1] + [last_name])
 
     # Compute passport number
-    country_information = pd.read_csv(config.E_COUNTRIES_FILE_PATH)
-    country_iso_code = country_information.loc[country_information["name"]
-                                               == nationality, "iso3"].values[0]
+    country_iso_code = get_country_registry().iso3(nationality)
     passport_number = f"PN-{country_iso_code}-{random.randint(1, 8000000000)}"
 
     # Compute social media platforms
@@ -591,3 +558,6 @@ def generate_humans() -> None:
                      "religious_affiliation": h.religious_affiliation, "father": h.father.name if h.father else "Unknown", "mother": h.mother.name if h.mother else "Unknown", "spouse": h.spouse.name if isinstance(h.spouse, Human) else "Single", "passport_number": h.passport_number, "phone_number": h.phone_number, "email_address": h.email_address}
 
             human_instances.write(json.dumps(human) + "\n")
+
+    # Index humans for random access
+    build_jsonl_index(config.HUMAN_INSTANCES_PATH)
@@ -8,9 +8,8 @@ Date: July 2025
 """
 
 # Imports
-from sample_code import config
+from sample_code.country_registry import get_country_registry
 from typing import Union
-import pandas as pd
 import random
 
 
@@ -29,22 +28,15 @@ def get_random_species_age_endangered_origin(location: str) -> tuple[str, int, s
     country = location.split(",")[2]
 
     # Extract region from country
-    country_information = pd.read_csv(
-        config.COUNTRY_REGION_RELIGION_POLITICS_FILE_PATH)
-    region = country_information.loc[country_information["country"]
-                                     == country, "region"].values[0]
-
-    # Find all animals from said region
-    animal_information = pd.read_csv(
-        config.SPECIES_REGION_LIFETIME_ENDANGERED_FILE_PATH)
-    animals_matching_region = animal_information.loc[animal_information["region"] == region]
-
-    # Sample random animal and extract fields
-    random_animal = animals_matching_region.sample(n=1)
-    species = random_animal.iloc[0]["species"]
-    age_range = random_animal.iloc[0]["lifetime"].split("-")
+    country_registry = get_country_registry()
+    region = country_registry.region(country)
+
+    # Sample random animal from said region and extract fields
+    random_animal = country_registry.sample_species(region)
+    species = random_animal["species"]
+    age_range = random_animal["lifetime"].split("-")
     age = random.randint(int(age_range[0]), int(age_range[1]))
-    endangered = random_animal.iloc[0]["endangered"]
+    endangered = random_animal["endangered"]
 
     return species, age, endangered, region
 
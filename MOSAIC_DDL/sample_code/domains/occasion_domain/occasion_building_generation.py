@@ -8,9 +8,9 @@ Date: July 2025
 """
 
 # Imports
+from sample_code.dataset_cache import dataset_cache
 from sample_code import config
 from typing import Union
-import pandas as pd
 import random
 
 
@@ -28,19 +28,14 @@ def get_random_type_construction_floors(date: str) -> tuple[str, str, str]:
     # Extract year from date
     event_year = date.split("-")[2]
 
-    # Find all buildings with construction year before event date
-    building_information = pd.read_csv(
-        config.TYPE_CONSTRUCTION_FLOORS_FILE_PATH)
-    buildings_matching_date = building_information.loc[building_information["construction"] <= int(
-        event_year)]
-
-    # Sample random building and extract fields
-    random_building = buildings_matching_date.sample(n=1)
-    btype = random_building.iloc[0]["type"]
-    first_construction_year = random_building.iloc[0]["construction"]
+    # Sample random building with construction year before event date and extract fields
+    random_building = dataset_cache.get(config.TYPE_CONSTRUCTION_FLOORS_FILE_PATH).sample_row_where_at_most(
+        "construction", int(event_year))
+    btype = random_building["type"]
+    first_construction_year = random_building["construction"]
     construction_year = random.randint(
         int(first_construction_year), int(event_year))
-    floors = random_building.iloc[0]["floors"]
+    floors = random_building["floors"]
 
     return btype, construction_year, str(floors)
 
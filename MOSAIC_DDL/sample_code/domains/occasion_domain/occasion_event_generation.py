@@ -13,13 +13,13 @@ from sample_code.domains.occasion_domain.occasion_building_generation import gen
 from sample_code.domains.occasion_domain.occasion_vehicle_generation import generate_vehicles
 from sample_code.domains.occasion_domain.occasion_animal_generation import generate_animals
 from sample_code.domains.occasion_domain.occasion_object_generation import generate_objects
-from sample_code.helpers_event_generation import get_random_csv_entry, count_number_of_humans, get_random_jsonl_entry
+from sample_code.helpers_event_generation import get_random_csv_entry
+from sample_code.human_pool import get_human_allocator
+from sample_code.dataset_cache import dataset_cache
 from sample_code import config
 from typing import Union
-import pandas as pd
 import datetime
 import random
-import json
 
 
 def get_random_location() -> str:
@@ -30,22 +30,14 @@ def get_random_location() -> str:
         str: The random location as "city,state_name,country_name".
     """
 
-    # Read .csv header
-    cities_header = pd.read_csv(config.E_CITIES_FILE_PATH, nrows=0)
-    cities_column_names = cities_header.columns.tolist()
-
-    # Choose random entry in .csv
-    random_offset = random.randint(1, config.E_CITIES_FILE_LENGTH)
-    cities_full_entry = pd.read_csv(
-        config.E_CITIES_FILE_PATH, skiprows=random_offset, nrows=1, header=None)
-
-    # Assign initial .csv header
-    cities_full_entry.columns = cities_column_names
+    # Choose random entry in cached .csv
+    cities_full_entry = dataset_cache.sample_row(
+        config.E_CITIES_FILE_PATH, config.E_CITIES_FILE_LENGTH)
 
     # Construct location
-    location = cities_full_entry.at[0, "name"] + "," + \
-        cities_full_entry.at[0, "state_name"] + "," + \
-        cities_full_entry.at[0, "country_name"]
+    location = cities_full_entry["name"] + "," + \
+        cities_full_entry["state_name"] + "," + \
+        cities_full_entry["country_name"]
 
     return location
 
@@ -146,20 +138,13 @@ def generate_occasion_event(entity_to_count: dict[str, str]) -> dict[str, Union[
         config.E_SPECIAL_CONDITIONS_FILE_PATH, config.E_SPECIAL_CONDITIONS_FILE_LENGTH, "e_special_conditions")
 
     # Fetch human, anmial, vehicle, object, building and infrastructure instances
-    number_of_humans = count_number_of_humans()
+    human_allocator = get_human_allocator(config.HUMAN_INSTANCES_PATH)
     current_event_year = int(date.split("-")[2])
     humans = []
     while len(humans) < entity_to_count["occasion.humans"]:
-        # Sample as long as new human is selected
-        human = get_random_jsonl_entry(
-            config.HUMAN_INSTANCES_PATH, number_of_humans)
-
-        while json.dumps(human) in config.GLOBAL_HUMAN_SET or (current_event_year - human["birth_year"] > 100) or (current_event_year - human["birth_year"] < 18):
-            human = get_random_jsonl_entry(
-                config.HUMAN_INSTANCES_PATH, number_of_humans)
-
-        config.GLOBAL_HUMAN_SET.add(json.dumps(human))
-        humans.append(human)
+        # Allocate new human
+        humans.append(human_allocator.human_pool.record(
+            human_allocator.allocate_by_age(current_event_year, 18, 100)))
     humans = [{f"occasion.humans.{key}": value for key, value in human.items()}
               for human in humans]
 
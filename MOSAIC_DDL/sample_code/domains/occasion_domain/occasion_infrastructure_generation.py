@@ -8,9 +8,9 @@ Date: July 2025
 """
 
 # Imports
+from sample_code.dataset_cache import dataset_cache
 from sample_code import config
 from typing import Union
-import pandas as pd
 import random
 
 
@@ -28,20 +28,15 @@ def get_random_type_construction_capacity_safety(date: str) -> tuple[str, str, s
     # Extract year from date
     event_year = date.split("-")[2]
 
-    # Find all infrastructure with construction year before event date
-    infrastructure_information = pd.read_csv(
-        config.TYPE_CONSTRUCTION_CAPACITY_SAFETY_FILE_PATH)
-    infrastructure_matching_date = infrastructure_information.loc[infrastructure_information["construction"] <= int(
-        event_year)]
-
-    # Sample random infrastructure and extract fields
-    random_infrastructure = infrastructure_matching_date.sample(n=1)
-    itype = random_infrastructure.iloc[0]["type"]
-    first_construction_year = random_infrastructure.iloc[0]["construction"]
+    # Sample random infrastructure with construction year before event date and extract fields
+    random_infrastructure = dataset_cache.get(config.TYPE_CONSTRUCTION_CAPACITY_SAFETY_FILE_PATH).sample_row_where_at_most(
+        "construction", int(event_year))
+    itype = random_infrastructure["type"]
+    first_construction_year = random_infrastructure["construction"]
     construction_year = random.randint(
         int(first_construction_year), int(event_year))
-    capacity = random_infrastructure.iloc[0]["capacity"]
-    safety = random_infrastructure.iloc[0]["safety"]
+    capacity = random_infrastructure["capacity"]
+    safety = random_infrastructure["safety"]
 
     return itype, str(construction_year), str(capacity), safety
 
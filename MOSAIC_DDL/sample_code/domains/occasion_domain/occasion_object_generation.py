@@ -10,9 +10,9 @@ Date: July 2025
 # Imports
 from sample_code.helpers_event_generation import get_random_csv_entry
 import matplotlib.colors as colors
+from sample_code.dataset_cache import dataset_cache
 from sample_code import config
 from typing import Union
-import pandas as pd
 import random
 
 
@@ -30,20 +30,15 @@ def get_random_name_size_production_value(date: str) -> tuple[str, str, str, str
     # Extract year from date
     event_year = date.split("-")[2]
 
-    # Find all objects with production year before event date
-    object_information = pd.read_csv(
-        config.NAME_SIZE_PRODUCTION_VALUE_FILE_PATH)
-    objects_matching_date = object_information.loc[object_information["production"] <= int(
-        event_year)]
-
-    # Sample random object and extract fields
-    random_object = objects_matching_date.sample(n=1)
-    name = random_object.iloc[0]["name"]
-    size = random_object.iloc[0]["size"]
-    first_production_year = random_object.iloc[0]["production"]
+    # Sample random object with production year before event date and extract fields
+    random_object = dataset_cache.get(config.NAME_SIZE_PRODUCTION_VALUE_FILE_PATH).sample_row_where_at_most(
+        "production", int(event_year))
+    name = random_object["name"]
+    size = random_object["size"]
+    first_production_year = random_object["production"]
     production_year = random.randint(
         int(first_production_year), int(event_year))
-    value = random_object.iloc[0]["value"]
+    value = random_object["value"]
 
     return name, size, str(production_year), str(value)
 
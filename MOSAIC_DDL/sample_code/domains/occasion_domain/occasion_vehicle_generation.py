@@ -9,11 +9,12 @@ Date: July 2025
 
 # Imports
 from sample_code.helpers_event_generation import get_random_csv_entry, get_unique_values_from_function
+from sample_code.country_registry import get_country_registry
 import matplotlib.colors as colors
+from sample_code.dataset_cache import dataset_cache
 from sample_code import config
 from typing import Union
 from faker import Faker
-import pandas as pd
 import random
 
 # Initialize handlers for packages
@@ -34,20 +35,15 @@ def get_random_type_manufacturer_production_fuel(date: str) -> tuple[str, str, s
     # Extract year from date
     event_year = date.split("-")[2]
 
-    # Find all vehicles with production year before event date
-    vehicle_information = pd.read_csv(
-        config.TYPE_MANUFACTURER_PRODUCTION_FUEL_FILE_PATH)
-    vehicles_matching_date = vehicle_information.loc[vehicle_information["production"] <= int(
-        event_year)]
-
-    # Sample random vehicle and extract fields
-    random_vehicle = vehicles_matching_date.sample(n=1)
-    vtype = random_vehicle.iloc[0]["type"]
-    manufacturer = random_vehicle.iloc[0]["manufacturer"]
-    first_production_year = random_vehicle.iloc[0]["production"]
+    # Sample random vehicle with production year before event date and extract fields
+    random_vehicle = dataset_cache.get(config.TYPE_MANUFACTURER_PRODUCTION_FUEL_FILE_PATH).sample_row_where_at_most(
+        "production", int(event_year))
+    vtype = random_vehicle["type"]
+    manufacturer = random_vehicle["manufacturer"]
+    first_production_year = random_vehicle["production"]
     production_year = random.randint(
         int(first_production_year), int(event_year))
-    fuel_type = random_vehicle.iloc[0]["fuel"]
+    fuel_type = random_vehicle["fuel"]
 
     return vtype, manufacturer, str(production_year), fuel_type
 
@@ -78,9 +74,7 @@ def get_random_license_plate(location: str) -> str:
     country = location.split(",")[2]
 
     # Get country code
-    country_information = pd.read_csv(config.E_COUNTRIES_FILE_PATH)
-    country_iso_code = country_information.loc[country_information["name"]
-                                               == country, "iso3"].values[0]
+    country_iso_code = get_country_registry().iso3(country)
 
     # Construct license plate
     license_plate = f"LP-{country_iso_code}-{random.randint(0, 999999999):09d}"
@@ -96,6 +90,9 @@ def get_random_vin() -> str:
         str: The random vin.
     """
 
+    # Seed Faker from the (seeded) random module such that the vin is reproducible
+    fake.seed_instance(random.getrandbits(64))
+
     return fake.vin()
 
 
@@ -131,9 +128,7 @@ def generate_vehicles(location: str, date: str, count: int) -> list[dict[str, Un
 
         # Compute license plate number
         country = location.split(",")[2]
-        country_information = pd.read_csv(config.E_COUNTRIES_FILE_PATH)
-        country_iso_code = country_information.loc[country_information["name"]
-                                                   == country, "iso3"].values[0]
+        country_iso_code = get_country_registry().iso3(country)
         license_plate_number = f"LP-{country_iso_code}-{all_license_plate_numbers[vehicle_index]:09d}"
 
         vin = all_vins[vehicle_index]
@@ -8,12 +8,12 @@ Date: July 2025
 """
 
 # Imports
-from sample_code.helpers_event_generation import extract_formatting_fields, count_number_of_humans, get_random_jsonl_entry
+from sample_code.helpers_event_generation import extract_formatting_fields
+from sample_code.human_pool import get_human_allocator
+from sample_code.dataset_cache import dataset_cache
 from sample_code import config
 from typing import Union
 import random
-import json
-import csv
 
 
 def get_random_time() -> str:
@@ -44,7 +44,8 @@ def get_random_topic() -> str:
     """
 
     # Create artificial naming blocks (naming blocks content generated with the helpf of ChatGPT)
-    topics = [row[0] for row in csv.reader(open(config.A_TOPICS_FILE_PATH))]
+    topics = dataset_cache.get(
+        config.A_TOPICS_FILE_PATH, header=False).columns[0]
     modifiers = ["honest", "real", "raw", "vulernable", "controversial", "lighthearted", "data-driven", "inspiring", "actionable", "emotional", "relatable", "snarky", "educational", "uplifting",
                  "reflective", "quick", "detailed", "minimalist", "pragmatic", "visual", "funny", "sarcastic", "experimental", "underrated", "overrated", "evidence-based", "well-researched", "personal", "provocative"]
     audiences = ["for beginners", "for professionals", "for students", "for creators", "for parents",
@@ -75,18 +76,10 @@ def get_random_platform_and_username_and_location() -> tuple[str, str, str]:
         tuple[str, str, str]: A tuple containing the platform, username and location.
     """
 
-    # Compute number of human instances
-    number_of_humans = count_number_of_humans()
-
-    # Sample until new human is selected
-    human = get_random_jsonl_entry(
-        config.HUMAN_INSTANCES_PATH, number_of_humans)
-
-    while json.dumps(human) in config.GLOBAL_HUMAN_SET or human["birth_year"] < 1935:
-        human = get_random_jsonl_entry(
-            config.HUMAN_INSTANCES_PATH, number_of_humans)
-
-    config.GLOBAL_HUMAN_SET.add(json.dumps(human))
+    # Allocate new human (born 1935 or later)
+    human_allocator = get_human_allocator(config.HUMAN_INSTANCES_PATH)
+    human = human_allocator.human_pool.record(
+        human_allocator.allocate(minimum_birth_year=1935))
 
     # Random index for platform/username
     random_index = random.randint(0, len(human["social_media_platforms"]) - 1)
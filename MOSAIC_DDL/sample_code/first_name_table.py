@@ -0,0 +1,115 @@
+"""
+first_name_table.py
+
+This module contains the process-wide table of the first names, which is loaded once from the first names folder and partitioned by gender such that a first name of a given gender can be drawn without reading any file.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from itertools import accumulate
+import numpy as np
+import random
+import os
+
+# Genders of the first names files
+GENDERS = {"M": "male", "F": "female"}
+
+
+class FirstNameTable:
+    def __init__(self, folder_path: str) -> None:
+        """
+        Loads all .txt files of the folder and stores the first names of every file partitioned by gender.
+
+        Parameters:
+            folder_path (str): The path to the folder storing the first names .txt files.
+        """
+        self.folder_path = folder_path
+
+        # Storage for the first names per gender (all files concatenated) and the slice of each file in them
+        names = {gender: [] for gender in GENDERS.values()}
+        self.file_starts = {gender: [] for gender in GENDERS.values()}
+        self.file_counts = {gender: [] for gender in GENDERS.values()}
+        self.file_lengths = []
+
+        for txt_file in sorted(file for file in os.listdir(folder_path) if file.endswith('.txt')):
+            # Read entries of file
+            with open(os.path.join(folder_path, txt_file), 'r', encoding='utf-8') as file:
+                entries = [entry.strip().split(',') for entry in file]
+
+            # Partition first names of file by gender
+            for gender in GENDERS.values():
+                self.file_starts[gender].append(len(names[gender]))
+            for entry in entries:
+                names[GENDERS[entry[1]]].append(entry[0])
+            for gender in GENDERS.values():
+                self.file_counts[gender].append(
+                    len(names[gender]) - self.file_starts[gender][-1])
+            self.file_lengths.append(len(entries))
+
+        self.names = {gender: np.array(gender_names, dtype=object)
+                      for gender, gender_names in names.items()}
+
+        # Every file is chosen with the same probability and every entry of a file with probability 1 / length of file, hence (given the gender) a file is chosen with weight (number of entries of the gender / length of file)
+        self.file_indices = list(range(len(self.file_lengths)))
+        self.cumulative_file_weights = {gender: list(accumulate(count / length for count, length in zip(
+            self.file_counts[gender], self.file_lengths))) for gender in GENDERS.values()}
+
+    def sample(self, gender: str) -> str:
+        """
+        Returns a random first name of the gender (distributed as if entries of random files were drawn until the gender matches).
+
+        Parameters:
+            gender (str): The gender of the first name ("male" or "female").
+
+        Returns:
+            str: The random first name.
+        """
+
+        # Choose file, then entry of the gender within the file
+        file_index = random.choices(
+            self.file_indices, cum_weights=self.cumulative_file_weights[gender], k=1)[0]
+
+        return self.names[gender][self.file_starts[gender][file_index] + random.randrange(self.file_counts[gender][file_index])]
+
+    def sample_with_gender(self) -> tuple[str, str]:
+        """
+        Returns a random first name of a random file together with its gender.
+
+        Returns:
+            tuple[str, str]: The random first name and its gender.
+        """
+
+        # Choose file, then entry within the file
+        file_index = random.choice(self.file_indices)
+        entry_index = random.randrange(self.file_lengths[file_index])
+
+        # The first entries of the file are assigned to the first gender, the remaining ones to the second gender
+        for gender in GENDERS.values():
+            if entry_index < self.file_counts[gender][file_index]:
+                return self.names[gender][self.file_starts[gender][file_index] + entry_index], gender
+            entry_index -= self.file_counts[gender][file_index]
+
+
+# Process-wide first name table
+first_name_table = None
+
+
+def get_first_name_table(folder_path: str) -> FirstNameTable:
+    """
+    Returns the table of the first names, loading it on first use.
+
+    Parameters:
+        folder_path (str): The path to the folder storing the first names .txt files.
+
+    Returns:
+        FirstNameTable: The first name table.
+    """
+
+    global first_name_table
+
+    if first_name_table is None or first_name_table.folder_path != folder_path:
+        first_name_table = FirstNameTable(folder_path)
+
+    return first_name_table
@@ -9,12 +9,11 @@ Date: June 2025
 
 # Imports
 from typing import Callable, TypeVar, Any, Generator
+from sample_code.dataset_cache import dataset_cache
+from sample_code.jsonl_index import get_jsonl_pool
 from sample_code import config
 from typing import Union
-import pandas as pd
-import random
 import string
-import json
 
 # Type variable
 T = TypeVar('T')
@@ -33,20 +32,9 @@ def get_random_csv_entry(file_path: str, file_length: int, column_name: str) ->
         str: The random entry of the .csv file.
     """
 
-    # Read .csv header
-    header = pd.read_csv(file_path, nrows=0)
-    column_names = header.columns.tolist()
-
-    # Choose random entry in .csv
-    random_offset = random.randint(1, file_length)
-    full_entry = pd.read_csv(
-        file_path, skiprows=random_offset, nrows=1, header=None)
-
-    # Assign initial .csv header
-    full_entry.columns = column_names
-
-    # Construct string
-    entry = full_entry.at[0, column_name]
+    # Choose random entry in cached .csv
+    dataset = dataset_cache.get(file_path)
+    entry = dataset.value(column_name, dataset.sample_index(file_length))
 
     return entry
 
@@ -64,39 +52,30 @@ def get_unique_values_from_function(function: Callable[..., T], number_of_values
         list[T]: The list of sampled values.
     """
 
-    # Set for seen values
-    values = set()
+    # Dictionary for seen values (keeps the order in which they were sampled, which a set does not across processes)
+    values = {}
 
     # Sample number_of_values values
     while len(values) < number_of_values:
-        values.add(function(*args, **kwargs))
+        values[function(*args, **kwargs)] = None
 
     return list(values)
 
 
-def get_random_csv_full(file_path: str, file_length: str) -> pd.DataFrame:
+def get_random_csv_full(file_path: str, file_length: int) -> dict[str, Any]:
     """
     Returns a random full entry of the specified file.
 
     Parameters:
         file_path (str): The path to the .csv file.
-        file_length (str): The number of rows of the .csv file.
+        file_length (int): The number of rows of the .csv file.
 
     Returns:
-        pd.DataFrame: The random entry of the .csv file.
+        dict[str, Any]: The random entry of the .csv file, mapping the column names to the values.
     """
 
-    # Read .csv header
-    header = pd.read_csv(file_path, nrows=0)
-    column_names = header.columns.tolist()
-
-    # Choose random entry in .csv
-    random_offset = random.randint(1, file_length)
-    full_entry = pd.read_csv(
-        file_path, skiprows=random_offset, nrows=1, header=None)
-
-    # Assign initial .csv header
-    full_entry.columns = column_names
+    # Choose random entry in cached .csv
+    full_entry = dataset_cache.sample_row(file_path, file_length)
 
     return full_entry
 
@@ -158,11 +137,8 @@ def count_number_of_humans() -> int:
         int: The number of human instances.
     """
 
-    # Traverse document and count lines
-    cnt = 0
-    with open(config.HUMAN_INSTANCES_PATH, "r", encoding='utf-8') as humans:
-        for _ in humans:
-            cnt += 1
+    # Read number of lines from index
+    cnt = len(get_jsonl_pool(config.HUMAN_INSTANCES_PATH))
 
     return cnt
 
@@ -179,11 +155,5 @@ def get_random_jsonl_entry(file_path: str, file_length: int) -> dict[str, Union[
         dict[str, Union[str, int]]: The random entry of the .jsonl file.
     """
 
-    # Choose a random row
-    random_row = random.randint(0, file_length - 1)
-
-    # Traverse file and pick randomly chosen row
-    with open(file_path, "r", encoding='utf-8') as file:
-        for i, jsonl_entry in enumerate(file):
-            if i == random_row:
-                return json.loads(jsonl_entry)
+    # Choose a random row and read it using the index
+    return get_jsonl_pool(file_path).sample(file_length)
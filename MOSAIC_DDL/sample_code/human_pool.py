@@ -0,0 +1,298 @@
+"""
+human_pool.py
+
+This module contains the process-wide pool of the generated humans, indexed by occupation, nationality, employer and birth year such that the domain generators can query suitable humans without scanning the human instances file.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from helpers_random import get_instance_claims
+from sample_code.jsonl_index import get_jsonl_pool
+from errors import HumanPoolExhaustedError
+from typing import Any
+import numpy as np
+import random
+import json
+
+# Number of random eligible humans drawn before the unused eligible humans are looked up
+MAXIMUM_NUMBER_OF_DRAWS = 32
+
+# Fields of a human which name the institution the human works or studies at
+EMPLOYER_FIELDS = ("works_at", "is_ceo_of", "is_employee_at",
+                   "is_judge_at", "is_instructor_at", "is_student_at")
+
+
+class HumanPool:
+    def __init__(self, file_path: str) -> None:
+        """
+        Loads the humans into columnar arrays and builds the inverted indexes.
+
+        Parameters:
+            file_path (str): The path to the human instances .jsonl file.
+        """
+        self.file_path = file_path
+        self.records = get_jsonl_pool(file_path)
+        self.file_status = self.records.file_status
+
+        # Load columns
+        names, occupations, nationalities, employers, birth_years = [], [], [], [], []
+        with open(file_path, "r", encoding='utf-8') as humans:
+            for human in humans:
+                # Fetch content
+                human_content = json.loads(human)
+
+                names.append(human_content["name"])
+                occupations.append(human_content["occupation"])
+                nationalities.append(human_content["nationality"])
+                employers.append(next((human_content[field]
+                                 for field in EMPLOYER_FIELDS if field in human_content), None))
+                birth_years.append(human_content["birth_year"])
+
+        self.names = np.array(names, dtype=object)
+        self.occupations = np.array(occupations, dtype=object)
+        self.nationalities = np.array(nationalities, dtype=object)
+        self.employers = np.array(employers, dtype=object)
+        self.birth_years = np.array(birth_years, dtype=np.int64)
+
+        # Build inverted indexes whose entries are sorted by birth year (ties keep file order)
+        self.occupation_nationality_index = self.build_index(
+            self.occupations, self.nationalities)
+        self.occupation_employer_index = self.build_index(
+            self.occupations, self.employers)
+
+    def build_index(self, first_column: np.ndarray, second_column: np.ndarray) -> dict[tuple[Any, Any], tuple[np.ndarray, np.ndarray]]:
+        """
+        Builds an inverted index mapping each pair of values of two columns to the birth years (sorted) and ids of the matching humans.
+
+        Parameters:
+            first_column (np.ndarray): The first column.
+            second_column (np.ndarray): The second column.
+
+        Returns:
+            dict[tuple[Any, Any], tuple[np.ndarray, np.ndarray]]: The inverted index.
+        """
+
+        # Collect ids per pair of values in birth year order
+        groups = {}
+        for human_id in np.argsort(self.birth_years, kind="stable").tolist():
+            groups.setdefault(
+                (first_column[human_id], second_column[human_id]), []).append(human_id)
+
+        return {key: (self.birth_years[ids], np.array(ids, dtype=np.int64)) for key, ids in groups.items()}
+
+    def __len__(self) -> int:
+        """
+        Returns the number of humans in the pool.
+        """
+
+        return len(self.names)
+
+    def query(self, occupation: str, year: int, minimum_age: int, maximum_age: int, nationality: str = None, employer: str = None) -> np.ndarray:
+        """
+        Returns the ids of all humans with the occupation and the nationality and/or employer whose age in the given year lies within the age range.
+
+        Parameters:
+            occupation (str): The occupation.
+            year (int): The year in which the age is computed.
+            minimum_age (int): The minimum age (inclusive).
+            maximum_age (int): The maximum age (inclusive).
+            nationality (str): The nationality (if the humans are selected by nationality).
+            employer (str): The employer (if the humans are selected by employer).
+
+        Returns:
+            np.ndarray: The ids of the matching humans, sorted by birth year.
+        """
+
+        if employer is not None:
+            birth_years, ids = self.occupation_employer_index.get(
+                (occupation, employer), (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)))
+        else:
+            birth_years, ids = self.occupation_nationality_index.get(
+                (occupation, nationality), (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)))
+
+        # The age range corresponds to a contiguous range of birth years
+        start = np.searchsorted(birth_years, year - maximum_age, side="left")
+        end = np.searchsorted(birth_years, year - minimum_age, side="right")
+        ids = ids[start:end]
+
+        # Humans selected by employer may additionally be restricted to a nationality
+        if employer is not None and nationality is not None:
+            ids = ids[self.nationalities[ids] == nationality]
+
+        return ids
+
+    def sample(self, occupation: str, year: int, minimum_age: int, maximum_age: int, nationality: str = None, employer: str = None) -> int:
+        """
+        Returns the id of a random human matching the query (or None if no human matches).
+
+        Parameters:
+            occupation (str): The occupation.
+            year (int): The year in which the age is computed.
+            minimum_age (int): The minimum age (inclusive).
+            maximum_age (int): The maximum age (inclusive).
+            nationality (str): The nationality (if the humans are selected by nationality).
+            employer (str): The employer (if the humans are selected by employer).
+
+        Returns:
+            int: The id of the random human.
+        """
+
+        ids = self.query(occupation, year, minimum_age,
+                         maximum_age, nationality, employer)
+
+        if len(ids) == 0:
+            return None
+
+        return int(ids[random.randrange(len(ids))])
+
+    def first(self, occupation: str, year: int, minimum_age: int, maximum_age: int, nationality: str = None, employer: str = None) -> int:
+        """
+        Returns the id of the first human (in file order) matching the query (or None if no human matches).
+
+        Parameters:
+            occupation (str): The occupation.
+            year (int): The year in which the age is computed.
+            minimum_age (int): The minimum age (inclusive).
+            maximum_age (int): The maximum age (inclusive).
+            nationality (str): The nationality (if the humans are selected by nationality).
+            employer (str): The employer (if the humans are selected by employer).
+
+        Returns:
+            int: The id of the first human.
+        """
+
+        ids = self.query(occupation, year, minimum_age,
+                         maximum_age, nationality, employer)
+
+        if len(ids) == 0:
+            return None
+
+        return int(ids.min())
+
+    def record(self, human_id: int) -> dict[str, Any]:
+        """
+        Returns the full human instance.
+
+        Parameters:
+            human_id (int): The id (line index) of the human.
+
+        Returns:
+            dict[str, Any]: The human instance.
+        """
+
+        return self.records.get(human_id)
+
+
+class HumanAllocator:
+    def __init__(self, human_pool: HumanPool) -> None:
+        """
+        Sorts the human ids by birth year, such that the humans born within a birth year range are a contiguous slice, and hands them out through the claims of unique instances (see helpers_random.InstanceClaims) such that every human is handed out at most once.
+
+        Parameters:
+            human_pool (HumanPool): The human pool to allocate from.
+        """
+        self.human_pool = human_pool
+        self.ids_by_birth_year = np.argsort(
+            human_pool.birth_years, kind="stable")
+        self.sorted_birth_years = human_pool.birth_years[self.ids_by_birth_year]
+
+    def allocate(self, minimum_birth_year: int = None, maximum_birth_year: int = None) -> int:
+        """
+        Hands out a random unused human born within the birth year range (every unused eligible human is equally likely). Random eligible humans are drawn until an unused one is found, such that the outcome of a draw only depends on whether that human was used, and only after MAXIMUM_NUMBER_OF_DRAWS used ones the unused eligible humans are looked up.
+
+        Parameters:
+            minimum_birth_year (int): The minimum birth year (inclusive, no bound if None).
+            maximum_birth_year (int): The maximum birth year (inclusive, no bound if None).
+
+        Returns:
+            int: The id of the human.
+        """
+
+        # Compute slice of eligible humans
+        start = 0 if minimum_birth_year is None else int(np.searchsorted(
+            self.sorted_birth_years, minimum_birth_year, side="left"))
+        end = len(self.sorted_birth_years) if maximum_birth_year is None else int(np.searchsorted(
+            self.sorted_birth_years, maximum_birth_year, side="right"))
+
+        # No human is born within the range
+        if end <= start:
+            raise HumanPoolExhaustedError(minimum_birth_year, maximum_birth_year)
+
+        # Draw random eligible humans until an unused one is found
+        instance_claims = get_instance_claims()
+        for _ in range(MAXIMUM_NUMBER_OF_DRAWS):
+            human_id = int(
+                self.ids_by_birth_year[start + random.randrange(end - start)])
+            if instance_claims.claim(self.human_pool.file_path, human_id):
+                return human_id
+
+        # Choose among the unused eligible humans
+        unused_human_ids = instance_claims.select_unclaimed(
+            self.human_pool.file_path, self.ids_by_birth_year[start:end], len(self.sorted_birth_years))
+        if len(unused_human_ids) == 0:
+            raise HumanPoolExhaustedError(minimum_birth_year, maximum_birth_year)
+        human_id = int(unused_human_ids[random.randrange(len(unused_human_ids))])
+        instance_claims.claim(self.human_pool.file_path, human_id)
+
+        return human_id
+
+    def allocate_by_age(self, year: int, minimum_age: int, maximum_age: int) -> int:
+        """
+        Hands out a random unused human whose age in the given year lies within the age range.
+
+        Parameters:
+            year (int): The year in which the age is computed.
+            minimum_age (int): The minimum age (inclusive).
+            maximum_age (int): The maximum age (inclusive).
+
+        Returns:
+            int: The id of the human.
+        """
+
+        return self.allocate(year - maximum_age, year - minimum_age)
+
+
+# Process-wide human pool and allocator
+human_pool = None
+human_allocator = None
+
+
+def get_human_pool(file_path: str) -> HumanPool:
+    """
+    Returns the pool of the humans, loading it on first use and reloading it if the human instances file changed.
+
+    Parameters:
+        file_path (str): The path to the human instances .jsonl file.
+
+    Returns:
+        HumanPool: The human pool.
+    """
+
+    global human_pool
+
+    if human_pool is None or human_pool.file_path != file_path or get_jsonl_pool(file_path).file_status != human_pool.file_status:
+        human_pool = HumanPool(file_path)
+
+    return human_pool
+
+
+def get_human_allocator(file_path: str) -> HumanAllocator:
+    """
+    Returns the allocator of the humans, creating it on first use and recreating it if the human pool was reloaded.
+
+    Parameters:
+        file_path (str): The path to the human instances .jsonl file.
+
+    Returns:
+        HumanAllocator: The human allocator.
+    """
+
+    global human_allocator
+
+    current_human_pool = get_human_pool(file_path)
+    if human_allocator is None or human_allocator.human_pool is not current_human_pool:
+        human_allocator = HumanAllocator(current_human_pool)
+
+    return human_allocator
@@ -0,0 +1,163 @@
+"""
+jsonl_index.py
+
+This module contains the byte-offset indexes of the generated .jsonl instance pools (humans, hospitals, companies, courts and schools), which allow random access to single entries without scanning the file.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from typing import Any
+import numpy as np
+import tempfile
+import random
+import json
+import os
+
+
+def build_jsonl_index(file_path: str) -> None:
+    """
+    Writes the sidecar index of a .jsonl file: the byte offsets (uint64) of all lines followed by the size of the file.
+
+    Parameters:
+        file_path (str): The path to the .jsonl file.
+    """
+
+    # Collect line offsets
+    offsets = [0]
+    with open(file_path, "rb") as file:
+        for line in file:
+            offsets.append(offsets[-1] + len(line))
+
+    # Write index next to the file (into a temporary file of its own, since processes may rebuild a stale index concurrently, and replace atomically such that readers never see a partial index)
+    descriptor, temporary_file_path = tempfile.mkstemp(dir=os.path.dirname(
+        file_path) or ".", prefix=os.path.basename(file_path) + ".idx.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as index:
+            np.array(offsets, dtype=np.uint64).tofile(index)
+        os.replace(temporary_file_path, file_path + ".idx")
+    except BaseException:
+        os.remove(temporary_file_path)
+        raise
+
+
+class JsonlPool:
+    def __init__(self, file_path: str) -> None:
+        """
+        Opens a .jsonl file together with its (memory-mapped) index, building the index if it is missing or stale.
+
+        Parameters:
+            file_path (str): The path to the .jsonl file.
+        """
+        self.file_path = file_path
+        self.file_status = None
+        self.file = None
+        self.offsets = None
+        self.key_indexes = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Reopens the file and its index if the file changed since it was opened (e.g. because it was rewritten by a modification step).
+        """
+
+        file_status = os.stat(self.file_path)
+        if self.file_status is not None and (file_status.st_size, file_status.st_mtime_ns, file_status.st_ino) == self.file_status:
+            return
+
+        # Rebuild index if it does not describe the current file
+        index_path = self.file_path + ".idx"
+        if not os.path.exists(index_path) or os.stat(index_path).st_mtime_ns < file_status.st_mtime_ns or np.fromfile(index_path, dtype=np.uint64)[-1] != file_status.st_size:
+            build_jsonl_index(self.file_path)
+
+        # Open file and memory-map index
+        if self.file is not None:
+            self.file.close()
+        self.file = open(self.file_path, "rb")
+        self.offsets = np.memmap(index_path, dtype=np.uint64, mode="r")
+        self.file_status = (file_status.st_size,
+                            file_status.st_mtime_ns, file_status.st_ino)
+        self.key_indexes = {}
+
+    def __len__(self) -> int:
+        """
+        Returns the number of entries of the file.
+        """
+
+        return len(self.offsets) - 1
+
+    def get(self, index: int) -> dict[str, Any]:
+        """
+        Returns a single entry of the file.
+
+        Parameters:
+            index (int): The index of the entry (line).
+
+        Returns:
+            dict[str, Any]: The loaded entry.
+        """
+
+        self.file.seek(int(self.offsets[index]))
+
+        return json.loads(self.file.read(int(self.offsets[index + 1] - self.offsets[index])))
+
+    def sample(self, file_length: int = None) -> dict[str, Any]:
+        """
+        Returns a random entry of the file.
+
+        Parameters:
+            file_length (int): The number of entries to draw from (defaults to all entries).
+
+        Returns:
+            dict[str, Any]: The random entry.
+        """
+
+        return self.get(random.randint(0, (file_length if file_length is not None else len(self)) - 1))
+
+    def find(self, key: str, value: Any) -> dict[str, Any]:
+        """
+        Returns the first entry whose field equals the value (or None if there is none).
+
+        Parameters:
+            key (str): The name of the field.
+            value (Any): The value of the field.
+
+        Returns:
+            dict[str, Any]: The first matching entry.
+        """
+
+        # Build index of field on first use (the first occurrence of a value wins)
+        if key not in self.key_indexes:
+            key_index = {}
+            for index in range(len(self)):
+                key_index.setdefault(self.get(index).get(key), index)
+            self.key_indexes[key] = key_index
+
+        if value not in self.key_indexes[key]:
+            return None
+
+        return self.get(self.key_indexes[key][value])
+
+
+# Process-wide pools
+jsonl_pools = {}
+
+
+def get_jsonl_pool(file_path: str) -> JsonlPool:
+    """
+    Returns the pool of the specified .jsonl file, opening it on first use and reopening it if the file changed.
+
+    Parameters:
+        file_path (str): The path to the .jsonl file.
+
+    Returns:
+        JsonlPool: The pool.
+    """
+
+    if file_path not in jsonl_pools:
+        jsonl_pools[file_path] = JsonlPool(file_path)
+    else:
+        jsonl_pools[file_path].refresh()
+
+    return jsonl_pools[file_path]
@@ -11,8 +11,10 @@ from sample_code.domains.financial_domain import company_generation, financial_m
 from sample_code.domains.legal_domain import court_generation, legal_modify_human, legal_event_generation
 from sample_code.domains.educational_domain import school_generation, educational_modify_human, educational_event_generation
 from sample_code.domains.social_domain import social_event_generation
+from helpers_random import derive_seed, seed_random_generators
 from generator import Generator
 from sample_code import config
+import config_framework
 import os
 
 
@@ -31,19 +33,38 @@ def register_all_sampling_procedures(framework: Generator) -> None:
 
     # Run hospital, company, court, school and human generation
     print(f"{'\033[31m'}Running Preparation Procedures (Might take a while due to the complexity of the family tree computation)...{'\033[0m'}")
+    # Every preparation procedure gets its own random number stream derived from the master seed
     if not os.path.exists(config.HOSPITAL_INSTANCES_PATH):
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "hospitals"))
         hospital_generation.generate_hospitals()
     if not os.path.exists(config.COMPANY_INSTANCES_PATH):
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "companies"))
         company_generation.generate_companies()
     if not os.path.exists(config.COURT_INSTANCES_PATH):
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "courts"))
         court_generation.generate_courts()
     if not os.path.exists(config.SCHOOL_INSTANCES_PATH):
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "schools"))
         school_generation.generate_schools()
     if not os.path.exists(config.HUMAN_INSTANCES_PATH):
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "humans"))
         human_and_relation_generation.generate_humans()
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "medical_humans"))
         medical_modify_human.medical_modify_human()
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "financial_humans"))
         financial_modify_human.financial_modify_human()
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "legal_humans"))
         legal_modify_human.legal_modify_human()
+        seed_random_generators(derive_seed(
+            config_framework.MASTER_SEED, "preparation", "educational_humans"))
         educational_modify_human.educational_modify_human()
 
     @framework.register_sampling_procedure("medical")
@@ -0,0 +1,205 @@
+"""
+sampling_plan.py
+
+This module contains the precompiled per-domain sampling plans of MOSAIC_DDL.
+
+Author: Benjamin Koch
+Date: July 2025
+"""
+
+# Imports
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Mapping
+import config_framework
+import networkx as nx
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SamplingPlan:
+    """
+    An immutable, precompiled description of everything needed to sample the co-occurrences of a single domain.
+
+    Attributes:
+        domain_id (str): The name (id) of the domain.
+        entity_order (tuple[tuple[str, tuple[tuple[str, float], ...]], ...]): The entities of the domain in topological order, each together with its predecessors and the probabilities of the connecting edges.
+        attribute_order (tuple[tuple[str, str, tuple[tuple[str, float], ...]], ...]): The attributes of the domain in topological order, each together with its parent entity (None for domain attributes) and its predecessors with the probabilities of the connecting edges.
+        entity_to_count (Mapping[str, int]): The number of occurrences of each entity of the domain.
+        eii_permitted_attributes (frozenset[str]): The attributes whose eii level does not exceed the eii level of the domain.
+        verification_key_structure (dict): The key structure every sample returned by the sampling procedure of the domain must have.
+    """
+
+    domain_id: str
+    entity_order: tuple[tuple[str, tuple[tuple[str, float], ...]], ...]
+    attribute_order: tuple[tuple[str, str, tuple[tuple[str, float], ...]], ...]
+    entity_to_count: Mapping[str, int]
+    eii_permitted_attributes: frozenset[str]
+    verification_key_structure: dict
+
+
+def compile_sampling_plans(graph: nx.DiGraph, domain_to_entity_to_count: dict[str, dict[str, int]], dictionary_key_structure: Callable[[dict], dict]) -> dict[str, SamplingPlan]:
+    """
+    Compiles the configuration graph into one sampling plan per domain.
+
+    Parameters:
+        graph (nx.DiGraph): The graph of domains, entities and attributes created from the configuration file.
+        domain_to_entity_to_count (dict[str, dict[str, int]]): A dictionary mapping each domain to its entities and their respective number of occurrences.
+        dictionary_key_structure (Callable[[dict], dict]): The function used to compute the key structure of the verification seed.
+
+    Returns:
+        dict[str, SamplingPlan]: A dictionary mapping each domain to its sampling plan.
+    """
+
+    # Compute subgraph of only entity nodes and its topological order
+    only_entity_nodes = [node for node, node_attributes in graph.nodes(
+        data=True) if node_attributes.get("type") == "entity"]
+    only_entity_graph = graph.subgraph(only_entity_nodes)
+    only_entity_graph_order = list(nx.topological_sort(only_entity_graph))
+
+    # Compute subgraph of only attribute nodes and its topological order
+    only_attribute_nodes = [node for node, node_attributes in graph.nodes(data=True) if node_attributes.get(
+        "type") == "domain_attribute" or node_attributes.get("type") == "entity_attribute"]
+    only_attribute_graph = graph.subgraph(only_attribute_nodes)
+    only_attribute_graph_order = list(
+        nx.topological_sort(only_attribute_graph))
+
+    # Storage for sampling plans
+    sampling_plans = {}
+
+    for domain_id, entity_to_count in domain_to_entity_to_count.items():
+        # Collect entities of domain in topological order together with their incoming edge probabilities
+        entity_order = tuple((entity, tuple((predecessor, only_entity_graph.edges[predecessor, entity].get("probability")) for predecessor in only_entity_graph.predecessors(
+            entity))) for entity in only_entity_graph_order if entity.split(".")[0] == domain_id)
+
+        # Collect attributes of domain in topological order together with their parent entity and incoming edge probabilities
+        attribute_order = tuple((attribute, graph.nodes[attribute]["parent"] if graph.nodes[attribute]["type"] == "entity_attribute" else None, tuple((predecessor, only_attribute_graph.edges[predecessor, attribute].get(
+            "probability")) for predecessor in only_attribute_graph.predecessors(attribute))) for attribute in only_attribute_graph_order if attribute.split(".")[0] == domain_id)
+
+        # Compute attributes which are permitted by the eii level of the domain
+        domain_eii_level = config_framework.EII_LEVEL_MAPPING[graph.nodes[domain_id]["eii"]]
+        eii_permitted_attributes = frozenset(attribute for attribute, _, _ in attribute_order if config_framework.EII_LEVEL_MAPPING[
+                                             graph.nodes[attribute]["eii"]] <= domain_eii_level)
+
+        # Create a verification seed to later verify that the seed returned by the sampling function contains all fields necessary
+        verification_seed = {entity: [{} for _ in range(
+            entity_to_count[entity])] for entity in entity_to_count.keys()}
+        verification_seed["domain"] = domain_id
+        for attribute, parent, _ in attribute_order:
+            if parent is None:
+                verification_seed[attribute] = None
+            else:
+                for d in verification_seed[parent]:
+                    d[attribute] = None
+
+        sampling_plans[domain_id] = SamplingPlan(domain_id=domain_id, entity_order=entity_order, attribute_order=attribute_order, entity_to_count=MappingProxyType(
+            dict(entity_to_count)), eii_permitted_attributes=eii_permitted_attributes, verification_key_structure=dictionary_key_structure(verification_seed))
+
+    return sampling_plans
+
+
+@dataclass(frozen=True)
+class OccurrenceMasks:
+    """
+    The occurrence decisions of a batch of seeds of a single domain, stored as boolean matrices with one row per seed.
+
+    Attributes:
+        entities (tuple[str, ...]): The entities of the domain in topological order (the columns of entity_mask).
+        attributes (tuple[str, ...]): The attributes of the domain in topological order (the columns of attribute_mask).
+        entity_mask (np.ndarray): A boolean matrix of shape (number of seeds, number of entities).
+        attribute_mask (np.ndarray): A boolean matrix of shape (number of seeds, number of attributes).
+    """
+
+    entities: tuple[str, ...]
+    attributes: tuple[str, ...]
+    entity_mask: np.ndarray
+    attribute_mask: np.ndarray
+
+    def __len__(self) -> int:
+        """
+        Returns the number of seeds in the batch.
+        """
+
+        return self.entity_mask.shape[0]
+
+    def occurrences(self, index: int) -> tuple[frozenset[str], frozenset[str]]:
+        """
+        Returns the occurring entities and attributes of a single seed of the batch in the form consumed by the filtering step.
+
+        Parameters:
+            index (int): The index of the seed in the batch.
+
+        Returns:
+            tuple[frozenset[str], frozenset[str]]: The occurring entities and the occurring attributes.
+        """
+
+        return frozenset(self.entities[i] for i in np.flatnonzero(self.entity_mask[index])), frozenset(self.attributes[i] for i in np.flatnonzero(self.attribute_mask[index]))
+
+
+def sample_occurrence_masks(plan: SamplingPlan, number_of_seeds: int, rng: np.random.Generator) -> OccurrenceMasks:
+    """
+    Takes all entity and attribute occurrence decisions of number_of_seeds seeds at once. The columns are filled in topological order and follow the same distribution as Generator.sample_occurrences.
+
+    Parameters:
+        plan (SamplingPlan): The precompiled sampling plan of the domain.
+        number_of_seeds (int): The number of seeds in the batch.
+        rng (np.random.Generator): The random number generator used for the decisions.
+
+    Returns:
+        OccurrenceMasks: The occurrence decisions of the batch.
+    """
+
+    # Compute column of each entity and attribute
+    entities = tuple(entity for entity, _ in plan.entity_order)
+    attributes = tuple(attribute for attribute, _, _ in plan.attribute_order)
+    entity_column = {entity: i for i, entity in enumerate(entities)}
+    attribute_column = {attribute: i for i, attribute in enumerate(attributes)}
+
+    # Traverse entities in topological order; an entity occurs if all predecessors occur and every incoming edge keeps it
+    entity_mask = np.zeros((number_of_seeds, len(entities)), dtype=bool)
+    for i, (_, entity_predecessors) in enumerate(plan.entity_order):
+        entity_mask[:, i] = sample_column(
+            entity_mask, entity_column, entity_predecessors, np.ones(number_of_seeds, dtype=bool), rng)
+
+    # Traverse attributes in topological order; an entity attribute can only occur if its entity occurs
+    attribute_mask = np.zeros((number_of_seeds, len(attributes)), dtype=bool)
+    for i, (_, parent, attribute_predecessors) in enumerate(plan.attribute_order):
+        eligible = np.ones(
+            number_of_seeds, dtype=bool) if parent is None else entity_mask[:, entity_column[parent]].copy()
+        attribute_mask[:, i] = sample_column(
+            attribute_mask, attribute_column, attribute_predecessors, eligible, rng)
+
+    return OccurrenceMasks(entities=entities, attributes=attributes, entity_mask=entity_mask, attribute_mask=attribute_mask)
+
+
+def sample_column(mask: np.ndarray, column: dict[str, int], predecessors: tuple[tuple[str, float], ...], eligible: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Computes the occurrence decisions of a single node for all seeds of a batch given the decisions of its predecessors.
+
+    Parameters:
+        mask (np.ndarray): The occurrence decisions computed so far.
+        column (dict[str, int]): Maps the nodes to their columns in the mask.
+        predecessors (tuple[tuple[str, float], ...]): The predecessors of the node and the probabilities of the connecting edges.
+        eligible (np.ndarray): A boolean vector marking the seeds in which the node may occur at all.
+        rng (np.random.Generator): The random number generator used for the decisions.
+
+    Returns:
+        np.ndarray: The boolean occurrence vector of the node.
+    """
+
+    if not predecessors:
+        return eligible
+
+    # All predecessors must occur (predecessors outside of the domain never occur)
+    for predecessor, _ in predecessors:
+        if predecessor not in column:
+            return np.zeros_like(eligible)
+        eligible &= mask[:, column[predecessor]]
+
+    # Every incoming edge keeps the node independently with its probability
+    probabilities = np.array(
+        [probability for _, probability in predecessors])
+    kept = (rng.random((mask.shape[0], len(predecessors)))
+            <= probabilities).all(axis=1)
+
+    return eligible & kept
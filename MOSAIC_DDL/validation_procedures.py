@@ -8,6 +8,7 @@ Date: July 2025
 """
 
 # Imports
+from errors import DocumentsOutOfSyncError
 import xml.etree.ElementTree as ET
 import matplotlib.pyplot as plt
 from rapidfuzz import fuzz
@@ -124,7 +125,7 @@ def compute_keys_of_seed(inputDict: dict) -> set[str]:
 
     if isinstance(inputDict, dict):
         for key, value in inputDict.items():
-            if key == "domain" or key == "text_type":
+            if key == "domain" or key == "text_type" or key == "document_id":
                 continue
 
             if isinstance(value, list):
@@ -158,7 +159,7 @@ def compute_keys_including_entities_of_seed(inputDict: dict) -> set[str]:
 
     if isinstance(inputDict, dict):
         for key, value in inputDict.items():
-            if key == "domain" or key == "text_type":
+            if key == "domain" or key == "text_type" or key == "document_id":
                 continue
 
             if isinstance(value, list):
@@ -204,7 +205,7 @@ def compute_keys_and_values_of_seed(inputDict: dict) -> set[tuple[str, Union[str
 
     if isinstance(inputDict, dict):
         for key, value in inputDict.items():
-            if key == "domain" or key == "text_type":
+            if key == "domain" or key == "text_type" or key == "document_id":
                 continue
 
             if isinstance(value, list):
@@ -323,12 +324,22 @@ def validate_attribute_transfer() -> None:
 
     # Traverse blanked seed and documents
     with open(config_framework.DOCUMENTS, "r", encoding='utf-8') as documents, open(config_framework.BLANK_SEEDS, "r", encoding='utf-8') as blank_seeds:
-        for document, blank_seed in zip(documents, blank_seeds):
+        for document in documents:
             # Load document
-            loaded_document = json.loads(document)["document"].lower()
+            loaded_document = json.loads(document)
+
+            # The documents are written in the order of the blank seeds, but documents may be missing (e.g. dead letters); advance to the blank seed of the document
+            loaded_blank_seed = None
+            for blank_seed in blank_seeds:
+                loaded_blank_seed = json.loads(blank_seed)
+                if loaded_blank_seed.get("document_id") == loaded_document.get("document_id"):
+                    break
+            else:
+                raise DocumentsOutOfSyncError(loaded_document.get(
+                    "document_id"), loaded_blank_seed.get("document_id") if loaded_blank_seed is not None else None)
+            loaded_document = loaded_document["document"].lower()
 
-            # Load blank seed
-            loaded_blank_seed = json.loads(blank_seed)
+            # Compute attributes of blank seed
             occurring_attributes = compute_keys_and_values_of_seed(
                 loaded_blank_seed)
 